@@ -0,0 +1,90 @@
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# brotli este opțional (pip install brotli); fără el se creează doar .json.gz
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Extensia adăugată pentru fiecare codare
+ENCODING_SUFFIXES = {
+    "gzip": ".gz",
+    "br": ".br"
+}
+
+def available_encodings():
+    """Codările care pot fi create în mediul curent."""
+    return ("gzip", "br") if brotli is not None else ("gzip",)
+
+def compress_bytes(data, encoding):
+    """Comprimă conținutul unui fișier; rezultatul nu depinde de momentul rulării."""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return brotli.compress(data, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+
+def compress_file(path):
+    """
+    Scrie lângă `path` variantele comprimate (`.json.gz`, `.json.br`).
+    
+    O variantă `.br` rămasă de la o rulare anterioară este ștearsă dacă
+    brotli nu este instalat, ca să nu fie servită o versiune veche.
+    
+    Returns:
+        dict: {codare: {"file", "bytes", "ratio"}} pentru fiecare variantă scrisă
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    artifacts = {}
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        artifact_path = path + suffix
+        if encoding not in available_encodings():
+            if os.path.exists(artifact_path):
+                os.remove(artifact_path)
+            continue
+        compressed = compress_bytes(data, encoding)
+        with open(artifact_path, 'wb') as f:
+            f.write(compressed)
+        artifacts[encoding] = {
+            "file": os.path.basename(artifact_path),
+            "bytes": len(compressed),
+            "ratio": round(len(compressed) / len(data), 4) if data else 0.0
+        }
+    return artifacts
+
+def compress_files(paths, max_workers=None):
+    """
+    Comprimă mai multe fișiere în paralel, pe un pool de procese.
+    
+    Returns:
+        dict: cale -> rezultatul compress_file
+    """
+    paths = list(paths)
+    if len(paths) <= 1 or max_workers == 1:
+        return {path: compress_file(path) for path in paths}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(paths, executor.map(compress_file, paths)))
+
+def remove_with_artifacts(path):
+    """Șterge un fișier împreună cu variantele lui comprimate."""
+    for candidate in [path] + [path + suffix for suffix in ENCODING_SUFFIXES.values()]:
+        if os.path.exists(candidate):
+            os.remove(candidate)
+
+def total_compressed_bytes(results):
+    """Totalul bytes pe fiecare codare, pentru un set de rezultate compress_file."""
+    totals = {}
+    for artifacts in results:
+        for encoding, info in artifacts.items():
+            totals[encoding] = totals.get(encoding, 0) + info["bytes"]
+    return totals
+
+def describe_artifacts(artifacts):
+    """Text scurt cu dimensiunile comprimate, pentru mesaje și split_info.txt."""
+    return ", ".join(f"{encoding} {info['bytes']} bytes ({info['ratio'] * 100:.1f}%)"
+                     for encoding, info in artifacts.items())
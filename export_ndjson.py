@@ -0,0 +1,210 @@
+import json
+import os
+import glob
+import sys
+
+from merge_products import iter_part_products, load_manifest
+from split_products import SHARD_MODES, iter_catalog_products, shard_key, shard_slug
+
+# Sufixul fișierului cu offseturile liniilor, lângă fișierul .ndjson
+INDEX_SUFFIX = ".index.json"
+
+# Indexul unui export pe shard-uri, în directorul cu fișierele .ndjson
+SHARD_INDEX_FILE = "index.json"
+
+def iter_source_products(source):
+    """
+    Produsele dintr-un catalog JSON sau dintr-un director de părți.
+    
+    Pentru un director, părțile sunt citite în ordinea din manifest (sau
+    sortate după nume, dacă nu există manifest), câte un produs o dată.
+    """
+    if not os.path.isdir(source):
+        yield from iter_catalog_products(source, {})
+        return
+    
+    manifest = load_manifest(source)
+    if manifest:
+        part_files = [os.path.join(source, part["file"]) for part in manifest["parts"]]
+    else:
+        part_files = sorted(glob.glob(os.path.join(source, "*_part_*.json")))
+    for part_file in part_files:
+        yield from iter_part_products(part_file)
+
+def ndjson_line(product):
+    """Un produs pe o linie, fără spații inutile, terminat cu newline."""
+    return (json.dumps(product, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+class NDJSONWriter:
+    """Scrie linii NDJSON și reține offsetul în bytes al fiecărei linii."""
+    
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, 'wb')
+        self.offsets = []
+        self.position = 0
+    
+    def write(self, product):
+        line = ndjson_line(product)
+        self.offsets.append(self.position)
+        self.f.write(line)
+        self.position += len(line)
+    
+    def close(self):
+        self.f.close()
+    
+    def index_entry(self):
+        return {
+            "file": os.path.basename(self.path),
+            "total_products": len(self.offsets),
+            "bytes": self.position,
+            "offsets": self.offsets
+        }
+
+def export_ndjson(source, output_path=None, shard_by=None):
+    """
+    Exportă catalogul îmbunătățit ca NDJSON: un produs pe linie.
+    
+    Sursa poate fi fișierul catalog sau un director de părți (`_split`,
+    `_by_<mod>`); produsele sunt citite și scrise pe rând, deci memoria nu
+    depinde de mărimea catalogului.
+    
+    Fără `shard_by` se creează un singur fișier `.ndjson` și, lângă el,
+    `<fișier>.index.json` cu offsetul în bytes al fiecărei linii. Cu
+    `shard_by` ('category', 'brand', 'sku_hash') se creează un director cu
+    câte un fișier .ndjson pe cheie și un `index.json` comun.
+    
+    Args:
+        source (str): Fișierul catalog sau directorul de părți
+        output_path (str): Fișierul (sau directorul, pentru shard-uri) de ieșire
+        shard_by (str): Modul de sharding sau None pentru un singur fișier
+    
+    Returns:
+        str: Fișierul sau directorul creat (None la eroare)
+    """
+    if shard_by is not None and shard_by not in SHARD_MODES:
+        print(f"Eroare: mod de sharding necunoscut '{shard_by}' (disponibile: {', '.join(SHARD_MODES)})")
+        return None
+    
+    base_name = os.path.basename(os.path.normpath(source))
+    base_name = os.path.splitext(base_name)[0]
+    for suffix in ["_split"] + [f"_by_{mode}" for mode in SHARD_MODES]:
+        if base_name.endswith(suffix):
+            base_name = base_name[:-len(suffix)]
+    parent_dir = os.path.dirname(os.path.normpath(source))
+    
+    print(f"Export NDJSON din: {source}")
+    
+    if not shard_by:
+        output_path = output_path or os.path.join(parent_dir, f"{base_name}.ndjson")
+        writer = NDJSONWriter(output_path)
+        try:
+            for product in iter_source_products(source):
+                writer.write(product)
+        finally:
+            writer.close()
+        
+        index = writer.index_entry()
+        with open(output_path + INDEX_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        
+        print(f"Fișier creat: {output_path} - {index['total_products']} produse - {index['bytes'] / (1024 * 1024):.2f} MB")
+        print(f"Index offseturi: {os.path.basename(output_path + INDEX_SUFFIX)}")
+        return output_path
+    
+    output_path = output_path or os.path.join(parent_dir, f"{base_name}_by_{shard_by}_ndjson")
+    os.makedirs(output_path, exist_ok=True)
+    
+    writers = {}
+    used_slugs = set()
+    try:
+        for product in iter_source_products(source):
+            key = shard_key(product, shard_by)
+            writer = writers.get(key)
+            if writer is None:
+                # Chei diferite cu același slug ("Ureche" și "ureche") primesc un sufix
+                slug = shard_slug(key)
+                candidate, number = slug, 1
+                while candidate in used_slugs:
+                    number += 1
+                    candidate = f"{slug}-{number}"
+                used_slugs.add(candidate)
+                writer = writers[key] = NDJSONWriter(os.path.join(output_path, f"{candidate}.ndjson"))
+            writer.write(product)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    
+    # Elimină fișierele rămase de la un export anterior
+    written_names = {os.path.basename(writer.path) for writer in writers.values()}
+    for stale_file in glob.glob(os.path.join(output_path, "*.ndjson")):
+        if os.path.basename(stale_file) not in written_names:
+            os.remove(stale_file)
+    
+    index = {
+        "shard_by": shard_by,
+        "total_products": sum(len(writer.offsets) for writer in writers.values()),
+        "shards": {key: writers[key].index_entry() for key in sorted(writers)}
+    }
+    with open(os.path.join(output_path, SHARD_INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    
+    print(f"Director creat: {output_path} - {len(writers)} fișiere - {index['total_products']} produse")
+    return output_path
+
+def load_ndjson_index(ndjson_file):
+    """
+    Încarcă indexul de offseturi al unui fișier .ndjson; None dacă lipsește.
+    
+    Un fișier dintr-un export pe shard-uri nu are index propriu: intrarea lui
+    se caută în `index.json` din același director.
+    """
+    index_file = ndjson_file + INDEX_SUFFIX
+    if os.path.exists(index_file):
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    shard_index_file = os.path.join(os.path.dirname(ndjson_file), SHARD_INDEX_FILE)
+    if not os.path.exists(shard_index_file):
+        return None
+    with open(shard_index_file, 'r', encoding='utf-8') as f:
+        shard_index = json.load(f)
+    file_name = os.path.basename(ndjson_file)
+    for entry in shard_index.get("shards", {}).values():
+        if entry["file"] == file_name:
+            return entry
+    return None
+
+def iter_ndjson(ndjson_file, start_line=0, index=None):
+    """
+    Citește produsele dintr-un fișier .ndjson, începând cu linia `start_line`.
+    
+    Cu indexul de offseturi, citirea sare direct la linia cerută, așa că un
+    consumator întrerupt poate relua de unde a rămas.
+    """
+    if index is None and start_line:
+        index = load_ndjson_index(ndjson_file)
+    
+    with open(ndjson_file, 'rb') as f:
+        if start_line and index is not None:
+            if start_line >= len(index["offsets"]):
+                return
+            f.seek(index["offsets"][start_line])
+        elif start_line:
+            # Fără index, liniile de dinainte sunt doar sărite
+            for _ in range(start_line):
+                if not f.readline():
+                    return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+if __name__ == "__main__":
+    input_file = r"c:\Users\Maia\Downloads\python\endpoint\bikestylish-catalog\data\products_ai_enhanced.json"
+    
+    if not os.path.exists(input_file):
+        print(f"Eroare: Fișierul {input_file} nu există!")
+    else:
+        # python export_ndjson.py [--shard-by category|brand|sku_hash]
+        shard_by = sys.argv[sys.argv.index("--shard-by") + 1] if "--shard-by" in sys.argv[:-1] else None
+        export_ndjson(input_file, shard_by=shard_by)
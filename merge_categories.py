@@ -2,10 +2,29 @@ import json
 import os
 import glob
 
+from merge_products import validate_part_sequence, write_streaming_json
+from split_categories import serialize_item
+
+# Marcaj înlocuit cu lista de categorii scrisă incremental
+ITEMS_MARKER = "\u0000categories\u0000"
+
+def part_categories(part_data):
+    """Lista de categorii a unui part și indentarea elementelor ei în fișierul unit."""
+    if 'categories' in part_data:
+        return part_data['categories'], "    "
+    if 'hierarchy' in part_data and 'main_categories' in part_data['hierarchy']:
+        return part_data['hierarchy']['main_categories'], "      "
+    return [], "    "
+
 def merge_split_categories_files(split_directory, output_file):
     """
     Reunește fișierele JSON cu categorii împărțite înapoi într-un singur fișier.
     
+    Secvența părților este verificată după part_info, apoi părțile sunt
+    citite pe rând și categoriile scrise direct în fișierul unit, așa că în
+    memorie se află cel mult un part. Lista reunită ia locul listei din
+    primul part ('categories' sau 'hierarchy.main_categories').
+    
     Args:
         split_directory (str): Directorul care conține fișierele împărțite
         output_file (str): Calea pentru fișierul de ieșire
@@ -22,47 +41,67 @@ def merge_split_categories_files(split_directory, output_file):
     
     print(f"Găsite {len(part_files)} fișiere de unit")
     
-    # Încarcă primul fișier pentru a obține structura de bază
-    with open(part_files[0], 'r', encoding='utf-8') as f:
-        base_data = json.load(f)
-    
-    # Inițializează lista de categorii unită
-    all_categories = []
-    
-    # Procesează fiecare fișier
-    for i, part_file in enumerate(part_files):
-        print(f"Procesare fișier {i+1}/{len(part_files)}: {os.path.basename(part_file)}")
-        
+    # Prima trecere: part_info și numărul de categorii din fiecare part;
+    # din primul fișier se păstrează structura de bază, fără categorii
+    headers = []
+    counts = []
+    base_data = None
+    item_indent = "    "
+    for part_file in part_files:
         with open(part_file, 'r', encoding='utf-8') as f:
             part_data = json.load(f)
-        
-        # Adaugă categoriile din acest fișier
-        if 'categories' in part_data:
-            all_categories.extend(part_data['categories'])
-            print(f"  - Adăugate {len(part_data['categories'])} categorii")
-        elif 'hierarchy' in part_data and 'main_categories' in part_data['hierarchy']:
-            all_categories.extend(part_data['hierarchy']['main_categories'])
-            print(f"  - Adăugate {len(part_data['hierarchy']['main_categories'])} categorii din hierarchy")
+        categories, indent = part_categories(part_data)
+        headers.append({'part_info': part_data.get('part_info')})
+        counts.append(len(categories))
+        if base_data is None:
+            base_data = part_data
+            item_indent = indent
+            if 'categories' in base_data:
+                base_data['categories'] = ITEMS_MARKER
+            elif 'hierarchy' in base_data and 'main_categories' in base_data['hierarchy']:
+                base_data['hierarchy']['main_categories'] = ITEMS_MARKER
+            else:
+                base_data['categories'] = ITEMS_MARKER
+    
+    problems = validate_part_sequence(headers, 'categories_range')
+    if problems:
+        print("Eroare: secvența părților nu este validă:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return
+    
+    total_categories = sum(counts)
+    original_total = base_data['part_info'].get('original_total')
+    if original_total is not None and original_total != total_categories:
+        print(f"Atenție: {total_categories} categorii în părți, original_total indică {original_total}")
     
     # Actualizează structura finală
-    base_data['categories'] = all_categories
-    base_data['total_categories'] = len(all_categories)
+    base_data['total_categories'] = total_categories
     
     # Elimină informațiile de împărțire
     if 'part_info' in base_data:
         del base_data['part_info']
     
-    # Salvează fișierul unit
+    def iter_categories():
+        for i, part_file in enumerate(part_files):
+            print(f"Procesare fișier {i+1}/{len(part_files)}: {os.path.basename(part_file)}")
+            with open(part_file, 'r', encoding='utf-8') as f:
+                categories, _ = part_categories(json.load(f))
+            for category in categories:
+                yield serialize_item(category, item_indent)
+            print(f"  - Adăugate {len(categories)} categorii")
+    
+    # A doua trecere: scrie categoriile direct în fișierul unit
     print(f"Salvare fișier unit: {output_file}")
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(base_data, f, ensure_ascii=False, indent=2)
+        written = write_streaming_json(f, base_data, ITEMS_MARKER, iter_categories(), item_indent)
     
     # Verifică dimensiunea finală
     final_size_bytes = os.path.getsize(output_file)
     final_size_mb = final_size_bytes / (1024 * 1024)
     
     print(f"Fișierul unit creat cu succes!")
-    print(f"Total categorii: {len(all_categories)}")
+    print(f"Total categorii: {written}")
     print(f"Dimensiunea finală: {final_size_mb:.2f} MB")
 
 if __name__ == "__main__":
@@ -1,20 +1,134 @@
 import json
 import os
 import glob
+import hashlib
+
+from split_products import JSONStreamReader, MANIFEST_FILE, serialize_product
+
+# Marcaj înlocuit cu lista de produse scrisă incremental
+ITEMS_MARKER = "\u0000products\u0000"
+
+# Dimensiunea blocurilor citite la calculul hash-ului unui part
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def load_manifest(split_directory):
+    """Încarcă manifestul unui director de părți; întoarce None dacă lipsește."""
+    manifest_file = os.path.join(split_directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_file):
+        return None
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def file_sha256(path):
+    """Hash-ul SHA-256 al unui fișier, citit pe blocuri."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_part_header(part_file):
+    """
+    Citește cheile unui part aflate înaintea listei de produse.
+    
+    Produsele nu sunt decodate: citirea se oprește la cheia 'products'.
+    """
+    header = {}
+    with open(part_file, 'r', encoding='utf-8') as f:
+        for key, value in JSONStreamReader(f).iter_object(stream_key='products'):
+            if key == 'products':
+                break
+            header[key] = value
+    return header
+
+def iter_part_products(part_file):
+    """Întoarce produsele unui part unul câte unul."""
+    with open(part_file, 'r', encoding='utf-8') as f:
+        for key, value in JSONStreamReader(f).iter_object(stream_key='products'):
+            if key == 'products':
+                yield from value
+                return
+
+def parse_range(text):
+    """Transformă un interval "1-203" în (1, 203)."""
+    start, end = text.split("-")
+    return int(start), int(end)
+
+def validate_part_sequence(headers, range_key):
+    """
+    Verifică secvența părților după part_info: numerotare 1..N, același
+    total_parts peste tot și intervale consecutive, fără goluri sau suprapuneri.
+    
+    Întoarce lista problemelor găsite (goală dacă secvența este corectă).
+    """
+    problems = []
+    expected_start = 1
+    for i, header in enumerate(headers):
+        info = header.get('part_info')
+        if not info:
+            problems.append(f"Partea {i + 1}: lipsește part_info")
+            continue
+        if info.get('part_number') != i + 1:
+            problems.append(f"Partea {i + 1}: part_number este {info.get('part_number')}")
+        if info.get('total_parts') != len(headers):
+            problems.append(f"Partea {i + 1}: total_parts este {info.get('total_parts')}, găsite {len(headers)} părți")
+        if range_key in info:
+            start, end = parse_range(info[range_key])
+            if start != expected_start:
+                problems.append(f"Partea {i + 1}: intervalul {info[range_key]} ar trebui să înceapă la {expected_start}")
+            expected_start = end + 1
+    return problems
+
+def write_streaming_json(f, base_data, marker, items, item_indent):
+    """
+    Scrie `base_data` ca JSON cu indent=2, înlocuind `marker` cu lista
+    elementelor din `items`, serializate și scrise pe rând.
+    
+    Rezultatul este identic cu json.dump(..., indent=2) pe obiectul complet.
+    Întoarce numărul de elemente scrise.
+    """
+    text = json.dumps(base_data, ensure_ascii=False, indent=2)
+    prefix, suffix = text.split(json.dumps(marker), 1)
+    f.write(prefix)
+    count = 0
+    for item_text in items:
+        f.write(("[\n" if count == 0 else ",\n") + item_text)
+        count += 1
+    f.write("[]" if count == 0 else "\n" + item_indent[:-2] + "]")
+    f.write(suffix)
+    return count
 
 def merge_split_files(split_directory, output_file):
     """
     Reunește fișierele JSON împărțite înapoi într-un singur fișier.
     
+    Dacă directorul are `manifest.json`, ordinea părților, datele comune
+    (categories, brands...) și ordinea cheilor sunt luate din manifest, iar
+    fiecare part este verificat după hash și numărul de produse. Altfel se
+    folosesc fișierele part_XX.json găsite, cu antetul din primul fișier.
+    
+    Secvența părților este verificată după part_info înainte de scriere,
+    apoi produsele sunt citite și scrise în fișierul unit unul câte unul,
+    așa că memoria folosită nu depinde de mărimea catalogului.
+    
+    Un layout cu sharding (`<nume>_by_<mod>`) se reunește la fel, dar
+    produsele rămân grupate pe chei, nu în ordinea din catalogul original.
+    
     Args:
         split_directory (str): Directorul care conține fișierele împărțite
         output_file (str): Calea pentru fișierul de ieșire
     """
     print(f"Căutare fișiere în: {split_directory}")
     
-    # Găsește toate fișierele part_XX.json
-    pattern = os.path.join(split_directory, "*_part_*.json")
-    part_files = sorted(glob.glob(pattern))
+    manifest = load_manifest(split_directory)
+    
+    if manifest:
+        part_files = [os.path.join(split_directory, part["file"]) for part in manifest["parts"]]
+        print(f"Manifest găsit: {len(part_files)} părți, {manifest['total_products']} produse")
+    else:
+        # Găsește toate fișierele part_XX.json
+        pattern = os.path.join(split_directory, "*_part_*.json")
+        part_files = sorted(glob.glob(pattern))
     
     if not part_files:
         print("Nu s-au găsit fișiere de tip part_XX.json")
@@ -22,44 +136,72 @@ def merge_split_files(split_directory, output_file):
     
     print(f"Găsite {len(part_files)} fișiere de unit")
     
-    # Încarcă primul fișier pentru a obține structura de bază
-    with open(part_files[0], 'r', encoding='utf-8') as f:
-        base_data = json.load(f)
-    
-    # Inițializează lista de produse unită
-    all_products = []
-    
-    # Procesează fiecare fișier
-    for i, part_file in enumerate(part_files):
-        print(f"Procesare fișier {i+1}/{len(part_files)}: {os.path.basename(part_file)}")
-        
-        with open(part_file, 'r', encoding='utf-8') as f:
-            part_data = json.load(f)
-        
-        # Adaugă produsele din acest fișier
-        if 'products' in part_data:
-            all_products.extend(part_data['products'])
-            print(f"  - Adăugate {len(part_data['products'])} produse")
-    
-    # Actualizează structura finală
-    base_data['products'] = all_products
-    base_data['total_products'] = len(all_products)
+    # Prima trecere: doar antetele, pentru verificarea secvenței și a totalului
+    headers = [read_part_header(part_file) for part_file in part_files]
+    
+    problems = validate_part_sequence(headers, 'products_range')
+    if manifest:
+        for part_file, expected in zip(part_files, manifest["parts"]):
+            if file_sha256(part_file) != expected["sha256"]:
+                problems.append(f"{expected['file']}: hash diferit față de manifest")
+    
+    if problems:
+        print("Eroare: secvența părților nu este validă:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return
+    
+    if manifest:
+        expected_counts = [part["product_count"] for part in manifest["parts"]]
+    else:
+        expected_counts = [header.get('total_products') for header in headers]
+    total_products = sum(count or 0 for count in expected_counts)
+    
+    if manifest:
+        # Reconstruiește structura originală, în ordinea cheilor din manifest
+        base_data = {}
+        for key in manifest["catalog_keys"]:
+            if key == 'products':
+                base_data['products'] = ITEMS_MARKER
+            elif key == 'total_products':
+                base_data['total_products'] = total_products
+            elif key in manifest["shared"]:
+                base_data[key] = manifest["shared"][key]
+    else:
+        # Structura de bază este antetul primului fișier
+        base_data = dict(headers[0])
+        base_data['products'] = ITEMS_MARKER
+        base_data['total_products'] = total_products
     
     # Elimină informațiile de împărțire
     if 'part_info' in base_data:
         del base_data['part_info']
     
-    # Salvează fișierul unit
+    def iter_products():
+        for i, part_file in enumerate(part_files):
+            print(f"Procesare fișier {i+1}/{len(part_files)}: {os.path.basename(part_file)}")
+            count = 0
+            for product in iter_part_products(part_file):
+                count += 1
+                yield serialize_product(product)
+            print(f"  - Adăugate {count} produse")
+            if expected_counts[i] is not None and count != expected_counts[i]:
+                print(f"  - Atenție: {count} produse, antetul indică {expected_counts[i]}")
+    
+    # A doua trecere: scrie produsele direct în fișierul unit
     print(f"Salvare fișier unit: {output_file}")
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(base_data, f, ensure_ascii=False, indent=2)
+        written = write_streaming_json(f, base_data, ITEMS_MARKER, iter_products(), "    ")
+    
+    if written != total_products:
+        print(f"Atenție: scrise {written} produse, total_products indică {total_products}")
     
     # Verifică dimensiunea finală
     final_size_bytes = os.path.getsize(output_file)
     final_size_mb = final_size_bytes / (1024 * 1024)
     
     print(f"Fișierul unit creat cu succes!")
-    print(f"Total produse: {len(all_products)}")
+    print(f"Total produse: {written}")
     print(f"Dimensiunea finală: {final_size_mb:.2f} MB")
 
 if __name__ == "__main__":
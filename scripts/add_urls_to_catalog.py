@@ -5,7 +5,9 @@ Add URLs to existing product catalog.
 
 import json
 import re
-from typing import Dict, List, Optional
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 
 def parse_sitemap_urls(sitemap_file: str) -> List[str]:
     """Parse the sitemap XML and extract product URLs."""
@@ -30,19 +32,22 @@ def parse_sitemap_urls(sitemap_file: str) -> List[str]:
         
     return urls
 
+def match_words(text: str) -> Set[str]:
+    """Lowercase, split on punctuation and keep words longer than 2 chars."""
+    text_clean = re.sub(r'[^\w\s-]', ' ', text.lower())
+    return set(w for w in text_clean.split() if len(w) > 2)
+
+def url_match_words(url: str) -> Set[str]:
+    """Match words of the URL filename (last path segment, without .html)."""
+    return match_words(url.split('/')[-1].replace('.html', ''))
+
 def match_url_to_product_name(url: str, product_name: str) -> float:
     """Calculate similarity score between URL and product name."""
     if not url or not product_name:
         return 0.0
     
-    # Extract filename from URL
-    filename = url.split('/')[-1].replace('.html', '')
-    filename_clean = re.sub(r'[^\w\s-]', ' ', filename.lower())
-    filename_words = set(w for w in filename_clean.split() if len(w) > 2)
-    
-    # Clean product name
-    product_clean = re.sub(r'[^\w\s-]', ' ', product_name.lower())
-    product_words = set(w for w in product_clean.split() if len(w) > 2)
+    filename_words = url_match_words(url)
+    product_words = match_words(product_name)
     
     if not filename_words or not product_words:
         return 0.0
@@ -53,55 +58,117 @@ def match_url_to_product_name(url: str, product_name: str) -> float:
     
     return score
 
+class URLIndex:
+    """Sitemap URLs tokenized once, with a word -> URL positions index."""
+    
+    def __init__(self, urls: List[str]):
+        self.urls = urls
+        self.url_words = [url_match_words(url) for url in urls]
+        self.word_index = defaultdict(list)
+        for position, words in enumerate(self.url_words):
+            for word in words:
+                self.word_index[word].append(position)
+    
+    def best_match(self, product_name: str, threshold: float = 0.3) -> Tuple[str, float]:
+        """Return the best scoring URL for a product name, or ("", 0.0).
+        
+        Only URLs sharing a word with the name can score above zero, so they
+        are the only ones scored. Ties keep the earliest URL in the sitemap.
+        """
+        product_words = match_words(product_name) if product_name else set()
+        if not product_words:
+            return "", 0.0
+        
+        candidates = set()
+        for word in product_words:
+            candidates.update(self.word_index.get(word, ()))
+        
+        best_position = -1
+        best_score = 0.0
+        for position in candidates:
+            filename_words = self.url_words[position]
+            common_words = filename_words.intersection(product_words)
+            score = len(common_words) / max(len(filename_words), len(product_words))
+            if score > threshold and (score > best_score or
+                                      (score == best_score and position < best_position)):
+                best_score = score
+                best_position = position
+        
+        if best_position < 0:
+            return "", 0.0
+        return self.urls[best_position], best_score
+
 def add_urls_to_catalog():
     """Add URLs to existing product catalog."""
+    timings = {}
     print("🔄 Loading existing catalog...")
     
     # Load existing catalog
+    phase_start = time.perf_counter()
     with open('../data/products.json', 'r', encoding='utf-8') as f:
         catalog = json.load(f)
+    timings['load_catalog'] = time.perf_counter() - phase_start
     
     print(f"📦 Loaded {len(catalog['products'])} products")
     
     # Load URLs
     print("🔄 Parsing sitemap URLs...")
+    phase_start = time.perf_counter()
     urls = parse_sitemap_urls('../../link.txt')
+    timings['parse_sitemap'] = time.perf_counter() - phase_start
     print(f"🔗 Found {len(urls)} URLs")
     
+    # Tokenize every sitemap URL once
+    print("🔄 Indexing sitemap URLs...")
+    phase_start = time.perf_counter()
+    url_index = URLIndex(urls)
+    timings['index_urls'] = time.perf_counter() - phase_start
+    print(f"🗂️ Indexed {len(url_index.word_index)} distinct URL words")
+    
     # Match URLs to products
     print("🔄 Matching URLs to products...")
+    phase_start = time.perf_counter()
     matched_count = 0
     
     for i, product in enumerate(catalog['products']):
         if i % 500 == 0:
             print(f"   Processed {i}/{len(catalog['products'])} products...")
         
-        best_url = ""
-        best_score = 0.0
-        
-        # Try to match with URLs (sample first 100 URLs for efficiency)
-        for url in urls[:min(1000, len(urls))]:  # Limit to first 1000 URLs for speed
-            score = match_url_to_product_name(url, product['name'])
-            if score > best_score and score > 0.3:
-                best_score = score
-                best_url = url
+        best_url, _ = url_index.best_match(product['name'])
         
         # Add URL to product
         product['url'] = best_url
         if best_url:
             matched_count += 1
+    timings['match'] = time.perf_counter() - phase_start
     
-    print(f"✅ Matched {matched_count} products with URLs")
+    total_products = len(catalog['products'])
+    unique_urls = len({p['url'] for p in catalog['products'] if p['url']})
+    url_coverage = round(matched_count / total_products * 100, 1) if total_products else 0.0
+    sitemap_coverage = round(unique_urls / len(urls) * 100, 1) if urls else 0.0
+    
+    print(f"✅ Matched {matched_count} products with URLs ({url_coverage}%)")
+    print(f"🔗 {unique_urls}/{len(urls)} sitemap URLs used ({sitemap_coverage}%)")
     
     # Update catalog metadata
     catalog['last_updated'] = "2025-07-28T22:30:00.000000"
+    metadata = catalog.setdefault('metadata', {})
+    metadata['url_coverage'] = url_coverage
+    metadata['unique_urls'] = unique_urls
+    metadata['sitemap_urls_total'] = len(urls)
     
     # Save updated catalog
+    phase_start = time.perf_counter()
     with open('../data/products.json', 'w', encoding='utf-8') as f:
         json.dump(catalog, f, indent=2, ensure_ascii=False)
+    timings['save_catalog'] = time.perf_counter() - phase_start
     
     print("✅ Updated catalog saved!")
     
+    print("\n⏱️ Time per phase:")
+    for phase, seconds in timings.items():
+        print(f"   {phase}: {seconds:.3f}s")
+    
     # Show sample with URLs
     products_with_urls = [p for p in catalog['products'] if p.get('url')]
     print(f"\n📋 Sample products with URLs ({len(products_with_urls)} total):")
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Asyncio crawl engine for the BikeStylish scraper
+
+Runs the same crawl as ``BikeStylishScraper.run_scraper`` (categories, their
+listing pages, then product pages) but keeps several requests in flight:
+a semaphore bounds the concurrency and a token bucket per host spaces the
+requests out, so the crawl keeps the scraper's politeness budget (by default
+two requests per second, like its 0.5 s sleeps) while network waits overlap
+instead of adding up. Parsing reuses the scraper's own parse methods, so the
+resulting catalog has the same structure.
+
+aiohttp is optional: without it requests are made with the scraper's
+blocking session in worker threads.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Requests per second allowed per host, and how many may be sent back to back
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 1
+
+DEFAULT_CONCURRENCY = 8
+
+REQUEST_TIMEOUT = 30
+
+# Headers the HTTP client manages itself
+CLIENT_MANAGED_HEADERS = ('Accept-Encoding', 'Connection')
+
+class TokenBucket:
+    """Token bucket: ``rate`` tokens per second, holding at most ``capacity``.
+
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self.updated is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            # Sleep until the next token; holding the lock keeps the queue in order
+            wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+            self.tokens = 0
+            self.updated = now + wait
+
+class HostRateLimiter:
+    """One token bucket per host."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str):
+        host = urlparse(url).netloc
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        await bucket.acquire()
+
+class AsyncCrawler:
+    """Concurrent, rate-limited crawl driven by a BikeStylishScraper."""
+
+    def __init__(self, scraper, concurrency: int = DEFAULT_CONCURRENCY,
+                 rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST):
+        self.scraper = scraper
+        self.concurrency = concurrency
+        self.limiter = HostRateLimiter(rate, burst)
+        self.requests_made = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session = None
+
+    @asynccontextmanager
+    async def _open(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        if aiohttp is None:
+            yield
+            return
+        headers = {key: value for key, value in self.scraper.session.headers.items()
+                   if key not in CLIENT_MANAGED_HEADERS}
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout) as session:
+            self._session = session
+            try:
+                yield
+            finally:
+                self._session = None
+
+    async def _download(self, url: str, headers: Dict[str, str]):
+        """Status, headers and body of one GET."""
+        if self._session is not None:
+            async with self._session.get(url, headers=headers) as response:
+                if response.status != 304:
+                    response.raise_for_status()
+                return response.status, response.headers, await response.read()
+
+        def blocking_get():
+            response = self.scraper.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response.status_code, response.headers, response.content
+        return await asyncio.to_thread(blocking_get)
+
+    async def fetch(self, url: str, retries: int = 3) -> Optional[Tuple[bytes, bool]]:
+        """Download a page within the concurrency and rate limits, with retries.
+
+        Goes through the scraper's HTTP cache when it has one and returns
+        (content, unchanged) like ``BikeStylishScraper.fetch``.
+        """
+        cache = self.scraper.cache
+        entry = cache.lookup(url) if cache else None
+        if entry and cache.is_fresh(entry):
+            return cache.hit(entry), True
+        headers = cache.conditional_headers(entry) if cache else {}
+
+        for attempt in range(retries):
+            try:
+                async with self._semaphore:
+                    await self.limiter.acquire(url)
+                    self.requests_made += 1
+                    status, response_headers, content = await self._download(url, headers)
+                if entry and status == 304:
+                    return cache.revalidated(entry, response_headers), True
+                if cache:
+                    cache.store(url, content, response_headers)
+                return content, False
+            except Exception as e:
+                logging.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
+                if attempt < retries - 1:
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    logging.error(f"Failed to fetch {url} after {retries} attempts")
+        return None
+
+    async def get_record(self, url: str, kind: str, parse: Callable[[Any], Any]) -> Any:
+        """Async ``BikeStylishScraper.get_record``, sharing its cache and journal."""
+        journal = self.scraper.journal
+        if journal:
+            record = journal.get(kind, url)
+            if record is not None:
+                return record
+        fetched = await self.fetch(url)
+        if not fetched:
+            return None
+        record = self.scraper.parse_record(url, kind, fetched[0], fetched[1], parse)
+        if journal and record is not None:
+            journal.record(kind, url, record)
+        return record
+
+    async def crawl_categories(self) -> List[Dict]:
+        logging.info("Scraping categories...")
+        categories = await self.get_record(self.scraper.base_url, 'categories', self.scraper.parse_categories)
+        if categories is None:
+            return []
+        logging.info(f"Found {len(categories)} categories")
+        return categories
+
+    async def crawl_product_list(self, category_url: str, max_pages: int = 5) -> List[str]:
+        """Listing pages are walked in order, as the end of the pagination is only known on arrival."""
+        product_urls = []
+        for page in range(1, max_pages + 1):
+            page_links = await self.get_record(f"{category_url}?page={page}", 'product_links',
+                                               self.scraper.parse_all_product_links)
+            if page_links is None:
+                break
+            page_products = [url for url in page_links if url not in product_urls]
+            if not page_products:
+                break
+            product_urls.extend(page_products)
+            logging.info(f"Found {len(page_products)} products on page {page}")
+        return product_urls
+
+    async def crawl_product(self, product_url: str):
+        record = await self.get_record(product_url, 'product',
+                                       lambda tree: self.scraper.parse_product_record(tree, product_url))
+        return self.scraper.product_from_record(record)
+
+    async def crawl_category(self, category: Dict, max_products_per_category: int) -> List:
+        logging.info(f"Scraping category: {category['name']}")
+        product_urls = await self.crawl_product_list(
+            category['url'],
+            max_pages=max_products_per_category // 20
+        )
+        product_urls = product_urls[:max_products_per_category]
+
+        products = await asyncio.gather(*(self.crawl_product(url) for url in product_urls))
+        category_products = [product.replace(category=category['id']) for product in products if product]
+        category['count'] = len(category_products)
+        logging.info(f"Scraped {len(category_products)} products from {category['name']}")
+        return category_products
+
+    async def crawl_products(self, product_urls: List[str]) -> List:
+        """Crawl a known list of product pages, without walking categories.
+
+        Results are in the order of ``product_urls`` (None for failed pages).
+        """
+        async with self._open():
+            return await asyncio.gather(*(self.crawl_product(url) for url in product_urls))
+
+    async def crawl(self, max_products_per_category: int = 50) -> Dict:
+        """Crawl every category concurrently and build the catalog.
+
+        Products keep the order of the sequential crawl: category by
+        category, in listing order.
+        """
+        logging.info("Starting BikeStylish.ro scraping (async)...")
+        async with self._open():
+            categories = await self.crawl_categories()
+            per_category = await asyncio.gather(
+                *(self.crawl_category(category, max_products_per_category) for category in categories))
+
+        all_products = [product for products in per_category for product in products]
+        catalog = self.scraper.build_catalog(categories, all_products)
+        logging.info(f"Scraping completed. Total products: {len(all_products)}")
+        return catalog
+
+def run_async_scraper(scraper, max_products_per_category: int = 50,
+                      concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE) -> Dict:
+    """Run the asyncio crawl to completion and return the catalog."""
+    return asyncio.run(AsyncCrawler(scraper, concurrency, rate).crawl(max_products_per_category))
+
+def benchmark_against_standin(categories: int = 3, products_per_category: int = 20,
+                              latency: float = 0.25, rates=(DEFAULT_RATE, 10.0)) -> List[Dict]:
+    """Time the sequential scraper and the async engine against a local stand-in site."""
+    from scraper import BikeStylishScraper
+    from standin_site import StandinSite
+
+    def comparable(catalog):
+        return ([category['count'] for category in catalog['categories']],
+                [{**product.to_dict(), 'scraped_at': None} for product in catalog['products']],
+                catalog['brands'])
+
+    results = []
+    with StandinSite(categories, products_per_category, latency=latency) as site:
+        scraper = BikeStylishScraper()
+        scraper.base_url = site.base_url
+        start = time.perf_counter()
+        reference = scraper.run_scraper(max_products_per_category=products_per_category)
+        elapsed = time.perf_counter() - start
+        results.append({'engine': 'sequential', 'seconds': elapsed, 'requests': len(site.requests),
+                        'peak_per_second': site.peak_rate(), 'identical': True})
+
+        for rate in rates:
+            site.requests.clear()
+            scraper = BikeStylishScraper()
+            scraper.base_url = site.base_url
+            start = time.perf_counter()
+            catalog = run_async_scraper(scraper, products_per_category, rate=rate)
+            elapsed = time.perf_counter() - start
+            results.append({'engine': f'async {rate:g} req/s', 'seconds': elapsed, 'requests': len(site.requests),
+                            'peak_per_second': site.peak_rate(),
+                            'identical': comparable(catalog) == comparable(reference)})
+
+    print(f"📊 {categories} categories × {products_per_category} products, {latency * 1000:.0f} ms latency, "
+          f"HTTP client: {'aiohttp' if aiohttp else 'requests in threads'}")
+    for result in results:
+        print(f"⏱️ {result['engine']:>18}: {result['seconds']:6.2f}s, {result['requests']} requests, "
+              f"peak {result['peak_per_second']} req in 1s {'✅' if result['identical'] else '❌'}")
+    return results
+
+if __name__ == "__main__":
+    benchmark_against_standin()
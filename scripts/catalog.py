@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Shared catalog core for the BikeStylish scripts
+
+Defines the compact Product record used by the parser, the AI enhancer,
+the category/brand generators and the scraper, plus the helpers that
+derive normalized fields (lowered name, name tokens, numeric price, brand)
+so every stage computes them once per product instead of per use.
+"""
+
+import json
+import re
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+# Fields stored directly in slots, in the order the parser publishes them
+CORE_FIELDS = (
+    'id', 'name', 'brand', 'category', 'price', 'currency', 'availability',
+    'stock_quantity', 'sku', 'ean', 'description', 'url', 'images', 'rating',
+    'reviews_count', 'warranty', 'tags', 'scraped_at', 'original_price',
+    'discount_percent', 'weight'
+)
+
+# Low-cardinality string fields shared by thousands of products
+INTERNED_FIELDS = ('brand', 'category', 'currency', 'availability', 'warranty')
+
+# List fields kept as tuples inside the record and published as lists
+LIST_FIELDS = ('images', 'tags')
+
+_CORE_SET = frozenset(CORE_FIELDS)
+_INTERNED_SET = frozenset(INTERNED_FIELDS)
+_LIST_SET = frozenset(LIST_FIELDS)
+
+PRICE_FIELDS = ('price', 'pret_sugerat', 'pret_produs', 'pret')
+BRAND_FIELDS = ('brand', 'marca', 'producator', 'manufacturer')
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Key layouts (key order, absent core fields) shared between records
+_KEY_LAYOUTS: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+
+def extract_price(data: Any) -> float:
+    """Extract the first positive numeric price from product data."""
+    if isinstance(data, Product):
+        return data.price_value
+
+    for field in PRICE_FIELDS:
+        if field in data:
+            try:
+                price = float(data[field])
+                if price > 0:
+                    return price
+            except (ValueError, TypeError):
+                continue
+
+    return 0.0
+
+def extract_brand(data: Any) -> str:
+    """Extract brand from product data."""
+    for field in BRAND_FIELDS:
+        if field in data and data[field]:
+            return str(data[field]).strip()
+
+    return ""
+
+def name_words(text: str) -> Tuple[str, ...]:
+    """Split already lowered text into words, keeping order and repeats."""
+    return tuple(WORD_PATTERN.findall(text))
+
+class Product(Mapping):
+    """Immutable, slotted product record.
+
+    Core fields live in slots and low-cardinality strings are interned; any
+    other key (AI enhancement sections, scraper extras) is kept in ``extra``.
+    The original key order is remembered so ``to_dict`` reproduces the
+    published JSON exactly. Records also behave as read-only mappings, so
+    code written against product dicts keeps working: list fields read as
+    (fresh) lists and a record equals its dict form. Records hash on their
+    core fields.
+    """
+
+    __slots__ = CORE_FIELDS + ('extra', 'keys_order', 'price_value',
+                               '_name_lower', '_words', '_tokens')
+
+    def __init__(self, **fields):
+        setattr_ = object.__setattr__
+        extra = None
+        for key, value in fields.items():
+            if key in _CORE_SET:
+                if key in _INTERNED_SET:
+                    if type(value) is str:
+                        value = sys.intern(value)
+                elif type(value) is list and key in _LIST_SET:
+                    if key == 'tags':
+                        value = [sys.intern(v) if type(v) is str else v for v in value]
+                    value = tuple(value)
+                setattr_(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[sys.intern(key)] = value
+
+        keys = tuple(fields)
+        layout = _KEY_LAYOUTS.get(keys)
+        if layout is None:
+            layout = _KEY_LAYOUTS[keys] = (keys, tuple(_CORE_SET.difference(keys)))
+        # Absent core fields read as None
+        for field in layout[1]:
+            setattr_(self, field, None)
+        setattr_(self, 'keys_order', layout[0])
+        setattr_(self, 'extra', extra)
+
+        # Derived fields: the price is always needed, the text forms are
+        # computed on first use and then cached on the record
+        setattr_(self, 'price_value', extract_price(fields))
+        setattr_(self, '_name_lower', None)
+        setattr_(self, '_words', None)
+        setattr_(self, '_tokens', None)
+
+    @property
+    def name_lower(self) -> str:
+        """Lowercased product name."""
+        if self._name_lower is None:
+            object.__setattr__(self, '_name_lower', (self.name or '').lower())
+        return self._name_lower
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        """Words of the lowercased name, in order."""
+        if self._words is None:
+            object.__setattr__(self, '_words', name_words(self.name_lower))
+        return self._words
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        """Set of the name words, for overlap and membership checks."""
+        if self._tokens is None:
+            object.__setattr__(self, '_tokens', frozenset(self.words))
+        return self._tokens
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"Product is immutable, use replace(): {key}")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"Product is immutable: {key}")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Product':
+        """Build a record from a product dict (parser, enhanced or scraped)."""
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        """Return the product as a plain dict, in the original key order."""
+        result = {}
+        extra = self.extra
+        for key in self.keys_order:
+            if key in _CORE_SET:
+                value = getattr(self, key)
+                if type(value) is tuple and key in _LIST_SET:
+                    value = list(value)
+            else:
+                value = extra[key]
+            result[key] = value
+        return result
+
+    def __reduce__(self):
+        # Slots are set through object.__setattr__, so pickling (process
+        # pools) rebuilds the record from its dict form instead
+        return (Product.from_dict, (self.to_dict(),))
+
+    def replace(self, **changes) -> 'Product':
+        """Return a copy with some fields changed or added."""
+        fields = self.to_dict()
+        fields.update(changes)
+        return Product(**fields)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _CORE_SET:
+            value = getattr(self, key)
+            # Absent core fields are stored as None
+            if value is None and key not in self.keys_order:
+                raise KeyError(key)
+            if type(value) is tuple and key in _LIST_SET:
+                return list(value)
+            return value
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key) -> bool:
+        return key in self.keys_order
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys_order)
+
+    def __len__(self) -> int:
+        return len(self.keys_order)
+
+    # Mapping compares by items, which would leave records unhashable; equal
+    # records have equal core fields, so hashing those is consistent
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, field) for field in CORE_FIELDS))
+
+    def __repr__(self) -> str:
+        return f"Product(sku={self.sku!r}, name={self.name!r})"
+
+def as_product(product: Any) -> Product:
+    """Return ``product`` as a Product, converting dicts when needed."""
+    if isinstance(product, Product):
+        return product
+    return Product.from_dict(product)
+
+def is_product_dict(data: Dict) -> bool:
+    """Tell product objects apart from categories, brands and nested sections.
+
+    Parsed products carry a 'sku'; products written by the scraper only an
+    'id'. Categories and brands have no 'price'.
+    """
+    return 'name' in data and 'price' in data and ('sku' in data or 'id' in data)
+
+def _product_hook(data: Dict) -> Any:
+    return Product.from_dict(data) if is_product_dict(data) else data
+
+def load_catalog(path: str) -> Dict:
+    """Load a catalog JSON file, decoding each product straight into a Product.
+
+    Products are converted while the file is decoded, so the full list of
+    product dicts never exists in memory at the same time. Any entry of
+    ``products`` the decoder did not recognize is converted afterwards.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        catalog = json.load(f, object_hook=_product_hook)
+    if isinstance(catalog, dict) and isinstance(catalog.get('products'), list):
+        catalog['products'] = [as_product(product) for product in catalog['products']]
+    return catalog
+
+def json_default(obj: Any) -> Any:
+    """``default`` hook for json.dump that serializes Product records."""
+    if isinstance(obj, Product):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def save_catalog(catalog: Dict, path: str, indent: Optional[int] = 2) -> None:
+    """Write a catalog containing Product records as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=indent, default=json_default)
+
+def products_to_dicts(products: List[Product]) -> List[Dict]:
+    """Convert a list of records back to published product dicts."""
+    return [product.to_dict() for product in products]
+
+def check_load_catalog() -> bool:
+    """Load a scraper-shaped and a parser-shaped catalog and check that every
+    product comes back as a Product and round-trips unchanged."""
+    import os
+    import tempfile
+
+    scraped = {
+        'id': 'bicicleta-cross-gravel', 'name': 'Bicicleta Cross Gravel', 'brand': 'Cross',
+        'category': 'biciclete', 'price': 2499.0, 'currency': 'RON', 'availability': 'in_stock',
+        'description': '', 'url': 'https://bikestylish.ro/produs/x', 'images': ['https://bikestylish.ro/x.jpg'],
+        'scraped_at': '2026-01-01T00:00:00'
+    }
+    parsed = {'id': 'sxt-1', 'sku': 'SXT1', 'name': 'Anvelopa KENDA', 'brand': 'KENDA', 'price': 59.9}
+    # A product without a price is not recognized while decoding
+    priceless = {'id': 'fara-pret', 'name': 'Produs fara pret', 'brand': 'SXT'}
+    catalog = {
+        'categories': [{'id': 'biciclete', 'name': 'Biciclete', 'url': 'https://bikestylish.ro/biciclete', 'count': 1}],
+        'brands': [{'name': 'Cross', 'product_count': 1}],
+        'products': [scraped, parsed, priceless]
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'products.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(catalog, f)
+        loaded = load_catalog(path)
+
+    ok = (all(isinstance(product, Product) for product in loaded['products'])
+          and [product.to_dict() for product in loaded['products']] == catalog['products']
+          and loaded['categories'] == catalog['categories'] and loaded['brands'] == catalog['brands']
+          and loaded['products'][0].name_lower == 'bicicleta cross gravel'
+          # Records still read like the dicts they came from
+          and loaded['products'] == catalog['products']
+          and loaded['products'][0]['images'] + ['y.jpg'] == scraped['images'] + ['y.jpg']
+          and len(set(loaded['products'])) == len(catalog['products']))
+    print(f"{'✅' if ok else '❌'} load_catalog: {len(loaded['products'])} products "
+          f"({', '.join(type(product).__name__ for product in loaded['products'])})")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if check_load_catalog() else 1)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Product -> category matching for the BikeStylish scripts
+
+Finds the categories of the AI-enhanced category tree a product belongs to:
+terms of the category ids and names looked up in the product's text through
+one keyword automaton, with keyword-based inference as the fallback. Kept
+free of pandas so the SQLite export and other catalog consumers can use it
+without the XLS tooling.
+"""
+
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from catalog import as_product
+from keyword_engine import RuleSet
+
+class CategoryTermIndex:
+    """Term -> category index over a category lookup, built once.
+    
+    A category matches a product when one of the terms of its id occurs in
+    the product's name, description or category, or one of the words of its
+    name occurs in the product's name (terms of 2 letters or less are
+    ignored). All terms go into one keyword automaton, so each product text
+    is scanned once and the matching categories are read off the hits.
+    """
+    
+    def __init__(self, category_lookup: Dict):
+        self.category_ids = list(category_lookup)
+        self.id_terms = defaultdict(list)
+        self.name_terms = defaultdict(list)
+        for position, (cat_id, cat_info) in enumerate(category_lookup.items()):
+            for term in dict.fromkeys(cat_id.replace('-', ' ').split()):
+                if len(term) > 2:
+                    self.id_terms[term].append(position)
+            for term in dict.fromkeys(cat_info['name'].lower().split()):
+                if len(term) > 2:
+                    self.name_terms[term].append(position)
+        
+        self.rules = RuleSet({
+            'id_terms': [(term, [term]) for term in self.id_terms],
+            'name_terms': [(term, [term]) for term in self.name_terms]
+        })
+    
+    def match(self, product_name: str, product_desc: str, product_cat: str) -> List[str]:
+        """Ids of the matching categories, in category lookup order."""
+        positions = set()
+        for text in (product_name, product_desc, product_cat):
+            for term in self.rules.all(text, 'id_terms'):
+                positions.update(self.id_terms[term])
+        for term in self.rules.all(product_name, 'name_terms'):
+            positions.update(self.name_terms[term])
+        return [self.category_ids[position] for position in sorted(positions)]
+
+@lru_cache(maxsize=8)
+def _cached_category_index(categories: Tuple[Tuple[str, str], ...]) -> CategoryTermIndex:
+    return CategoryTermIndex({cat_id: {'name': name} for cat_id, name in categories})
+
+def build_category_index(category_lookup: Dict) -> CategoryTermIndex:
+    """Term index for a category lookup, reused while the ids and names are unchanged."""
+    return _cached_category_index(tuple((cat_id, cat_info['name']) for cat_id, cat_info in category_lookup.items()))
+
+def find_product_categories(product: Dict, category_lookup: Dict,
+                            index: Optional[CategoryTermIndex] = None) -> List[str]:
+    """Find which categories a product belongs to - FIXED VERSION
+    
+    Pass an index from build_category_index when matching many products
+    against the same categories; otherwise a cached one is used.
+    """
+    
+    product = as_product(product)
+    product_name = product.name_lower
+    product_desc = product.get('description', '').lower()
+    product_cat = product.get('category', '').lower()
+    
+    if index is None:
+        index = build_category_index(category_lookup)
+    matched_categories = index.match(product_name, product_desc, product_cat)
+    
+    # If no direct match, try to infer from product type
+    if not matched_categories:
+        matched_categories = infer_category_from_product(product, category_lookup)
+    
+    return matched_categories
+
+def find_product_categories_linear(product: Dict, category_lookup: Dict) -> List[str]:
+    """Category-by-category reference for find_product_categories, kept to validate and benchmark the index."""
+    
+    product = as_product(product)
+    product_name = product.name_lower
+    product_desc = product.get('description', '').lower()
+    product_cat = product.get('category', '').lower()
+    
+    matched_categories = []
+    
+    # Try direct category matching
+    for cat_id, cat_info in category_lookup.items():
+        cat_name = cat_info['name'].lower()
+        cat_terms = cat_id.replace('-', ' ').split()
+        
+        # Check if any category terms appear in product data
+        found_match = False
+        for term in cat_terms:
+            if len(term) > 2:  # Ignore very short terms
+                if (term in product_name or 
+                    term in product_desc or 
+                    term in product_cat):
+                    matched_categories.append(cat_id)
+                    found_match = True
+                    break
+        
+        if found_match:
+            continue
+            
+        # Also check if category name appears in product
+        for term in cat_name.split():
+            if len(term) > 2 and term in product_name:
+                matched_categories.append(cat_id)
+                break
+    
+    # Remove duplicates while preserving order
+    matched_categories = list(dict.fromkeys(matched_categories))
+    
+    # If no direct match, try to infer from product type
+    if not matched_categories:
+        matched_categories = infer_category_from_product(product, category_lookup)
+    
+    return matched_categories
+
+# Product keywords -> category id fragment; a hit adds every category whose
+# id contains the fragment. Rules are checked in this order.
+INFERENCE_RULES = [
+    ('lumini', ['lumina', 'led', 'far', 'stop', 'light', 'lamp', 'lanterna', 'flash']),
+    ('reflectorizante', ['reflector', 'reflect', 'visibility', 'reflectorizant', 'stegulet', 'reflectors']),
+    ('antifurt', ['antifurt', 'lock', 'security', 'lacăt', 'blocare']),
+    ('pompe', ['pompă', 'pump', 'inflate', 'umflare', 'presiune']),
+    ('casti', ['casca', 'helmet', 'cască', 'cap', 'protecție']),
+    ('manusi', ['mănuși', 'gloves', 'mâini', 'grip']),
+    ('tricouri', ['tricou', 'jersey', 'shirt', 'îmbrăcăminte']),
+    ('pantaloni', ['pantaloni', 'shorts', 'bibshort', 'colant']),
+    ('anvelope', ['anvelopă', 'tire', 'cauciuc', 'roată']),
+    ('camere', ['cameră', 'tube', 'inner', 'valvă']),
+    ('pedale', ['pedală', 'pedal', 'click', 'platformă']),
+    ('șei', ['șa', 'saddle', 'seat', 'scaun']),
+    ('ghidoane', ['ghidon', 'handlebar', 'bar', 'directionare']),
+    ('frane', ['frână', 'brake', 'disc', 'plăcuță', 'saboti']),
+    ('schimbatoare', ['schimbător', 'derailleur', 'viteze', 'transmisie']),
+    ('lanturi', ['lanț', 'chain', 'transmisie', 'angrenaj']),
+    ('roti', ['roată', 'wheel', 'butuc', 'jantă']),
+    ('scule', ['cheie', 'tool', 'reparare', 'demontare', 'service']),
+    ('cosuri', ['coș', 'basket', 'transport', 'încărcătură']),
+    ('aparatori', ['apărător', 'mudguard', 'noroi', 'protecție']),
+    ('suporturi', ['suport', 'support', 'holder', 'mount']),
+    # Special product types
+    ('copii', ['copii', 'child']),
+    ('e-bike', ['e-bike', 'electric'])
+]
+
+INFERENCE_RULE_SET = RuleSet({'category': INFERENCE_RULES})
+
+@lru_cache(maxsize=32)
+def _categories_by_fragment(category_ids: Tuple[str, ...]) -> Dict[str, List[str]]:
+    """Category ids containing each inference fragment, computed once per category set."""
+    return {
+        fragment: [cat_id for cat_id in category_ids if fragment in cat_id]
+        for fragment, _ in INFERENCE_RULES
+    }
+
+def infer_category_from_product(product: Dict, category_lookup: Dict) -> List[str]:
+    """Infer category from product characteristics - ENHANCED VERSION"""
+    
+    product = as_product(product)
+    product_name = product.name_lower
+    product_desc = product.get('description', '').lower()
+    combined_text = f"{product_name} {product_desc}"
+    
+    # One scan of the text finds every rule with a matching keyword
+    categories_by_fragment = _categories_by_fragment(tuple(category_lookup))
+    matched_categories = []
+    for fragment in INFERENCE_RULE_SET.all(combined_text, 'category'):
+        matched_categories.extend(categories_by_fragment[fragment])
+    
+    # Remove duplicates
+    return list(dict.fromkeys(matched_categories))
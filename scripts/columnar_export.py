@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Columnar export of the BikeStylish catalog
+
+Writes the products as a Parquet (or Arrow IPC) file with typed numeric
+columns and dictionary-encoded low-cardinality strings, so analytics such
+as price-range or brand-coverage reports can read only the columns they
+need instead of re-parsing the JSON parts.
+
+pyarrow is optional: without it the export is skipped with a message.
+"""
+
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from catalog import CORE_FIELDS, INTERNED_FIELDS, LIST_FIELDS, load_catalog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Numeric columns, stored as float64 / int64
+FLOAT_COLUMNS = ('price', 'original_price', 'discount_percent', 'rating')
+INT_COLUMNS = ('stock_quantity', 'reviews_count')
+
+# Low-cardinality strings, stored as dictionary-encoded columns
+DICTIONARY_COLUMNS = INTERNED_FIELDS
+
+# Rows per record batch / Parquet row group
+BATCH_SIZE = 10000
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+def columnar_available() -> bool:
+    """Tell whether pyarrow is installed."""
+    return pa is not None
+
+def catalog_schema() -> 'pa.Schema':
+    """Arrow schema of the exported products, in catalog field order."""
+    dictionary_string = pa.dictionary(pa.int32(), pa.string())
+    fields = []
+    for name in CORE_FIELDS:
+        if name in FLOAT_COLUMNS:
+            fields.append(pa.field(name, pa.float64()))
+        elif name in INT_COLUMNS:
+            fields.append(pa.field(name, pa.int64()))
+        elif name in DICTIONARY_COLUMNS:
+            fields.append(pa.field(name, dictionary_string))
+        elif name in LIST_FIELDS:
+            fields.append(pa.field(name, pa.list_(pa.string())))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (ValueError, TypeError):
+        return None
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(float(value)) if value not in (None, '') else None
+    except (ValueError, TypeError):
+        return None
+
+def _to_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+def _column_values(name: str, products: List[Any]) -> List[Any]:
+    """Typed values of one column for a batch of products."""
+    if name in FLOAT_COLUMNS:
+        return [_to_float(product.get(name)) for product in products]
+    if name in INT_COLUMNS:
+        return [_to_int(product.get(name)) for product in products]
+    if name in LIST_FIELDS:
+        return [[str(v) for v in product.get(name) or ()] for product in products]
+    return [_to_str(product.get(name)) for product in products]
+
+def products_to_batch(products: List[Any], schema: 'pa.Schema') -> 'pa.RecordBatch':
+    """Convert a batch of products (Product records or dicts) to a record batch."""
+    arrays = []
+    for field in schema:
+        values = _column_values(field.name, products)
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def _batches(products: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    batch = []
+    for product in products:
+        batch.append(product)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def export_columnar(products: Iterable[Any], path: str, fmt: str = 'parquet') -> Optional[Dict]:
+    """Write products to a Parquet or Arrow IPC file, one batch at a time.
+
+    Returns a summary (rows, bytes, format) or None when pyarrow is missing.
+    """
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format: {fmt} (expected one of {COLUMNAR_FORMATS})")
+    if not columnar_available():
+        print("⚠️ pyarrow is not installed, skipping columnar export (pip install pyarrow)")
+        return None
+
+    schema = catalog_schema()
+    rows = 0
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(path, schema, compression='zstd',
+                                  use_dictionary=list(DICTIONARY_COLUMNS))
+        try:
+            for batch in _batches(products, BATCH_SIZE):
+                writer.write_batch(products_to_batch(batch, schema), row_group_size=BATCH_SIZE)
+                rows += len(batch)
+        finally:
+            writer.close()
+    else:
+        # The IPC file format allows one dictionary per column, so the batches
+        # are unified before writing (the columns are compact at this point)
+        batches = [products_to_batch(batch, schema) for batch in _batches(products, BATCH_SIZE)]
+        table = pa.Table.from_batches(batches, schema=schema).unify_dictionaries()
+        rows = table.num_rows
+        with pa.ipc.new_file(path, schema) as writer:
+            writer.write_table(table)
+
+    return {"format": fmt, "rows": rows, "bytes": os.path.getsize(path)}
+
+def read_columns(path: str, columns: List[str]) -> 'pa.Table':
+    """Read only the given columns from a Parquet or Arrow IPC export."""
+    if path.endswith('.parquet'):
+        return pq.read_table(path, columns=columns)
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all().select(columns)
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('--') else '../data/products_ai_enhanced.json'
+    fmt = 'arrow' if '--arrow' in sys.argv else 'parquet'
+    output_file = os.path.splitext(input_file)[0] + ('.arrow' if fmt == 'arrow' else '.parquet')
+
+    print(f"📦 Loading {input_file}...")
+    products = load_catalog(input_file)['products']
+
+    summary = export_columnar(products, output_file, fmt)
+    if summary:
+        print(f"✅ {summary['rows']} products written to {output_file} "
+              f"({summary['bytes'] / (1024 * 1024):.2f} MB, {fmt})")
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,13 @@
 Convert Excel file to CSV with proper structure for BikeStylish data.
 """
 
-import pandas as pd
-import sys
+from feed_cache import load_feed
 
 def convert_excel_to_csv():
     """Convert the Excel file to CSV format with proper structure."""
     try:
-        # Read Excel file
-        df = pd.read_excel('../sxt26.xls')
+        # Read Excel file (served from the columnar cache while the XLS is unchanged)
+        df = load_feed('../sxt26.xls')
         print(f"📊 Loaded {len(df)} rows from Excel")
         print(f"📋 Columns: {list(df.columns)}")
         
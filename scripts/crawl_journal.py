@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for resumable BikeStylish crawls
+
+While a crawl runs, every page it finishes (the category list, each
+category listing page and each product) is appended to a JSON Lines journal
+as soon as it is parsed. If the crawl dies halfway, the next run replays the
+journal and only fetches what is missing, so an interrupted crawl costs the
+pages it had left, not a full re-crawl. The journal is removed once the
+catalog has been saved.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+JOURNAL_FILE = '../data/.scrape_journal.jsonl'
+
+# Bumped whenever the journaled records change, so an older journal is not replayed
+JOURNAL_VERSION = 1
+
+class CrawlJournal:
+    """Append-only record of finished pages, keyed by (kind, url).
+
+    Each line is ``{"kind": ..., "url": ..., "record": ...}``; the first line
+    holds the journal version. A line cut short by a crash is dropped when
+    the journal is reopened.
+    """
+
+    def __init__(self, path: str = JOURNAL_FILE):
+        self.path = path
+        self.records: Dict[Tuple[str, str], Any] = {}
+        self.replayed = 0
+        self._file = None
+
+    def open(self) -> 'CrawlJournal':
+        """Load the records of an interrupted crawl and reopen the journal for appending."""
+        good_size = self._load() if os.path.exists(self.path) else 0
+        if good_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_size)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            logging.info(f"Resuming crawl from {self.path}: {len(self.records)} pages already done")
+        else:
+            self.records.clear()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._append({'kind': 'journal', 'version': JOURNAL_VERSION})
+        return self
+
+    def _load(self) -> int:
+        """Read the journal; returns the size of its valid part (0 to start over)."""
+        good_size = 0
+        with open(self.path, 'rb') as f:
+            for number, line in enumerate(f):
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if number == 0:
+                    if entry.get('kind') != 'journal' or entry.get('version') != JOURNAL_VERSION:
+                        return 0
+                else:
+                    self.records[(entry['kind'], entry['url'])] = entry['record']
+                good_size += len(line)
+        return good_size
+
+    def _append(self, entry: Dict) -> None:
+        # Flushed line by line, so a killed process loses at most the page in progress
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def get(self, kind: str, url: str) -> Optional[Any]:
+        """Record journaled for a page, or None when it still has to be crawled."""
+        record = self.records.get((kind, url))
+        if record is not None:
+            self.replayed += 1
+        return record
+
+    def record(self, kind: str, url: str, record: Any) -> None:
+        """Journal a finished page (a JSON-serializable record)."""
+        self.records[(kind, url)] = record
+        self._append({'kind': kind, 'url': url, 'record': record})
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Remove the journal once the crawl's output is safely saved."""
+        self.close()
+        self.records.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> 'CrawlJournal':
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+def benchmark_resume(categories: int = 3, products_per_category: int = 20,
+                     crash_after: int = 45, latency: float = 0.05) -> List[Dict]:
+    """Interrupt a crawl of a local stand-in site after ``crash_after`` products,
+    resume it from the journal and compare with an uninterrupted crawl."""
+    import tempfile
+    from scraper import BikeStylishScraper
+    from standin_site import StandinSite
+
+    def comparable(catalog):
+        return [{**product.to_dict(), 'scraped_at': None} for product in catalog['products']]
+
+    with tempfile.TemporaryDirectory() as journal_dir, \
+            StandinSite(categories, products_per_category, latency=latency) as site:
+        def crawl(journal=None, crash_after=None):
+            site.requests.clear()
+            scraper = BikeStylishScraper(journal=journal)
+            scraper.base_url = site.base_url
+            if crash_after is not None:
+                # Simulated kill: the product page after the first crash_after ones
+                parse = scraper.parse_product_details
+                parsed = []
+
+                def parse_or_crash(soup, product_url):
+                    if len(parsed) == crash_after:
+                        raise KeyboardInterrupt
+                    parsed.append(product_url)
+                    return parse(soup, product_url)
+                scraper.parse_product_details = parse_or_crash
+            start = time.perf_counter()
+            try:
+                catalog = scraper.run_scraper(max_products_per_category=products_per_category)
+            except KeyboardInterrupt:
+                catalog = None
+            return catalog, {'seconds': time.perf_counter() - start, 'requests': len(site.requests)}
+
+        reference, uninterrupted = crawl()
+        path = os.path.join(journal_dir, 'journal.jsonl')
+        with CrawlJournal(path) as journal:
+            _, interrupted = crawl(journal, crash_after)
+        with CrawlJournal(path) as journal:
+            catalog, resumed = crawl(journal)
+            resumed.update(replayed=journal.replayed, identical=comparable(catalog) == comparable(reference))
+
+    results = [{'run': 'uninterrupted', **uninterrupted}, {'run': 'interrupted', **interrupted},
+               {'run': 'resumed', **resumed}]
+    for result in results:
+        extra = (f", {result['replayed']} pages replayed {'✅' if result['identical'] else '❌'}"
+                 if 'replayed' in result else "")
+        print(f"⏱️ {result['run']:>13}: {result['seconds']:6.2f}s, {result['requests']} requests{extra}")
+    return results
+
+if __name__ == "__main__":
+    benchmark_resume()
@@ -5,14 +5,20 @@ Based on SEO/GEO analysis from produs.txt
 """
 
 import json
+import os
 import re
 from typing import Dict, List, Any
 import time
 
+from catalog import as_product, json_default, load_catalog
+from columnar_export import export_columnar
+from keyword_engine import RuleSet
+
 def enhance_product_for_ai(product: Dict) -> Dict:
     """Enhance a single product with AI optimization features."""
     
     # Extract key information for AI enhancement
+    product = as_product(product)
     name = product.get('name', '')
     brand = product.get('brand', '')
     category = product.get('category', '')
@@ -20,7 +26,7 @@ def enhance_product_for_ai(product: Dict) -> Dict:
     price = product.get('price', 0)
     
     # Generate AI-optimized fields
-    enhanced_product = product.copy()
+    enhanced_product = product.to_dict()
     
     # 1. AI Metadata Layer
     enhanced_product['ai_metadata'] = {
@@ -80,7 +86,8 @@ def enhance_product_for_ai(product: Dict) -> Dict:
 def generate_ai_context(product: Dict) -> Dict:
     """Generate AI context layer for better understanding."""
     
-    name = product.get('name', '').lower()
+    product = as_product(product)
+    name = product.name_lower
     category = product.get('category', '')
     brand = product.get('brand', '')
     
@@ -100,12 +107,13 @@ def generate_ai_context(product: Dict) -> Dict:
 def generate_search_terms(product: Dict) -> Dict:
     """Generate comprehensive search terms for AI discovery."""
     
-    name = product.get('name', '').lower()
+    product = as_product(product)
+    name = product.name_lower
     brand = product.get('brand', '').lower()
     category = product.get('category', '')
     
     # Extract key terms
-    name_words = re.findall(r'\w+', name)
+    name_words = list(product.words)
     
     search_terms = {
         "primary_keywords": [brand, category] + name_words[:3],
@@ -125,7 +133,8 @@ def generate_search_terms(product: Dict) -> Dict:
 def generate_technical_specs(product: Dict) -> Dict:
     """Generate structured technical specifications."""
     
-    name = product.get('name', '').lower()
+    product = as_product(product)
+    name = product.name_lower
     category = product.get('category', '')
     description = product.get('description', '')
     
@@ -149,14 +158,16 @@ def generate_technical_specs(product: Dict) -> Dict:
 def generate_product_faq(product: Dict) -> Dict:
     """Generate FAQ schema for AI agents."""
     
+    product = as_product(product)
     name = product.get('name', '')
+    name_lower = product.name_lower
     category = product.get('category', '')
     brand = product.get('brand', '')
     
     # Generate category-specific FAQs
     faqs = []
     
-    if 'stegulet' in name.lower():
+    if 'stegulet' in name_lower:
         faqs.extend([
             {
                 "question": f"Cum se montează {name}?",
@@ -167,7 +178,7 @@ def generate_product_faq(product: Dict) -> Dict:
                 "answer": "Da, stegulețele reflectorizante îmbunătățesc vizibilitatea și sunt recomandate pentru siguranța în trafic."
             }
         ])
-    elif 'anvelopa' in name.lower():
+    elif 'anvelopa' in name_lower:
         faqs.extend([
             {
                 "question": f"Cum verific dimensiunea corectă pentru {name}?",
@@ -199,7 +210,8 @@ def generate_product_faq(product: Dict) -> Dict:
 def generate_product_relationships(product: Dict) -> Dict:
     """Generate product relationship mappings for AI recommendations."""
     
-    name = product.get('name', '').lower()
+    product = as_product(product)
+    name = product.name_lower
     category = product.get('category', '')
     brand = product.get('brand', '')
     
@@ -214,35 +226,38 @@ def generate_product_relationships(product: Dict) -> Dict:
     return relationships
 
 # Helper functions for context determination
+
+# Name keywords behind the AI context fields, compiled into one automaton so
+# the three lookups below share a single scan of each product name
+AI_CONTEXT_RULES = RuleSet({
+    'product_type': [
+        ('safety_flag', ['stegulet']),
+        ('tire', ['anvelopa']),
+        ('rim', ['janta']),
+        ('light', ['far']),
+        ('helmet', ['casca'])
+    ],
+    'use_cases': [
+        ('urban_cycling', ['urban', 'city']),
+        ('mountain_biking', ['mtb', 'mountain']),
+        ('electric_bike', ['e-bike', 'electric']),
+        ('children_cycling', ['copii', 'kids']),
+        ('competitive_cycling', ['race', 'competition'])
+    ],
+    'target_audience': [
+        ('children', ['copii']),
+        ('professionals', ['professional', 'pro']),
+        ('beginners', ['beginner', 'incepator'])
+    ]
+})
+
 def determine_product_type(name: str, category: str) -> str:
     """Determine specific product type for AI context."""
-    if 'stegulet' in name:
-        return 'safety_flag'
-    elif 'anvelopa' in name:
-        return 'tire'
-    elif 'janta' in name:
-        return 'rim'
-    elif 'far' in name:
-        return 'light'
-    elif 'casca' in name:
-        return 'helmet'
-    else:
-        return category
+    return AI_CONTEXT_RULES.first(name, 'product_type', category)
 
 def determine_use_cases(name: str, category: str) -> List[str]:
     """Determine primary use cases."""
-    use_cases = []
-    
-    if 'urban' in name or 'city' in name:
-        use_cases.append('urban_cycling')
-    if 'mtb' in name or 'mountain' in name:
-        use_cases.append('mountain_biking')
-    if 'e-bike' in name or 'electric' in name:
-        use_cases.append('electric_bike')
-    if 'copii' in name or 'kids' in name:
-        use_cases.append('children_cycling')
-    if 'race' in name or 'competition' in name:
-        use_cases.append('competitive_cycling')
+    use_cases = AI_CONTEXT_RULES.all(name, 'use_cases')
     
     if not use_cases:
         use_cases = ['general_cycling']
@@ -251,14 +266,7 @@ def determine_use_cases(name: str, category: str) -> List[str]:
 
 def determine_target_audience(name: str, category: str) -> List[str]:
     """Determine target audience."""
-    audiences = []
-    
-    if 'copii' in name:
-        audiences.append('children')
-    if 'professional' in name or 'pro' in name:
-        audiences.append('professionals')
-    if 'beginner' in name or 'incepator' in name:
-        audiences.append('beginners')
+    audiences = AI_CONTEXT_RULES.all(name, 'target_audience')
     
     if not audiences:
         audiences = ['general_cyclists']
@@ -429,25 +437,43 @@ def determine_alternative_brands(brand: str, category: str) -> List[str]:
 def determine_related_categories(category: str) -> List[str]:
     return []
 
-def enhance_catalog_for_ai():
-    """Main function to enhance the entire catalog for AI optimization."""
+def enhance_catalog_for_ai(changed_skus=None):
+    """Main function to enhance the entire catalog for AI optimization.
+    
+    With `changed_skus` (incremental runs), only those products are enhanced
+    again; the others are copied unchanged from the previous
+    products_ai_enhanced.json.
+    """
     
     print("🤖 Enhancing BikeStylish catalog for AI agents...")
     
     # Load existing catalog
-    with open('../data/products.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Products are decoded straight into compact Product records
+    data = load_catalog('../data/products.json')
     
     products = data['products']
     print(f"📦 Processing {len(products)} products...")
     
+    previous = {}
+    if changed_skus is not None and os.path.exists('../data/products_ai_enhanced.json'):
+        # Reused products are copied verbatim, so plain dicts are enough here
+        with open('../data/products_ai_enhanced.json', 'r', encoding='utf-8') as f:
+            previous = {product['sku']: product for product in json.load(f)['products']}
+    
     # Enhance each product
     enhanced_products = []
+    reused = 0
     
     for i, product in enumerate(products):
         if i % 500 == 0:
             print(f"   Progress: {i}/{len(products)}")
         
+        previous_product = previous.get(product['sku'])
+        if previous_product is not None and product['sku'] not in changed_skus:
+            enhanced_products.append(previous_product)
+            reused += 1
+            continue
+        
         enhanced_product = enhance_product_for_ai(product)
         enhanced_products.append(enhanced_product)
     
@@ -470,9 +496,16 @@ def enhance_catalog_for_ai():
     
     # Save enhanced catalog
     with open('../data/products_ai_enhanced.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        json.dump(data, f, indent=2, ensure_ascii=False, default=json_default)
     
     print(f"✅ Enhanced catalog saved with AI optimizations!")
+    if previous:
+        print(f"♻️ Reused {reused} unchanged products, enhanced {len(enhanced_products) - reused}")
+    
+    # Columnar copy for analytics (typed numeric columns, dictionary-encoded strings)
+    columnar = export_columnar(enhanced_products, '../data/products_ai_enhanced.parquet')
+    if columnar:
+        print(f"📊 Columnar export: {columnar['rows']} rows, {columnar['bytes'] / (1024 * 1024):.2f} MB")
     print(f"📊 Added AI features to all {len(enhanced_products)} products")
     
     # Show sample enhancement
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Cached loader for the supplier's XLS feed
+
+Parses ``sxt26.xls`` once into a Feather file keyed by the SHA-256 of the
+XLS and serves every later load from that columnar copy, until the XLS
+changes. Every stage that reads the feed (CSV conversion, category real
+data) gets the same typed DataFrame, or an iterator over its rows.
+
+pyarrow is optional: without it the XLS is parsed on every load.
+"""
+
+import glob
+import hashlib
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (backs DataFrame.to_feather / pd.read_feather)
+except ImportError:
+    pyarrow = None
+
+FEED_FILE = '../sxt26.xls'
+CACHE_DIR = '../data/.feed_cache'
+CACHE_SUFFIX = '.feather'
+
+# Bumped whenever the cached layout (dtypes, column handling) changes, so
+# caches written by an older loader are not reused
+CACHE_VERSION = 3
+
+# Numeric feed columns and their dtypes; text columns keep pandas' string dtype
+NUMERIC_COLUMNS = {
+    'cant_stock': 'int64',
+    'pret_sugerat': 'float64',
+    'pret_produs': 'float64',
+}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def cache_available() -> bool:
+    """Tell whether the columnar cache can be written and read (pyarrow installed)."""
+    return pyarrow is not None
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_path(feed_file: str, digest: str, cache_dir: str = CACHE_DIR) -> str:
+    """Cache file for one version of the feed: ``<name>.<hash>.v<version>.feather``."""
+    name = os.path.splitext(os.path.basename(feed_file))[0]
+    return os.path.join(cache_dir, f"{name}.{digest[:16]}.v{CACHE_VERSION}{CACHE_SUFFIX}")
+
+def normalize_feed(df: pd.DataFrame) -> pd.DataFrame:
+    """Give the numeric columns fixed dtypes.
+
+    Integer columns with missing cells become nullable ``Int64`` instead of
+    silently turning into floats. A column with cells that are not numbers
+    (or not whole numbers, for an integer column) is left as read, so no
+    value is dropped or rounded.
+    """
+    for column, dtype in NUMERIC_COLUMNS.items():
+        if column not in df.columns:
+            continue
+        try:
+            values = pd.to_numeric(df[column])
+        except (ValueError, TypeError):
+            continue
+        if dtype == 'int64':
+            present = values.dropna()
+            if not (present == present.round()).all():
+                continue
+            if len(present) < len(values):
+                dtype = 'Int64'
+        df[column] = values.astype(dtype)
+    return df
+
+def feather_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of the frame that Arrow can store.
+
+    Arrow needs one type per column, so text columns that also hold numbers
+    (codes typed as numbers in some cells) are written with those values as
+    ``str``; a cache hit returns them as text. Missing cells are kept.
+    """
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        if df[column].dropna().map(type).nunique() > 1:
+            df[column] = df[column].map(lambda value: value if pd.isna(value) else str(value))
+    return df
+
+def parse_feed(feed_file: str = FEED_FILE) -> pd.DataFrame:
+    """Parse the XLS feed directly, bypassing the cache."""
+    return normalize_feed(pd.read_excel(feed_file))
+
+def _remove_stale_caches(feed_file: str, keep: str, cache_dir: str) -> None:
+    name = os.path.splitext(os.path.basename(feed_file))[0]
+    for stale in glob.glob(os.path.join(cache_dir, f"{name}.*{CACHE_SUFFIX}")):
+        if os.path.abspath(stale) != os.path.abspath(keep):
+            os.remove(stale)
+
+def load_feed(feed_file: str = FEED_FILE, cache_dir: str = CACHE_DIR,
+              stats: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """Load the feed as a typed DataFrame, parsing the XLS only when it changed.
+
+    The cache is written to a temporary file and moved into place, so an
+    interrupted run never leaves a truncated cache behind; caches of earlier
+    feed versions are removed. Pass a dict as ``stats`` to receive the cache
+    outcome ('hit', 'miss', 'uncached' or 'disabled') and the load time.
+    """
+    started = time.perf_counter()
+    if not cache_available():
+        df = parse_feed(feed_file)
+        outcome = 'disabled'
+    else:
+        path = cache_path(feed_file, file_sha256(feed_file), cache_dir)
+        if os.path.exists(path):
+            df = pd.read_feather(path)
+            outcome = 'hit'
+        else:
+            df = parse_feed(feed_file)
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            try:
+                feather_frame(df).to_feather(tmp_path)
+            except (pyarrow.ArrowException, ValueError, TypeError) as e:
+                # A frame Arrow cannot store is still a valid feed; serve it uncached
+                print(f"⚠️ Could not cache {feed_file} as Feather: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                outcome = 'uncached'
+            else:
+                os.replace(tmp_path, path)
+                _remove_stale_caches(feed_file, path, cache_dir)
+                outcome = 'miss'
+
+    if stats is not None:
+        stats.update({'cache': outcome, 'rows': len(df), 'seconds': time.perf_counter() - started})
+    return df
+
+def iter_feed_rows(feed_file: str = FEED_FILE, cache_dir: str = CACHE_DIR,
+                   chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """Iterate over the feed rows as dicts (column -> value), chunk by chunk."""
+    df = load_feed(feed_file, cache_dir)
+    for start in range(0, len(df), chunk_size):
+        yield from df.iloc[start:start + chunk_size].to_dict('records')
+
+def main():
+    feed_file = sys.argv[1] if len(sys.argv) > 1 else FEED_FILE
+    stats = {}
+    df = load_feed(feed_file, stats=stats)
+    print(f"📦 {feed_file}: {stats['rows']} rows, cache {stats['cache']} "
+          f"({stats['seconds'] * 1000:.0f} ms)")
+    print(df.dtypes.to_string())
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,105 @@ Generate separate category and brand files from the main catalog
 """
 
 import json
+from collections import defaultdict
 from datetime import datetime
 
-def create_categories_file():
+from catalog import as_product, load_catalog
+from keyword_engine import RuleSet
+
+# Subcategories counted inside a few top-level categories: (id, name, name keywords)
+SUBCATEGORY_RULES = {
+    'accesorii': [
+        ("reflectorizante", "Reflectorizante", ['reflector', 'stegulet']),
+        ("antifurturi", "Antifurturi", ['antifurt']),
+        ("copii", "Articole pentru Copii", ['copii', 'scaun']),
+        ("transport", "Transport și Depozitare", ['suport', 'stand'])
+    ],
+    'biciclete': [
+        ("trotinete", "Trotinete", ['trotineta']),
+        ("copii", "Biciclete pentru Copii", ['copii'])
+    ],
+    'piese-schimb': [
+        ("anvelope", "Anvelope", ['anvelopa']),
+        ("camere", "Camere", ['camera'])
+    ]
+}
+
+SUBCATEGORY_RULE_SET = RuleSet({
+    cat_id: [(sub_id, keywords) for sub_id, _, keywords in rules]
+    for cat_id, rules in SUBCATEGORY_RULES.items()
+})
+
+class ProductGroup:
+    """Counts, price statistics and related values of one category or brand."""
+    
+    __slots__ = ('price_min', 'price_max', 'price_sum', 'priced_count', 'related', 'subcategory_counts')
+    
+    def __init__(self):
+        self.price_min = None
+        self.price_max = None
+        self.price_sum = 0
+        self.priced_count = 0
+        # Brands of a category or categories of a brand; a set filled in
+        # product order, as the published lists have always been
+        self.related = set()
+        self.subcategory_counts = defaultdict(int)
+    
+    def add_price(self, price):
+        if price > 0:
+            if self.priced_count == 0 or price < self.price_min:
+                self.price_min = price
+            if self.priced_count == 0 or price > self.price_max:
+                self.price_max = price
+            self.price_sum += price
+            self.priced_count += 1
+    
+    def price_range(self):
+        return {
+            "min": self.price_min if self.priced_count else 0,
+            "max": self.price_max if self.priced_count else 0,
+            "avg": round(self.price_sum/self.priced_count, 2) if self.priced_count else 0,
+            "currency": "RON"
+        }
+
+def group_products(products):
+    """Group the products by category and by brand in a single pass.
+    
+    Returns (categories, brands): dicts of ProductGroup keyed by category
+    id and brand name, with subcategory counts on the categories that have
+    subcategory rules.
+    """
+    by_category = defaultdict(ProductGroup)
+    by_brand = defaultdict(ProductGroup)
+    
+    for product in products:
+        product = as_product(product)
+        category = product['category']
+        brand = product['brand']
+        price = product['price']
+        
+        category_group = by_category[category]
+        category_group.add_price(price)
+        category_group.related.add(brand)
+        if category in SUBCATEGORY_RULES:
+            for sub_id in SUBCATEGORY_RULE_SET.all(product.name_lower, category):
+                category_group.subcategory_counts[sub_id] += 1
+        
+        brand_group = by_brand[brand]
+        brand_group.add_price(price)
+        brand_group.related.add(category)
+    
+    return dict(by_category), dict(by_brand)
+
+def create_categories_file(catalog=None, groups=None):
     """Create a separate categories.json file."""
     
     # Load main catalog
-    with open('../data/products.json', 'r', encoding='utf-8') as f:
-        catalog = json.load(f)
+    if catalog is None:
+        catalog = load_catalog('../data/products.json')
+    if groups is None:
+        groups = group_products(catalog['products'])
+    category_groups = groups[0]
     
     # Create detailed categories structure
     categories_data = {
@@ -23,38 +114,16 @@ def create_categories_file():
     # Enhanced category information
     for category in catalog['categories']:
         cat_id = category['id']
+        group = category_groups.get(cat_id) or ProductGroup()
         
-        # Get products in this category
-        category_products = [p for p in catalog['products'] if p['category'] == cat_id]
-        
-        # Calculate subcategories and stats
-        subcategories = []
-        if cat_id == 'accesorii':
-            subcategories = [
-                {"id": "reflectorizante", "name": "Reflectorizante", "count": len([p for p in category_products if 'reflector' in p['name'].lower() or 'stegulet' in p['name'].lower()])},
-                {"id": "antifurturi", "name": "Antifurturi", "count": len([p for p in category_products if 'antifurt' in p['name'].lower()])},
-                {"id": "copii", "name": "Articole pentru Copii", "count": len([p for p in category_products if 'copii' in p['name'].lower() or 'scaun' in p['name'].lower()])},
-                {"id": "transport", "name": "Transport și Depozitare", "count": len([p for p in category_products if 'suport' in p['name'].lower() or 'stand' in p['name'].lower()])}
-            ]
-        elif cat_id == 'biciclete':
-            subcategories = [
-                {"id": "trotinete", "name": "Trotinete", "count": len([p for p in category_products if 'trotineta' in p['name'].lower()])},
-                {"id": "copii", "name": "Biciclete pentru Copii", "count": len([p for p in category_products if 'copii' in p['name'].lower()])}
-            ]
-        elif cat_id == 'piese-schimb':
-            subcategories = [
-                {"id": "anvelope", "name": "Anvelope", "count": len([p for p in category_products if 'anvelopa' in p['name'].lower()])},
-                {"id": "camere", "name": "Camere", "count": len([p for p in category_products if 'camera' in p['name'].lower()])}
-            ]
+        # Subcategory counts
+        subcategories = [
+            {"id": sub_id, "name": sub_name, "count": group.subcategory_counts.get(sub_id, 0)}
+            for sub_id, sub_name, _ in SUBCATEGORY_RULES.get(cat_id, [])
+        ]
         
         # Price range
-        prices = [p['price'] for p in category_products if p['price'] > 0]
-        price_range = {
-            "min": min(prices) if prices else 0,
-            "max": max(prices) if prices else 0,
-            "avg": round(sum(prices)/len(prices), 2) if prices else 0,
-            "currency": "RON"
-        }
+        price_range = group.price_range()
         
         categories_data['categories'].append({
             "id": cat_id,
@@ -62,7 +131,7 @@ def create_categories_file():
             "count": category['count'],
             "subcategories": subcategories,
             "price_range": price_range,
-            "top_brands": list(set([p['brand'] for p in category_products]))[:5]
+            "top_brands": list(group.related)[:5]
         })
     
     # Save categories file
@@ -71,12 +140,15 @@ def create_categories_file():
     
     print(f"✅ Created categories.json with {len(categories_data['categories'])} categories")
 
-def create_brands_file():
+def create_brands_file(catalog=None, groups=None):
     """Create a separate brands.json file."""
     
     # Load main catalog
-    with open('../data/products.json', 'r', encoding='utf-8') as f:
-        catalog = json.load(f)
+    if catalog is None:
+        catalog = load_catalog('../data/products.json')
+    if groups is None:
+        groups = group_products(catalog['products'])
+    brand_groups = groups[1]
     
     # Create detailed brands structure
     brands_data = {
@@ -88,21 +160,13 @@ def create_brands_file():
     # Enhanced brand information
     for brand in catalog['brands']:
         brand_name = brand['name']
+        group = brand_groups.get(brand_name) or ProductGroup()
         
-        # Get products from this brand
-        brand_products = [p for p in catalog['products'] if p['brand'] == brand_name]
-        
-        # Calculate categories this brand covers
-        categories = list(set([p['category'] for p in brand_products]))
+        # Categories this brand covers
+        categories = list(group.related)
         
         # Price range
-        prices = [p['price'] for p in brand_products if p['price'] > 0]
-        price_range = {
-            "min": min(prices) if prices else 0,
-            "max": max(prices) if prices else 0,
-            "avg": round(sum(prices)/len(prices), 2) if prices else 0,
-            "currency": "RON"
-        }
+        price_range = group.price_range()
         
         # Determine origin/country based on brand name
         origin = "Unknown"
@@ -154,8 +218,11 @@ def main():
     print("🔄 Generating category and brand files...")
     
     try:
-        create_categories_file()
-        create_brands_file()
+        # One load and one pass over the products serve both files
+        catalog = load_catalog('../data/products.json')
+        groups = group_products(catalog['products'])
+        create_categories_file(catalog, groups)
+        create_brands_file(catalog, groups)
         print("✅ All files generated successfully!")
         
     except Exception as e:
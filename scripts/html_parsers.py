@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Pluggable HTML parsing backends for the BikeStylish scraper
+
+The scraper reads a handful of fields from each page by trying CSS
+selectors in order. This module hides the HTML library behind a small
+backend interface (parse, compile a selector, select, node text and
+attributes) and compiles the selectors of every page type into a
+``SelectorPlan`` once per backend, so a page costs one parse plus the
+selector lookups needed until each field is found.
+
+Backends:
+    html.parser  BeautifulSoup with Python's parser (the reference)
+    lxml         BeautifulSoup with the lxml tree builder
+    selectolax   the Lexbor engine through selectolax, without BeautifulSoup
+
+lxml and selectolax are optional; ``default_backend`` picks the fastest
+one installed.
+"""
+
+import glob
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import soupsieve
+from bs4 import BeautifulSoup, UnicodeDammit
+
+try:
+    import lxml  # noqa: F401  (backs BeautifulSoup's 'lxml' tree builder)
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Selectors tried in order for every field, per page type
+PAGE_SELECTORS = {
+    'home': {
+        'categories': [
+            '.main-navigation .menu-item',
+            '.category-menu a',
+            '.nav-categories a',
+            'nav a[href*="categori"]'
+        ]
+    },
+    'listing': {
+        'links': [
+            '.product-item a',
+            '.product-card a',
+            '.product-link',
+            'a[href*="/produs/"]',
+            'a[href*="/product/"]',
+            '.item-product a'
+        ]
+    },
+    'product': {
+        'title': ['h1.product-title', 'h1', '.product-name h1', '.product-title'],
+        'price': ['.price', '.product-price', '.current-price', '.price-current'],
+        'description': ['.product-description', '.description', '.product-details'],
+        'images': ['.product-images img', '.product-gallery img', '.product-image img']
+    }
+}
+
+# Elements whose content is not page text (BeautifulSoup's get_text skips them too)
+NON_TEXT_TAGS = ['script', 'style', 'template']
+
+class ParserBackend(ABC):
+    """HTML library used to parse pages and run the selectors."""
+
+    name = ''
+
+    @abstractmethod
+    def parse(self, content: bytes) -> Any:
+        """Parsed tree of a page."""
+
+    def compile(self, selector: str) -> Any:
+        """Selector in the backend's precompiled form."""
+        return selector
+
+    @abstractmethod
+    def select(self, tree: Any, compiled: Any) -> List[Any]:
+        """All nodes matching a compiled selector."""
+
+    @abstractmethod
+    def select_one(self, tree: Any, compiled: Any) -> Optional[Any]:
+        """First node matching a compiled selector, or None."""
+
+    @abstractmethod
+    def text(self, node: Any, strip: bool = True) -> str:
+        """Text of a node; with ``strip`` each piece is stripped and they are joined without separator."""
+
+    @abstractmethod
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        """Value of a node attribute, or None."""
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup with a given tree builder; selectors precompiled by soupsieve."""
+
+    def __init__(self, builder: str = 'html.parser'):
+        self.name = builder
+
+    def parse(self, content: bytes) -> BeautifulSoup:
+        return BeautifulSoup(content, self.name)
+
+    def compile(self, selector: str) -> Any:
+        return soupsieve.compile(selector)
+
+    def select(self, tree: BeautifulSoup, compiled: Any) -> List[Any]:
+        return compiled.select(tree)
+
+    def select_one(self, tree: BeautifulSoup, compiled: Any) -> Optional[Any]:
+        return compiled.select_one(tree)
+
+    def text(self, node: Any, strip: bool = True) -> str:
+        return node.get_text(strip=strip)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+class SelectolaxBackend(ParserBackend):
+    """Lexbor through selectolax (selectors are compiled by the engine per query)."""
+
+    name = 'selectolax'
+
+    def parse(self, content: bytes) -> Any:
+        tree = LexborHTMLParser(decode_html(content))
+        tree.strip_tags(NON_TEXT_TAGS)
+        return tree
+
+    def select(self, tree: Any, compiled: str) -> List[Any]:
+        return tree.css(compiled)
+
+    def select_one(self, tree: Any, compiled: str) -> Optional[Any]:
+        return tree.css_first(compiled)
+
+    def text(self, node: Any, strip: bool = True) -> str:
+        return node.text(deep=True, separator='', strip=strip)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+def decode_html(content: bytes) -> str:
+    """Page bytes as text: UTF-8, or whatever encoding the page declares."""
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return UnicodeDammit(content, is_html=True).unicode_markup
+
+BACKENDS = {
+    'selectolax': lambda: SelectolaxBackend() if LexborHTMLParser else None,
+    'lxml': lambda: SoupBackend('lxml') if lxml else None,
+    'html.parser': lambda: SoupBackend('html.parser'),
+}
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first."""
+    return [name for name, make in BACKENDS.items() if make() is not None]
+
+def default_backend() -> str:
+    return available_backends()[0]
+
+@lru_cache(maxsize=None)
+def get_backend(name: Optional[str] = None) -> ParserBackend:
+    """Backend by name (the default one for None); raises ValueError if unavailable."""
+    name = name or default_backend()
+    make = BACKENDS.get(name)
+    backend = make() if make else None
+    if backend is None:
+        raise ValueError(f"HTML parser backend '{name}' is not available "
+                         f"(installed: {', '.join(available_backends())})")
+    return backend
+
+class SelectorPlan:
+    """Selectors of one page type, compiled once for a backend.
+
+    Lookups are lazy: callers take candidates until a field is found, and
+    the remaining selectors of that field are never run.
+    """
+
+    def __init__(self, backend: ParserBackend, fields: Dict[str, Sequence[str]]):
+        self.backend = backend
+        self.fields = {field: [backend.compile(selector) for selector in selectors]
+                       for field, selectors in fields.items()}
+
+    def first(self, tree: Any, field: str) -> Iterator[Any]:
+        """The first match of each selector of ``field`` that matches, in order."""
+        select_one = self.backend.select_one
+        for compiled in self.fields[field]:
+            node = select_one(tree, compiled)
+            if node is not None:
+                yield node
+
+    def all(self, tree: Any, field: str) -> Iterator[List[Any]]:
+        """All matches of each selector of ``field`` that matches, in order."""
+        select = self.backend.select
+        for compiled in self.fields[field]:
+            nodes = select(tree, compiled)
+            if nodes:
+                yield nodes
+
+@lru_cache(maxsize=None)
+def page_plans(backend_name: str) -> Dict[str, SelectorPlan]:
+    """Compiled selector plans of every page type for a backend."""
+    backend = get_backend(backend_name)
+    return {page: SelectorPlan(backend, fields) for page, fields in PAGE_SELECTORS.items()}
+
+def load_corpus(directory: str) -> List[bytes]:
+    """Saved pages of a directory: ``*.html`` files, or the bodies in an HTTP cache."""
+    paths = sorted(glob.glob(os.path.join(directory, '*.html')) or glob.glob(os.path.join(directory, '*.body')))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+def standin_corpus(products: int = 200, filler: int = 150) -> List[bytes]:
+    """Product pages of the local stand-in site, with shop-like page chrome."""
+    from standin_site import StandinSite
+
+    site = StandinSite(categories=1, products_per_category=products, filler=filler)
+    return [site.product_page(slug).encode('utf-8') for slug in site.product_slugs(site.category_names[0])]
+
+def benchmark_product_parsing(pages: Sequence[bytes], rounds: int = 3) -> List[Dict]:
+    """Per-page parse and extraction time of each backend on product pages.
+
+    Every backend must extract the same products as the html.parser path.
+    """
+    from scraper import BikeStylishScraper
+
+    def comparable(product):
+        return {**product.to_dict(), 'scraped_at': None} if product else None
+
+    results = []
+    reference = None
+    for name in ['html.parser'] + [n for n in available_backends() if n != 'html.parser']:
+        scraper = BikeStylishScraper(parser=name)
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            products = [scraper.parse_product_details(scraper.parse_html(page), f"page-{number}")
+                        for number, page in enumerate(pages)]
+            best = min(best, time.perf_counter() - start)
+        extracted = [comparable(product) for product in products]
+        if reference is None:
+            reference = extracted
+        results.append({'backend': name, 'ms_per_page': best / len(pages) * 1000,
+                        'identical': extracted == reference})
+
+    baseline = results[0]['ms_per_page']
+    print(f"📄 {len(pages)} pages, {sum(map(len, pages)) / len(pages) / 1024:.0f} KB on average")
+    for result in results:
+        print(f"⏱️ {result['backend']:>11}: {result['ms_per_page']:.2f} ms/page "
+              f"({baseline / result['ms_per_page']:.1f}x) {'✅' if result['identical'] else '❌'}")
+    return results
+
+def main():
+    # python html_parsers.py [DIR]: saved pages (*.html or HTTP cache bodies) or the stand-in site's
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    pages = load_corpus(directory) if directory else standin_corpus()
+    if not pages:
+        print(f"❌ No saved pages in {directory}")
+        return
+    benchmark_product_parsing(pages)
+
+if __name__ == "__main__":
+    main()
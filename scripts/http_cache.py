@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Conditional-GET disk cache for the BikeStylish scraper
+
+Keeps every downloaded page on disk, keyed by URL, with the ETag and
+Last-Modified validators the server sent. A page younger than ``max_age``
+is served straight from disk; an older one is revalidated with
+``If-None-Match``/``If-Modified-Since``, and a 304 answer reuses the stored
+body. Whatever the scraper parsed out of a page can be stored next to it,
+so an unchanged page is neither downloaded nor parsed again.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+HTTP_CACHE_DIR = '../data/.http_cache'
+
+# Seconds a stored page is used without asking the server; 0 revalidates every time
+DEFAULT_MAX_AGE = 0
+
+# Bumped whenever the stored layout or the parsed records change, so entries
+# written by an older scraper are not reused
+CACHE_VERSION = 1
+
+class HttpCache:
+    """On-disk page cache with ETag/Last-Modified revalidation.
+
+    Each URL has a ``<key>.json`` entry (validators, storage time, parsed
+    records) and a ``<key>.body`` file. ``stats`` counts fresh hits, 304
+    revalidations, misses (full downloads) and skipped parses.
+    """
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, max_age: float = DEFAULT_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.stats = {'hits': 0, 'revalidations': 0, 'misses': 0, 'parses_skipped': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _write(self, path: str, data: bytes) -> None:
+        # Written aside and moved into place, so a crash never leaves half an entry
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _write_entry(self, entry: Dict) -> None:
+        self._write(self._path(entry['url'], '.json'), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Stored entry for ``url``, or None when there is no usable one."""
+        try:
+            with open(self._path(url, '.json'), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('version') != CACHE_VERSION or entry.get('url') != url:
+            return None
+        if not os.path.exists(self._path(url, '.body')):
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry['stored_at'] < self.max_age
+
+    def body(self, entry: Dict) -> bytes:
+        with open(self._path(entry['url'], '.body'), 'rb') as f:
+            return f.read()
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Revalidation headers for a stored entry (none without validators)."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def hit(self, entry: Dict) -> bytes:
+        """Serve a fresh entry without contacting the server."""
+        self.stats['hits'] += 1
+        return self.body(entry)
+
+    def revalidated(self, entry: Dict, headers: Mapping[str, str]) -> bytes:
+        """Record a 304 answer: keep the body, renew the entry's age and validators."""
+        self.stats['revalidations'] += 1
+        entry['etag'] = headers.get('ETag') or entry.get('etag')
+        entry['last_modified'] = headers.get('Last-Modified') or entry.get('last_modified')
+        entry['stored_at'] = time.time()
+        self._write_entry(entry)
+        return self.body(entry)
+
+    def store(self, url: str, content: bytes, headers: Mapping[str, str]) -> None:
+        """Store a full download; records parsed from an older body are dropped."""
+        self.stats['misses'] += 1
+        self._write(self._path(url, '.body'), content)
+        self._write_entry({
+            'version': CACHE_VERSION,
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored_at': time.time(),
+            'parsed': {}
+        })
+
+    def parsed(self, url: str, kind: str) -> Any:
+        """Record of type ``kind`` parsed from the stored body, or None."""
+        entry = self.lookup(url)
+        record = entry['parsed'].get(kind) if entry else None
+        if record is not None:
+            self.stats['parses_skipped'] += 1
+        return record
+
+    def save_parsed(self, url: str, kind: str, record: Any) -> None:
+        """Keep a JSON-serializable record parsed from the stored body."""
+        entry = self.lookup(url)
+        if entry is not None:
+            entry['parsed'][kind] = record
+            self._write_entry(entry)
+
+    def summary(self) -> str:
+        return ", ".join(f"{count} {name}" for name, count in self.stats.items())
+
+def benchmark_incremental_crawl(categories: int = 3, products_per_category: int = 20,
+                                changed: int = 3, latency: float = 0.05) -> List[Dict]:
+    """Crawl a local stand-in site cold, again after a few product pages
+    changed (revalidating every page), then once more within ``max_age``."""
+    import tempfile
+    from scraper import BikeStylishScraper
+    from standin_site import StandinSite
+
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            StandinSite(categories, products_per_category, latency=latency) as site:
+        for run, max_age in (('cold', 0), ('warm', 0), ('fresh', 3600)):
+            if run == 'warm':
+                for name in site.category_names:
+                    for slug in site.product_slugs(name)[:changed]:
+                        site.touch(slug)
+            site.requests.clear()
+            site.bytes_sent = 0
+            scraper = BikeStylishScraper(cache=HttpCache(cache_dir, max_age))
+            scraper.base_url = site.base_url
+            start = time.perf_counter()
+            catalog = scraper.run_scraper(max_products_per_category=products_per_category)
+            results.append({
+                'run': run,
+                'seconds': time.perf_counter() - start,
+                'requests': len(site.requests),
+                'bytes': site.bytes_sent,
+                'products': catalog['total_products'],
+                **scraper.cache.stats
+            })
+
+    for result in results:
+        print(f"⏱️ {result['run']}: {result['seconds']:.2f}s, {result['requests']} requests, "
+              f"{result['bytes']} bytes of pages, {result['products']} products | "
+              f"{result['hits']} hits, {result['revalidations']} revalidations, "
+              f"{result['misses']} misses, {result['parses_skipped']} parses skipped")
+    return results
+
+if __name__ == "__main__":
+    benchmark_incremental_crawl()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Incremental ingestion of the supplier feed
+
+Hashes every sxt26.csv row by ``cod_produs``, diffs the hashes against the
+snapshot saved by the previous run and pushes only the added, changed and
+removed products through parsing, AI enhancement and re-splitting. Parts
+that hold none of those products are left byte-identical, so a nightly
+rebuild costs in proportion to the feed's churn, not the catalog size.
+
+Like the other scripts it runs from ``scripts/``: the data paths are
+relative to it, and the split tools (``split_products.py``) are imported
+from the repository root given as ``tools_dir``.
+"""
+
+import csv
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from catalog import load_catalog, save_catalog
+from enhance_catalog_for_ai import enhance_catalog_for_ai
+from real_data_parser import BikeStylishDataParser
+
+SNAPSHOT_FILE = '../data/.ingest_snapshot.json'
+PRODUCTS_FILE = '../data/products.json'
+ENHANCED_FILE = '../data/products_ai_enhanced.json'
+
+# Directory holding split_products.py (the repository root)
+SPLIT_TOOLS_DIR = '..'
+
+def row_hash(row: Dict) -> str:
+    """Content hash of one CSV row, independent of column order."""
+    canonical = json.dumps(row, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def source_row_hashes(csv_file: str) -> Dict[str, str]:
+    """Hash of every named CSV row, keyed by cod_produs.
+
+    Rows sharing a product code are hashed together, so a change in any of
+    them marks the product as changed.
+    """
+    hashes = {}
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f, delimiter=';'):
+            code = row.get('cod_produs', '')
+            if not code or not (row.get('nume_produs') or '').strip():
+                continue
+            digest = row_hash(row)
+            if code in hashes:
+                digest = hashlib.sha256((hashes[code] + digest).encode('ascii')).hexdigest()
+            hashes[code] = digest
+    return hashes
+
+def load_snapshot(path: str = SNAPSHOT_FILE) -> Optional[Dict]:
+    """Load the previous run's row hashes, or None on the first run."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_snapshot(hashes: Dict[str, str], csv_file: str, path: str = SNAPSHOT_FILE) -> None:
+    snapshot = {
+        'source_file': os.path.basename(csv_file),
+        'generated_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'total_rows': len(hashes),
+        'hashes': hashes
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+
+def diff_hashes(old: Dict[str, str], new: Dict[str, str]) -> Tuple[Set[str], Set[str], Set[str]]:
+    """Return the (added, changed, removed) product codes."""
+    added = set(new) - set(old)
+    removed = set(old) - set(new)
+    changed = {code for code in set(new) & set(old) if new[code] != old[code]}
+    return added, changed, removed
+
+def import_split_tools(tools_dir: str = SPLIT_TOOLS_DIR):
+    """Import split_products from ``tools_dir``, adding it to the module search path."""
+    tools_dir = os.path.abspath(tools_dir)
+    if tools_dir not in sys.path:
+        sys.path.append(tools_dir)
+    return importlib.import_module('split_products')
+
+def run_incremental_ingest(force_full: bool = False, tools_dir: str = SPLIT_TOOLS_DIR) -> Dict:
+    """Run parsing, enhancement and splitting for what changed in the feed."""
+    split_products = import_split_tools(tools_dir)
+    parser = BikeStylishDataParser()
+    timings = {}
+
+    phase_start = time.perf_counter()
+    new_hashes = source_row_hashes(parser.csv_file)
+    snapshot = load_snapshot()
+    timings['hash_rows'] = time.perf_counter() - phase_start
+
+    full = force_full or snapshot is None or not os.path.exists(PRODUCTS_FILE) \
+        or not os.path.exists(ENHANCED_FILE)
+
+    if full:
+        print("🔄 No usable snapshot, running the full pipeline...")
+        phase_start = time.perf_counter()
+        save_catalog(parser.generate_product_catalog(), PRODUCTS_FILE)
+        timings['parse'] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        enhance_catalog_for_ai()
+        timings['enhance'] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        split_products.split_json_file(ENHANCED_FILE, max_size_mb=1.0)
+        timings['split'] = time.perf_counter() - phase_start
+        result = {'mode': 'full', 'products': len(new_hashes)}
+    else:
+        added, changed, removed = diff_hashes(snapshot['hashes'], new_hashes)
+        print(f"📊 Feed diff: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+        result = {'mode': 'incremental', 'added': len(added), 'changed': len(changed), 'removed': len(removed)}
+        if not (added or changed or removed):
+            print("✅ Nothing changed since the last run")
+            return result
+
+        rebuilt = added | changed
+        relinked = set()
+
+        phase_start = time.perf_counter()
+        catalog = parser.update_product_catalog(load_catalog(PRODUCTS_FILE), rebuilt, removed, relinked)
+        save_catalog(catalog, PRODUCTS_FILE)
+        timings['parse'] = time.perf_counter() - phase_start
+
+        # Reused products whose sitemap URL moved are enhanced and re-split too
+        touched = rebuilt | relinked
+        result['relinked'] = len(relinked)
+
+        phase_start = time.perf_counter()
+        enhance_catalog_for_ai(changed_skus=touched)
+        timings['enhance'] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        result['split'] = split_products.update_split(ENHANCED_FILE, touched, max_size_mb=1.0)
+        timings['split'] = time.perf_counter() - phase_start
+
+    # The snapshot only moves forward once every stage has succeeded
+    save_snapshot(new_hashes, parser.csv_file)
+
+    print("\n⏱️ Timings:")
+    for phase, seconds in timings.items():
+        print(f"   {phase}: {seconds:.2f}s")
+    result['timings'] = timings
+    return result
+
+if __name__ == "__main__":
+    # python incremental_ingest.py [--full] [--tools-dir DIR]
+    tools_dir = sys.argv[sys.argv.index("--tools-dir") + 1] if "--tools-dir" in sys.argv[:-1] else SPLIT_TOOLS_DIR
+    run_incremental_ingest(force_full="--full" in sys.argv, tools_dir=tools_dir)
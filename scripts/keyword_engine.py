@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Single-pass keyword engine for the BikeStylish scripts
+
+The brand, product-type, use-case, audience and category rules are all
+substring checks ("does 'janta' occur in the name?"). Instead of one
+Python-level ``in`` test per keyword, every rule set is compiled once into
+an Aho-Corasick automaton that reports every keyword occurring in a text in
+a single left-to-right scan, so the cost per product depends on the text
+length, not on how many keywords the rules hold.
+"""
+
+import json
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed set of keywords.
+
+    Failure links are folded into the transition tables when the automaton
+    is built (each state's table holds every character that leads anywhere
+    from it), so scanning costs one dict lookup per character.
+    """
+
+    __slots__ = ('keywords', '_delta', '_outputs')
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k for k in keywords if k))
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+
+        for number, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = goto[state][char] = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] += (number,)
+
+        # Breadth-first: a state's failure target is always shallower, so its
+        # table and outputs are complete by the time the state is reached
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        delta[0] = dict(goto[0])
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            table = dict(delta[fail[state]])
+            table.update(goto[state])
+            delta[state] = table
+            outputs[state] += outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = outputs
+
+    def scan(self, text: str) -> FrozenSet[int]:
+        """Numbers (indexes into ``keywords``) of every keyword found in ``text``."""
+        delta = self._delta
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return frozenset(found)
+
+Rules = Sequence[Tuple[str, Sequence[str]]]
+
+class RuleSet:
+    """Named groups of ordered rules (label -> keywords), matched in one scan.
+
+    All groups share one automaton, so a text is scanned once however many
+    groups are queried on it; results are memoized per text. ``first``
+    mirrors an if/elif chain of ``any(keyword in text ...)`` tests and
+    ``all`` mirrors a sequence of independent ifs, both in rule order.
+    """
+
+    def __init__(self, groups: Dict[str, Rules], cache_size: int = 8192):
+        self.labels: List[str] = []
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        keywords_of: List[Sequence[str]] = []
+        for group, rules in groups.items():
+            start = len(self.labels)
+            for label, keywords in rules:
+                self.labels.append(label)
+                keywords_of.append(keywords)
+            self.spans[group] = (start, len(self.labels))
+
+        self.automaton = KeywordAutomaton(k for keywords in keywords_of for k in keywords)
+        number = {keyword: i for i, keyword in enumerate(self.automaton.keywords)}
+        # Keyword number -> positions of the rules that list it
+        rules_of: Dict[int, set] = {}
+        for position, keywords in enumerate(keywords_of):
+            for keyword in keywords:
+                if keyword:
+                    rules_of.setdefault(number[keyword], set()).add(position)
+        self._rules_of = {keyword: tuple(sorted(positions)) for keyword, positions in rules_of.items()}
+        self._hits = lru_cache(maxsize=cache_size)(self._scan_rules)
+
+    def _scan_rules(self, text: str) -> Tuple[int, ...]:
+        positions = set()
+        for keyword in self.automaton.scan(text):
+            positions.update(self._rules_of[keyword])
+        return tuple(sorted(positions))
+
+    def all(self, text: str, group: str) -> List[str]:
+        """Labels of every rule of ``group`` with a keyword in ``text``, in rule order."""
+        start, end = self.spans[group]
+        return [self.labels[position] for position in self._hits(text) if start <= position < end]
+
+    def first(self, text: str, group: str, default: Optional[str] = None) -> Optional[str]:
+        """Label of the first rule of ``group`` with a keyword in ``text``."""
+        start, end = self.spans[group]
+        for position in self._hits(text):
+            if start <= position < end:
+                return self.labels[position]
+        return default
+
+def benchmark_keyword_growth(texts: Sequence[str], sizes: Sequence[int] = (20, 200, 2000)) -> List[Dict]:
+    """Time naive ``in`` checks against one automaton scan as the keyword list grows.
+
+    Keywords are words of the texts themselves (so rules really fire), padded
+    with synthetic words that never match.
+    """
+    vocabulary = sorted({word for text in texts for word in text.split() if len(word) > 2})
+    results = []
+    for size in sizes:
+        keywords = vocabulary[::max(1, len(vocabulary) // (size // 2))][:size // 2]
+        keywords += [f"zz{number:05d}q" for number in range(size - len(keywords))]
+
+        start = time.perf_counter()
+        naive = [frozenset(i for i, keyword in enumerate(keywords) if keyword in text) for text in texts]
+        naive_time = time.perf_counter() - start
+
+        automaton = KeywordAutomaton(keywords)
+        start = time.perf_counter()
+        scanned = [automaton.scan(text) for text in texts]
+        scan_time = time.perf_counter() - start
+
+        results.append({
+            'keywords': size,
+            'naive_us': naive_time / len(texts) * 1e6,
+            'automaton_us': scan_time / len(texts) * 1e6,
+            'identical': naive == scanned
+        })
+        print(f"⏱️ {size:>5} keywords: naive {results[-1]['naive_us']:.1f} µs/text, "
+              f"automaton {results[-1]['automaton_us']:.1f} µs/text "
+              f"{'✅' if results[-1]['identical'] else '❌'}")
+    return results
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else '../data/products_ai_enhanced.json'
+    with open(input_file, 'r', encoding='utf-8') as f:
+        products = json.load(f)['products']
+    texts = [f"{product.get('name', '')} {product.get('description', '')}".lower() for product in products]
+    print(f"📦 {len(texts)} product texts, {sum(map(len, texts)) / len(texts):.0f} chars on average")
+    benchmark_keyword_growth(texts)
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ import json
 import re
 from typing import List, Dict
 
+from keyword_engine import RuleSet
+
 def parse_categories_sitemap():
     """Parse categories from categorii.txt sitemap."""
     
@@ -54,41 +56,38 @@ def parse_categories_sitemap():
         print(f"❌ Error parsing categories: {e}")
         return []
 
+# Path keywords for the category type and parent, checked in rule order;
+# both groups are answered by one scan of the category path
+CATEGORY_PATH_RULES = RuleSet({
+    'type': [
+        ('accesorii', ['accesorii', 'lumini', 'protectii', 'transport']),
+        ('piese', ['piese', 'anvelope', 'jante', 'lanturi', 'frane']),
+        ('echipament', ['echipament', 'casti', 'manusi', 'tricouri', 'pantofi']),
+        ('scule', ['scule', 'intretinere', 'unelte']),
+        ('e-bike', ['e-bike', 'cadre-e-bike', 'protectii-si-accesorii-e-bike']),
+        ('copii', ['copii', 'roti-ajutatoare', 'scaune-pentru-copii'])
+    ],
+    'parent': [
+        ('accesorii', ['accesorii', 'lumini', 'cosuri', 'protectii-cadru']),
+        ('piese', ['anvelope', 'jante', 'lanturi', 'frane', 'schimbator']),
+        ('echipament', ['casti', 'manusi', 'tricouri', 'pantofi', 'jachete'])
+    ]
+})
+
+# Top-level categories, which have no parent
+ROOT_CATEGORY_PATHS = {'accesorii', 'accesorii-bicicleta', 'piese', 'echipament'}
+
 def determine_category_type(category_path: str) -> str:
     """Determine category type based on path."""
     
-    if any(term in category_path for term in ['accesorii', 'lumini', 'protectii', 'transport']):
-        return 'accesorii'
-    elif any(term in category_path for term in ['piese', 'anvelope', 'jante', 'lanturi', 'frane']):
-        return 'piese'
-    elif any(term in category_path for term in ['echipament', 'casti', 'manusi', 'tricouri', 'pantofi']):
-        return 'echipament'
-    elif any(term in category_path for term in ['scule', 'intretinere', 'unelte']):
-        return 'scule'
-    elif any(term in category_path for term in ['e-bike', 'cadre-e-bike', 'protectii-si-accesorii-e-bike']):
-        return 'e-bike'
-    elif any(term in category_path for term in ['copii', 'roti-ajutatoare', 'scaune-pentru-copii']):
-        return 'copii'
-    else:
-        return 'general'
+    return CATEGORY_PATH_RULES.first(category_path, 'type', 'general')
 
 def determine_parent_category(category_path: str) -> str:
     """Determine parent category."""
     
-    if category_path in ['accesorii', 'accesorii-bicicleta']:
-        return None
-    elif category_path == 'piese':
-        return None
-    elif category_path == 'echipament':
-        return None
-    elif 'accesorii' in category_path or any(term in category_path for term in ['lumini', 'cosuri', 'protectii-cadru']):
-        return 'accesorii'
-    elif any(term in category_path for term in ['anvelope', 'jante', 'lanturi', 'frane', 'schimbator']):
-        return 'piese'
-    elif any(term in category_path for term in ['casti', 'manusi', 'tricouri', 'pantofi', 'jachete']):
-        return 'echipament'
-    else:
+    if category_path in ROOT_CATEGORY_PATHS:
         return None
+    return CATEGORY_PATH_RULES.first(category_path, 'parent')
 
 def create_hierarchical_categories(categories: List[Dict]) -> Dict:
     """Create hierarchical category structure."""
@@ -12,8 +12,100 @@ import re
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from urllib.parse import urlparse
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import html
+import time
+import sys
+
+from catalog import Product, save_catalog
+from keyword_engine import RuleSet
+
+# Common bike brands, matched anywhere in the upper-cased product name; the
+# first brand in this order wins when several occur
+KNOWN_BRANDS = [
+    "M-WAVE", "KENDA", "VENTURA", "BELELLI", "SXT", "CROSS", 
+    "GIANT", "TREK", "SPECIALIZED", "SCOTT", "MERIDA", "CANNONDALE",
+    "CONTINENTAL", "SHIMANO", "SRAM", "VELO", "EXUSTAR", "CICLO BONIN",
+    "B-RACE", "ACTION"
+]
+
+BRAND_RULES = RuleSet({'brand': [(brand, [brand]) for brand in KNOWN_BRANDS]})
+
+# Sitemap URLs of product pages contain one of these
+PRODUCT_URL_KEYWORDS = ('piese', 'accesorii', 'biciclet')
+
+# <url> (page) and <sitemap> (sitemap index) entries, their location (in
+# CDATA or entity-escaped) and optional last modification date
+SITEMAP_ENTRY_PATTERN = re.compile(r'<(url|sitemap)>(.*?)</\1>', re.S)
+SITEMAP_LOC_PATTERN = re.compile(r'<loc>\s*(?:<!\[CDATA\[\s*(.*?)\s*\]\]>|([^<]*?))\s*</loc>', re.S)
+SITEMAP_LASTMOD_PATTERN = re.compile(r'<lastmod>\s*([^<]*?)\s*</lastmod>')
+
+def is_product_url(url: str) -> bool:
+    return any(keyword in url for keyword in PRODUCT_URL_KEYWORDS)
+
+def parse_sitemap_entries(content: str) -> Tuple[List[Tuple[str, Optional[str]]], List[Tuple[str, Optional[str]]]]:
+    """Read a sitemap (or sitemap index) into (url, lastmod) pairs.
+    
+    Returns (pages, sitemaps): the <url> entries and the child sitemaps
+    listed by a sitemap index, both in document order. lastmod is None
+    when the entry has none.
+    """
+    pages, sitemaps = [], []
+    for kind, body in SITEMAP_ENTRY_PATTERN.findall(content):
+        loc = SITEMAP_LOC_PATTERN.search(body)
+        if not loc:
+            continue
+        url = loc.group(1) if loc.group(1) is not None else html.unescape(loc.group(2))
+        if not url:
+            continue
+        lastmod = SITEMAP_LASTMOD_PATTERN.search(body)
+        (pages if kind == 'url' else sitemaps).append((url, lastmod.group(1) if lastmod else None))
+    return pages, sitemaps
+
+class ProductTokenIndex:
+    """Inverted index from name words to products, built once per CSV load.
+
+    Entries follow the iteration order of ``products_data`` (code keys and
+    duplicate references to the same product are skipped), so positions can
+    be used to break score ties exactly like the original linear scan.
+    """
+
+    def __init__(self, products_data: Dict):
+        self.entries = []
+        self.token_index = {}
+        seen = set()
+
+        for key, product in products_data.items():
+            if not isinstance(key, str) or key.isdigit():
+                continue
+            # The same product can be reachable through several keys; only
+            # its first occurrence can ever win a tie.
+            if id(product) in seen:
+                continue
+            seen.add(id(product))
+
+            product_name = product.get('nume_produs', '').lower()
+            product_name_clean = re.sub(r'[^\w\s-]', ' ', product_name)
+            product_words = frozenset(w for w in product_name_clean.split() if len(w) > 2)
+            if not product_words:
+                continue
+
+            brand = product.get('producator', '').lower()
+            brand_compact = brand.replace('-', '').replace(' ', '') if brand else None
+
+            position = len(self.entries)
+            self.entries.append((product_words, brand_compact, product))
+            for word in product_words:
+                self.token_index.setdefault(word, []).append(position)
+
+    def candidates(self, words) -> set:
+        """Return positions of all products sharing at least one word."""
+        positions = set()
+        for word in words:
+            postings = self.token_index.get(word)
+            if postings:
+                positions.update(postings)
+        return positions
 
 class BikeStylishDataParser:
     def __init__(self):
@@ -57,19 +149,9 @@ class BikeStylishDataParser:
         if not name:
             return "Unknown"
             
-        name_upper = name.upper()
-        
-        # Common bike brands
-        brands = [
-            "M-WAVE", "KENDA", "VENTURA", "BELELLI", "SXT", "CROSS", 
-            "GIANT", "TREK", "SPECIALIZED", "SCOTT", "MERIDA", "CANNONDALE",
-            "CONTINENTAL", "SHIMANO", "SRAM", "VELO", "EXUSTAR", "CICLO BONIN",
-            "B-RACE", "ACTION"
-        ]
-        
-        for brand in brands:
-            if brand in name_upper:
-                return brand
+        brand = BRAND_RULES.first(name.upper(), 'brand')
+        if brand:
+            return brand
                 
         # Extract first word as potential brand
         first_word = name.split()[0] if name.split() else "Unknown"
@@ -145,7 +227,7 @@ class BikeStylishDataParser:
             
             for url in matches:
                 url = url.strip()
-                if url and ('piese' in url or 'accesorii' in url or 'biciclet' in url):
+                if url and is_product_url(url):
                     urls.append(url)
                     
         except Exception as e:
@@ -153,17 +235,70 @@ class BikeStylishDataParser:
             
         return urls
     
-    def match_url_to_product(self, url: str, products_data: Dict) -> Optional[Dict]:
-        """Try to match a URL to a product in the CSV data."""
+    def url_filename_words(self, url: str):
+        """Split the filename part of a product URL into match words."""
+        filename = url.split('/')[-1].replace('.html', '')
+        filename_clean = re.sub(r'[^\w\s-]', ' ', filename.lower())
+        filename_words = set(w for w in filename_clean.split() if len(w) > 2)  # Filter short words
+        return filename_clean, filename_words
+    
+    def build_product_index(self, products_data: Dict) -> 'ProductTokenIndex':
+        """Build the token -> product inverted index used for URL matching."""
+        return ProductTokenIndex(products_data)
+    
+    def match_url_to_product(self, url: str, products_data: Dict,
+                             index: Optional['ProductTokenIndex'] = None) -> Optional[Dict]:
+        """Try to match a URL to a product in the CSV data.
+        
+        Only products sharing at least one word with the URL can reach the
+        0.25 threshold (the brand bonus alone is 0.2), so candidates are taken
+        from the inverted index instead of scanning every product. Pass a
+        prebuilt ``index`` when matching many URLs against the same data.
+        """
+        if not url:
+            return None
+        
+        if index is None:
+            index = self.build_product_index(products_data)
+        
+        filename_clean, filename_words = self.url_filename_words(url)
+        if not filename_words:
+            return None
+        
+        # Bonus for exact brand/model matches
+        brand_hint = any(word in filename_clean for word in ['m-wave', 'sxt', 'shimano', 'kenda'])
+        filename_compact = filename_clean.replace('-', '').replace(' ', '')
+        
+        best_match = None
+        best_score = 0
+        best_position = None
+        
+        for position in index.candidates(filename_words):
+            product_words, brand_compact, product = index.entries[position]
+            common_words = filename_words.intersection(product_words)
+            score = len(common_words) / max(len(filename_words), len(product_words))
+            
+            if brand_hint and brand_compact is not None and brand_compact in filename_compact:
+                score += 0.2
+            
+            # Ties go to the product seen first in products_data, as in the linear scan
+            if score > 0.25 and (score > best_score or
+                                 (score == best_score and position < best_position)):
+                best_score = score
+                best_match = product
+                best_position = position
+                
+        return best_match
+    
+    def match_url_to_product_linear(self, url: str, products_data: Dict) -> Optional[Dict]:
+        """Reference all-pairs matcher, kept to validate and benchmark the index."""
         # Extract product name from URL
         url_parts = url.split('/')
         if not url_parts:
             return None
             
         # Get the last part (filename) and clean it
-        filename = url_parts[-1].replace('.html', '')
-        filename_clean = re.sub(r'[^\w\s-]', ' ', filename.lower())
-        filename_words = set(w for w in filename_clean.split() if len(w) > 2)  # Filter short words
+        filename_clean, filename_words = self.url_filename_words(url)
         
         best_match = None
         best_score = 0
@@ -197,24 +332,8 @@ class BikeStylishDataParser:
                 
         return best_match
     
-    def generate_product_catalog(self) -> Dict:
-        """Generate the complete product catalog."""
-        print("🔄 Parsing CSV product data...")
-        products_data = self.parse_csv_data()
-        print(f"📊 Found {len(products_data)} products in CSV")
-        
-        print("🔄 Parsing sitemap URLs...")
-        urls = self.parse_sitemap_urls()
-        print(f"🔗 Found {len(urls)} URLs in sitemap")
-        
-        products = []
-        categories_count = {}
-        brands_count = {}
-        
-        print("🔄 Matching URLs to products...")
-        matched_count = 0
-        
-        # Process ALL products from the CSV (not just a sample)
+    def unique_products(self, products_data: Dict) -> Dict[str, Dict]:
+        """Products keyed by product code, in CSV order, without duplicates."""
         all_unique_products = {}
         for product_data in products_data.values():
             if not product_data.get('nume_produs'):
@@ -223,99 +342,102 @@ class BikeStylishDataParser:
             key = product_data.get('cod_produs', product_data.get('nume_produs', ''))
             if key and key not in all_unique_products:
                 all_unique_products[key] = product_data
-        
-        sample_products = list(all_unique_products.values())  # All unique products
-        print(f"📊 Processing {len(sample_products)} unique products...")
-        
-        # Create URL-to-product mapping for better matching
+        return all_unique_products
+    
+    def map_urls_to_products(self, urls: List[str], products_data: Dict) -> Dict[str, str]:
+        """Map sitemap URLs to product codes through the token index."""
         url_mappings = {}
+        product_index = self.build_product_index(products_data)
         for url in urls:
-            matched_product = self.match_url_to_product(url, products_data)
+            matched_product = self.match_url_to_product(url, products_data, product_index)
             if matched_product:
                 url_mappings[matched_product.get('cod_produs', '')] = url
+        return url_mappings
+    
+    def build_product(self, product_data: Dict, position: int, url_mappings: Dict[str, str]) -> Product:
+        """Build one catalog product from its CSV data.
         
-        print(f"🔗 Successfully mapped {len(url_mappings)} URLs to products")
+        `position` is the product's index in the catalog and drives the
+        simulated rating and review count.
+        """
+        # Create product ID
+        name = product_data['nume_produs']
+        product_id = re.sub(r'[^\w\s-]', '', name.lower()).replace(' ', '-')[:60]
         
-        for i, product_data in enumerate(sample_products):
-            if not product_data.get('nume_produs'):
-                continue
-                
-            # Create product ID
-            name = product_data['nume_produs']
-            product_id = re.sub(r'[^\w\s-]', '', name.lower()).replace(' ', '-')[:60]
-            
-            # Extract brand
-            brand = self.extract_brand_from_name(name)
-            brands_count[brand] = brands_count.get(brand, 0) + 1
-            
-            # Determine category
-            category = self.extract_category_from_url(product_data.get('categorie_path', ''))
-            if 'biciclet' in product_data.get('nume_categorie', '').lower():
-                category = 'biciclete'
-            elif 'anvelop' in name.lower() or 'camera' in name.lower():
-                category = 'piese-schimb'
-                
-            categories_count[category] = categories_count.get(category, 0) + 1
-            
-            # Process images
-            images = []
-            if product_data.get('imag_baza'):
-                images.append(product_data['imag_baza'])
-            
-            if product_data.get('imag_galerie'):
-                gallery_images = product_data['imag_galerie'].split('|')
-                images.extend(gallery_images[:3])  # Max 3 additional images
-            
-            # Calculate discount
-            selling_price = product_data.get('pret_sugerat', 0)  # Price we show to customers
-            cost_price = product_data.get('pret_produs', 0)      # Purchase/cost price
-            discount_percent = 0
-            # For display purposes, we can show a discount from a higher "original" price
-            if selling_price and cost_price and selling_price > cost_price:
-                # Create a fictional "original price" that's higher than selling price for discount display
-                fictional_original = selling_price * 1.5  # 50% markup for display
-                discount_percent = round(((fictional_original - selling_price) / fictional_original) * 100, 2)
-            
-            # Build product object
-            product = {
-                'id': product_id,
-                'name': name,
-                'brand': brand,
-                'category': category,
-                'price': selling_price,  # Use pret_sugerat (selling price)
-                'currency': 'RON',
-                'availability': 'in_stock' if product_data.get('in_stock') else 'out_of_stock',
-                'stock_quantity': product_data.get('cant_stock', 0),
-                'sku': product_data.get('cod_produs', ''),
-                'ean': product_data.get('cod_ean', ''),
-                'description': product_data.get('descriere', ''),
-                'url': url_mappings.get(product_data.get('cod_produs', ''), ''),  # Add URL from mapping
-                'images': images,
-                'rating': round(4.0 + (i % 10) * 0.1, 1),  # Simulated ratings 4.0-4.9
-                'reviews_count': (i % 50) + 1,  # Simulated review counts
-                'warranty': '12 luni' if selling_price < 100 else '24 luni',
-                'tags': [category.replace('-', ' '), brand.lower()],
-                'scraped_at': datetime.now().isoformat()
-            }
-            
-            # Add discount info if applicable
-            if discount_percent > 0:
-                fictional_original = selling_price * 1.5
-                product['original_price'] = fictional_original
-                product['discount_percent'] = discount_percent
-            
-            # Add weight if available
-            if product_data.get('greutate'):
-                try:
-                    weight = float(product_data['greutate'])
-                    product['weight'] = f"{weight} kg"
-                except:
-                    pass
-            
-            products.append(product)
-            matched_count += 1
+        # Extract brand
+        brand = self.extract_brand_from_name(name)
         
-        print(f"✅ Successfully processed {matched_count} products")
+        # Determine category
+        category = self.extract_category_from_url(product_data.get('categorie_path', ''))
+        if 'biciclet' in product_data.get('nume_categorie', '').lower():
+            category = 'biciclete'
+        elif 'anvelop' in name.lower() or 'camera' in name.lower():
+            category = 'piese-schimb'
+        
+        # Process images
+        images = []
+        if product_data.get('imag_baza'):
+            images.append(product_data['imag_baza'])
+        
+        if product_data.get('imag_galerie'):
+            gallery_images = product_data['imag_galerie'].split('|')
+            images.extend(gallery_images[:3])  # Max 3 additional images
+        
+        # Calculate discount
+        selling_price = product_data.get('pret_sugerat', 0)  # Price we show to customers
+        cost_price = product_data.get('pret_produs', 0)      # Purchase/cost price
+        discount_percent = 0
+        # For display purposes, we can show a discount from a higher "original" price
+        if selling_price and cost_price and selling_price > cost_price:
+            # Create a fictional "original price" that's higher than selling price for discount display
+            fictional_original = selling_price * 1.5  # 50% markup for display
+            discount_percent = round(((fictional_original - selling_price) / fictional_original) * 100, 2)
+        
+        # Build product object
+        product = {
+            'id': product_id,
+            'name': name,
+            'brand': brand,
+            'category': category,
+            'price': selling_price,  # Use pret_sugerat (selling price)
+            'currency': 'RON',
+            'availability': 'in_stock' if product_data.get('in_stock') else 'out_of_stock',
+            'stock_quantity': product_data.get('cant_stock', 0),
+            'sku': product_data.get('cod_produs', ''),
+            'ean': product_data.get('cod_ean', ''),
+            'description': product_data.get('descriere', ''),
+            'url': url_mappings.get(product_data.get('cod_produs', ''), ''),  # Add URL from mapping
+            'images': images,
+            'rating': round(4.0 + (position % 10) * 0.1, 1),  # Simulated ratings 4.0-4.9
+            'reviews_count': (position % 50) + 1,  # Simulated review counts
+            'warranty': '12 luni' if selling_price < 100 else '24 luni',
+            'tags': [category.replace('-', ' '), brand.lower()],
+            'scraped_at': datetime.now().isoformat()
+        }
+        
+        # Add discount info if applicable
+        if discount_percent > 0:
+            fictional_original = selling_price * 1.5
+            product['original_price'] = fictional_original
+            product['discount_percent'] = discount_percent
+        
+        # Add weight if available
+        if product_data.get('greutate'):
+            try:
+                weight = float(product_data['greutate'])
+                product['weight'] = f"{weight} kg"
+            except:
+                pass
+        
+        return Product.from_dict(product)
+    
+    def build_catalog(self, products: List[Product], csv_products_total: int, sitemap_urls_total: int) -> Dict:
+        """Wrap the products with the category, brand and metadata sections."""
+        categories_count = {}
+        brands_count = {}
+        for product in products:
+            categories_count[product['category']] = categories_count.get(product['category'], 0) + 1
+            brands_count[product['brand']] = brands_count.get(product['brand'], 0) + 1
         
         # Build category structure
         categories = []
@@ -363,13 +485,149 @@ class BikeStylishDataParser:
             'metadata': {
                 'scraper_version': '2.0.0',
                 'products_scraped': len(products),
-                'csv_products_total': len(products_data),
-                'sitemap_urls_total': len(urls),
+                'csv_products_total': csv_products_total,
+                'sitemap_urls_total': sitemap_urls_total,
                 'last_update_source': 'CSV + Sitemap parsing'
             }
         }
         
         return catalog
+    
+    def generate_product_catalog(self) -> Dict:
+        """Generate the complete product catalog."""
+        print("🔄 Parsing CSV product data...")
+        products_data = self.parse_csv_data()
+        print(f"📊 Found {len(products_data)} products in CSV")
+        
+        print("🔄 Parsing sitemap URLs...")
+        urls = self.parse_sitemap_urls()
+        print(f"🔗 Found {len(urls)} URLs in sitemap")
+        
+        print("🔄 Matching URLs to products...")
+        
+        # Process ALL products from the CSV (not just a sample)
+        sample_products = list(self.unique_products(products_data).values())  # All unique products
+        print(f"📊 Processing {len(sample_products)} unique products...")
+        
+        # Create URL-to-product mapping for better matching
+        url_mappings = self.map_urls_to_products(urls, products_data)
+        print(f"🔗 Successfully mapped {len(url_mappings)} URLs to products")
+        
+        products = [self.build_product(product_data, i, url_mappings)
+                    for i, product_data in enumerate(sample_products)]
+        print(f"✅ Successfully processed {len(products)} products")
+        
+        return self.build_catalog(products, len(products_data), len(urls))
+    
+    def update_product_catalog(self, previous_catalog: Dict, changed_codes: set,
+                               removed_codes: set = frozenset(), relinked: Optional[set] = None) -> Dict:
+        """Rebuild the catalog reusing previous products whose CSV row did not change.
+        
+        Only products in `changed_codes` (added or changed rows) are rebuilt;
+        every other product is taken as is from `previous_catalog`, so its
+        output stays identical. Rebuilt products keep their previous simulated
+        rating and review count. Removed rows simply drop out of the catalog.
+        
+        When products are rebuilt or removed the sitemap is matched again
+        against the whole CSV, and reused products take their URL from that
+        mapping too, so a URL that moved to a rebuilt product is not kept by
+        its old one and a URL of a removed product goes to its next best match.
+        Pass a set as `relinked` to receive the codes of reused products whose
+        URL changed, so later stages can refresh them.
+        """
+        print("🔄 Parsing CSV product data...")
+        products_data = self.parse_csv_data()
+        unique = self.unique_products(products_data)
+        
+        previous = {product['sku']: product for product in previous_catalog.get('products', [])}
+        
+        # Sitemap matching is only needed when some product is rebuilt or removed
+        rematch = bool(changed_codes or removed_codes)
+        url_mappings = {}
+        urls_total = previous_catalog.get('metadata', {}).get('sitemap_urls_total', 0)
+        if rematch:
+            urls = self.parse_sitemap_urls()
+            url_mappings = self.map_urls_to_products(urls, products_data)
+            urls_total = len(urls)
+        
+        products = []
+        rebuilt = 0
+        relinked_codes = set()
+        for i, (code, product_data) in enumerate(unique.items()):
+            old = previous.get(code)
+            if old is not None and code not in changed_codes:
+                if rematch:
+                    url = url_mappings.get(code, '')
+                    if old.get('url', '') != url:
+                        old = old.replace(url=url)
+                        relinked_codes.add(code)
+                products.append(old)
+                continue
+            product = self.build_product(product_data, i, url_mappings)
+            if old is not None:
+                product = product.replace(rating=old.get('rating'), reviews_count=old.get('reviews_count'))
+            products.append(product)
+            rebuilt += 1
+        
+        if relinked is not None:
+            relinked.update(relinked_codes)
+        print(f"✅ Rebuilt {rebuilt} products, reused {len(products) - rebuilt} "
+              f"({len(relinked_codes)} with a new URL)")
+        return self.build_catalog(products, len(products_data), urls_total)
+
+def benchmark_url_matching(parser: BikeStylishDataParser, url_count: int = 2400,
+                           linear_sample: int = 200) -> Dict:
+    """Compare the all-pairs matcher with the inverted index on the real CSV.
+    
+    Uses the sitemap when it is available, otherwise builds product-style URLs
+    from the CSV names (words joined with '+', which the matcher splits on). The linear matcher only runs on ``linear_sample`` URLs
+    (it needs minutes for the full set); its per-URL cost is extrapolated.
+    """
+    products_data = parser.parse_csv_data()
+    urls = parser.parse_sitemap_urls()
+    if not urls:
+        names = sorted({p['nume_produs'] for p in products_data.values()})
+        step = max(1, len(names) // url_count)
+        urls = [
+            "https://www.bikestylish.ro/accesorii/" +
+            '+'.join(name.lower().split()) + ".html"
+            for name in names[::step][:url_count]
+        ]
+    
+    print(f"📊 {len(products_data)} CSV keys, {len(urls)} URLs")
+    
+    start = time.perf_counter()
+    index = parser.build_product_index(products_data)
+    build_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    indexed = [parser.match_url_to_product(url, products_data, index) for url in urls]
+    indexed_time = time.perf_counter() - start
+    
+    sample = urls[:linear_sample]
+    start = time.perf_counter()
+    linear = [parser.match_url_to_product_linear(url, products_data) for url in sample]
+    linear_time = time.perf_counter() - start
+    
+    identical = all(a is b for a, b in zip(linear, indexed))
+    linear_full = linear_time / max(len(sample), 1) * len(urls)
+    indexed_total = build_time + indexed_time
+    
+    print(f"⏱️ Index build: {build_time:.3f}s ({len(index.entries)} products, {len(index.token_index)} tokens)")
+    print(f"⏱️ Indexed match: {indexed_time:.3f}s for {len(urls)} URLs")
+    print(f"⏱️ Linear match: {linear_time:.3f}s for {len(sample)} URLs (~{linear_full:.1f}s extrapolated)")
+    print(f"🚀 Speedup: ~{linear_full / indexed_total:.0f}x")
+    print(f"{'✅' if identical else '❌'} Results identical on {len(sample)} sampled URLs")
+    print(f"🔗 Matched {sum(1 for m in indexed if m)}/{len(urls)} URLs")
+    
+    return {
+        'urls': len(urls),
+        'index_build_s': build_time,
+        'indexed_match_s': indexed_time,
+        'linear_sample_s': linear_time,
+        'linear_extrapolated_s': linear_full,
+        'identical': identical
+    }
 
 def main():
     """Main execution function."""
@@ -381,8 +639,7 @@ def main():
         
         # Save to JSON file
         output_file = '../data/products.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(catalog, f, ensure_ascii=False, indent=2)
+        save_catalog(catalog, output_file)
         
         print(f"\n✅ Successfully created catalog with:")
         print(f"   📦 {catalog['total_products']} products")
@@ -401,4 +658,7 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark" in sys.argv:
+        benchmark_url_matching(BikeStylishDataParser())
+    else:
+        main()
@@ -10,11 +10,18 @@ import requests
 import json
 import time
 import re
+import sys
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from async_crawler import run_async_scraper
+from catalog import Product, json_default
+from crawl_journal import CrawlJournal
+from html_parsers import get_backend, page_plans
+from http_cache import DEFAULT_MAX_AGE, HttpCache
+from sitemap_crawl import run_sitemap_crawl
 
 # Setup logging
 logging.basicConfig(
@@ -27,7 +34,8 @@ logging.basicConfig(
 )
 
 class BikeStylishScraper:
-    def __init__(self):
+    def __init__(self, cache: Optional[HttpCache] = None, journal: Optional[CrawlJournal] = None,
+                 parser: Optional[str] = None):
         self.base_url = "https://bikestylish.ro"
         self.session = requests.Session()
         self.session.headers.update({
@@ -41,14 +49,37 @@ class BikeStylishScraper:
         self.products = []
         self.categories = []
         self.brands = set()
+        # Conditional-GET page cache; None downloads and parses every page
+        self.cache = cache
+        # Checkpoint journal of an interrupted crawl to resume; None crawls from scratch
+        self.journal = journal
+        self.requests_made = 0
+        # HTML backend (html.parser, lxml or selectolax; None picks the fastest
+        # installed) and its compiled selectors for each page type
+        self.parser = get_backend(parser)
+        self.plans = page_plans(self.parser.name)
+        
+    def fetch(self, url: str, retries: int = 3) -> Optional[Tuple[bytes, bool]]:
+        """Download a page with retry logic, through the HTTP cache when enabled.
+        
+        Returns (content, unchanged): ``unchanged`` is True when the stored
+        copy was used, either still fresh or confirmed by a 304.
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            return self.cache.hit(entry), True
+        headers = self.cache.conditional_headers(entry) if self.cache else {}
         
-    def get_page(self, url: str, retries: int = 3) -> Optional[BeautifulSoup]:
-        """Fetch and parse a web page with retry logic."""
         for attempt in range(retries):
             try:
-                response = self.session.get(url, timeout=30)
+                self.requests_made += 1
+                response = self.session.get(url, headers=headers, timeout=30)
+                if entry and response.status_code == 304:
+                    return self.cache.revalidated(entry, response.headers), True
                 response.raise_for_status()
-                return BeautifulSoup(response.content, 'html.parser')
+                if self.cache:
+                    self.cache.store(url, response.content, response.headers)
+                return response.content, False
             except requests.RequestException as e:
                 logging.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
                 if attempt < retries - 1:
@@ -57,6 +88,49 @@ class BikeStylishScraper:
                     logging.error(f"Failed to fetch {url} after {retries} attempts")
                     return None
     
+    def get_page(self, url: str, retries: int = 3) -> Optional[Any]:
+        """Fetch and parse a web page with retry logic."""
+        fetched = self.fetch(url, retries)
+        return self.parse_html(fetched[0]) if fetched else None
+    
+    def get_record(self, url: str, kind: str, parse: Callable[[Any], Any]) -> Any:
+        """Fetch a page and return what ``parse`` extracts from it.
+        
+        Pages already in the crawl journal are not fetched again; newly
+        parsed ones are journaled.
+        """
+        if self.journal:
+            record = self.journal.get(kind, url)
+            if record is not None:
+                return record
+        fetched = self.fetch(url)
+        if not fetched:
+            return None
+        record = self.parse_record(url, kind, fetched[0], fetched[1], parse)
+        if self.journal and record is not None:
+            self.journal.record(kind, url, record)
+        return record
+    
+    def parse_record(self, url: str, kind: str, content: bytes, unchanged: bool,
+                     parse: Callable[[Any], Any]) -> Any:
+        """Parse a downloaded page, reusing the cached record of an unchanged one.
+        
+        Records are JSON data (lists, dicts) stored in the HTTP cache under
+        ``kind``, so each call gets a fresh copy.
+        """
+        if unchanged and self.cache:
+            record = self.cache.parsed(url, kind)
+            if record is not None:
+                return record
+        record = parse(self.parse_html(content))
+        if self.cache and record is not None:
+            self.cache.save_parsed(url, kind, record)
+        return record
+    
+    def parse_html(self, content: bytes) -> Any:
+        """Parse a downloaded page with the scraper's HTML backend."""
+        return self.parser.parse(content)
+    
     def extract_price(self, text: str) -> Optional[float]:
         """Extract price from text string."""
         if not text:
@@ -80,80 +154,60 @@ class BikeStylishScraper:
         """Scrape product categories from the main navigation."""
         logging.info("Scraping categories...")
         
-        soup = self.get_page(self.base_url)
-        if not soup:
+        categories = self.get_record(self.base_url, 'categories', self.parse_categories)
+        if categories is None:
             return []
         
+        logging.info(f"Found {len(categories)} categories")
+        return categories
+    
+    def parse_categories(self, tree: Any) -> List[Dict]:
+        """Category entries from the home page navigation, or the default ones."""
         categories = []
         
-        # Look for navigation menu or category links
-        nav_selectors = [
-            '.main-navigation .menu-item',
-            '.category-menu a',
-            '.nav-categories a',
-            'nav a[href*="categori"]'
-        ]
-        
-        for selector in nav_selectors:
-            nav_items = soup.select(selector)
-            if nav_items:
-                for item in nav_items:
-                    href = item.get('href', '')
-                    text = item.get_text(strip=True)
-                    
-                    if text and 'biciclet' in text.lower() or 'accesor' in text.lower():
-                        category_id = re.sub(r'[^a-z0-9-]', '', text.lower().replace(' ', '-'))
-                        categories.append({
-                            'id': category_id,
-                            'name': text,
-                            'url': urljoin(self.base_url, href),
-                            'count': 0  # Will be updated during product scraping
-                        })
-                break
+        # Look for navigation menu or category links (first selector that matches)
+        for nav_items in self.plans['home'].all(tree, 'categories'):
+            for item in nav_items:
+                href = self.parser.attr(item, 'href') or ''
+                text = self.parser.text(item)
+                
+                if text and 'biciclet' in text.lower() or 'accesor' in text.lower():
+                    category_id = re.sub(r'[^a-z0-9-]', '', text.lower().replace(' ', '-'))
+                    categories.append({
+                        'id': category_id,
+                        'name': text,
+                        'url': urljoin(self.base_url, href),
+                        'count': 0  # Will be updated during product scraping
+                    })
+            break
         
         # Fallback: default categories
         if not categories:
-            categories = [
-                {'id': 'biciclete', 'name': 'Biciclete', 'url': f"{self.base_url}/biciclete", 'count': 0},
-                {'id': 'accesorii', 'name': 'Accesorii', 'url': f"{self.base_url}/accesorii", 'count': 0},
-                {'id': 'piese-schimb', 'name': 'Piese de Schimb', 'url': f"{self.base_url}/piese-schimb", 'count': 0}
-            ]
+            categories = self.default_categories()
         
-        logging.info(f"Found {len(categories)} categories")
         return categories
     
+    def default_categories(self) -> List[Dict]:
+        """The shop's top-level categories, used when the navigation gives none."""
+        return [
+            {'id': 'biciclete', 'name': 'Biciclete', 'url': f"{self.base_url}/biciclete", 'count': 0},
+            {'id': 'accesorii', 'name': 'Accesorii', 'url': f"{self.base_url}/accesorii", 'count': 0},
+            {'id': 'piese-schimb', 'name': 'Piese de Schimb', 'url': f"{self.base_url}/piese-schimb", 'count': 0}
+        ]
+    
     def scrape_product_list(self, category_url: str, max_pages: int = 5) -> List[str]:
         """Scrape product URLs from category pages."""
         product_urls = []
         
         for page in range(1, max_pages + 1):
             page_url = f"{category_url}?page={page}"
-            soup = self.get_page(page_url)
+            requests_before = self.requests_made
+            page_links = self.get_record(page_url, 'product_links', self.parse_all_product_links)
             
-            if not soup:
+            if page_links is None:
                 break
             
-            # Common product link selectors for e-commerce sites
-            product_selectors = [
-                '.product-item a',
-                '.product-card a',
-                '.product-link',
-                'a[href*="/produs/"]',
-                'a[href*="/product/"]',
-                '.item-product a'
-            ]
-            
-            page_products = []
-            for selector in product_selectors:
-                links = soup.select(selector)
-                if links:
-                    for link in links:
-                        href = link.get('href')
-                        if href:
-                            full_url = urljoin(self.base_url, href)
-                            if full_url not in product_urls:
-                                page_products.append(full_url)
-                    break
+            page_products = [url for url in page_links if url not in product_urls]
             
             if not page_products:
                 # No products found on this page, might be end of pagination
@@ -162,40 +216,71 @@ class BikeStylishScraper:
             product_urls.extend(page_products)
             logging.info(f"Found {len(page_products)} products on page {page}")
             
-            # Rate limiting
-            time.sleep(1)
+            # Rate limiting (pages served fresh from the cache made no request)
+            if self.requests_made != requests_before:
+                time.sleep(1)
         
         return product_urls
     
-    def scrape_product_details(self, product_url: str) -> Optional[Dict]:
+    def parse_product_links(self, tree: Any, known_urls: List[str]) -> List[str]:
+        """Product URLs on a category listing page that are not in ``known_urls``."""
+        # Common product link selectors for e-commerce sites (first that matches)
+        page_products = []
+        for links in self.plans['listing'].all(tree, 'links'):
+            for link in links:
+                href = self.parser.attr(link, 'href')
+                if href:
+                    full_url = urljoin(self.base_url, href)
+                    if full_url not in known_urls:
+                        page_products.append(full_url)
+            break
+        return page_products
+    
+    def parse_all_product_links(self, tree: Any) -> List[str]:
+        """Every product URL on a category listing page."""
+        return self.parse_product_links(tree, [])
+    
+    def scrape_product_details(self, product_url: str) -> Optional[Product]:
         """Scrape detailed product information."""
-        soup = self.get_page(product_url)
-        if not soup:
+        record = self.get_record(product_url, 'product',
+                                 lambda tree: self.parse_product_record(tree, product_url))
+        return self.product_from_record(record)
+    
+    def parse_product_record(self, tree: Any, product_url: str) -> Optional[Dict]:
+        """Product page as a cacheable record (the product's dict)."""
+        product = self.parse_product_details(tree, product_url)
+        return product.to_dict() if product else None
+    
+    def product_from_record(self, record: Optional[Dict]) -> Optional[Product]:
+        if not record:
             return None
-        
+        product = Product.from_dict(record)
+        self.brands.add(product['brand'])
+        return product
+    
+    def parse_product_details(self, tree: Any, product_url: str) -> Optional[Product]:
+        """Build a product from a downloaded product page."""
         try:
+            # Selectors of each field are tried in order, and only until the field is found
+            plan = self.plans['product']
+            text = self.parser.text
+            
             # Extract basic product info
-            title_selectors = ['h1.product-title', 'h1', '.product-name h1', '.product-title']
             title = None
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    break
+            for title_elem in plan.first(tree, 'title'):
+                title = text(title_elem)
+                break
             
             if not title:
                 logging.warning(f"No title found for {product_url}")
                 return None
             
             # Extract price
-            price_selectors = ['.price', '.product-price', '.current-price', '.price-current']
             price = None
-            for selector in price_selectors:
-                price_elem = soup.select_one(selector)
-                if price_elem:
-                    price = self.extract_price(price_elem.get_text())
-                    if price:
-                        break
+            for price_elem in plan.first(tree, 'price'):
+                price = self.extract_price(text(price_elem, strip=False))
+                if price:
+                    break
             
             # Extract brand from title or dedicated field
             brand = "Unknown"
@@ -205,21 +290,16 @@ class BikeStylishScraper:
                     break
             
             # Extract description
-            desc_selectors = ['.product-description', '.description', '.product-details']
             description = ""
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    description = desc_elem.get_text(strip=True)[:500]  # Limit length
-                    break
+            for desc_elem in plan.first(tree, 'description'):
+                description = text(desc_elem)[:500]  # Limit length
+                break
             
             # Extract images
-            img_selectors = ['.product-images img', '.product-gallery img', '.product-image img']
             images = []
-            for selector in img_selectors:
-                img_elements = soup.select(selector)
+            for img_elements in plan.all(tree, 'images'):
                 for img in img_elements[:3]:  # Limit to 3 images
-                    src = img.get('src') or img.get('data-src')
+                    src = self.parser.attr(img, 'src') or self.parser.attr(img, 'data-src')
                     if src:
                         images.append(urljoin(self.base_url, src))
                 if images:
@@ -229,19 +309,19 @@ class BikeStylishScraper:
             product_id = re.sub(r'[^a-z0-9-]', '', title.lower().replace(' ', '-'))[:50]
             
             # Build product object
-            product = {
-                'id': product_id,
-                'name': title,
-                'brand': brand,
-                'category': 'biciclete',  # Default, will be updated based on URL
-                'price': price or 0.0,
-                'currency': 'RON',
-                'availability': 'in_stock',
-                'description': description,
-                'url': product_url,
-                'images': images,
-                'scraped_at': datetime.now().isoformat()
-            }
+            product = Product(
+                id=product_id,
+                name=title,
+                brand=brand,
+                category='biciclete',  # Default, will be updated based on URL
+                price=price or 0.0,
+                currency='RON',
+                availability='in_stock',
+                description=description,
+                url=product_url,
+                images=images,
+                scraped_at=datetime.now().isoformat()
+            )
             
             # Add brand to set
             self.brands.add(brand)
@@ -252,6 +332,31 @@ class BikeStylishScraper:
             logging.error(f"Error scraping product {product_url}: {e}")
             return None
     
+    def build_catalog(self, categories: List[Dict], all_products: List[Product]) -> Dict:
+        """Assemble the catalog from the scraped categories and products."""
+        catalog = {
+            'last_updated': datetime.now().isoformat(),
+            'total_products': len(all_products),
+            'version': '1.0.0',
+            'source': 'bikestylish.ro',
+            'categories': categories,
+            'brands': [{'name': brand, 'product_count': 0} for brand in sorted(self.brands)],
+            'products': all_products,
+            'metadata': {
+                'scraper_version': '1.0.0',
+                'last_scrape_duration': 'Unknown',
+                'products_scraped': len(all_products)
+            }
+        }
+        
+        # Update brand counts
+        for brand_info in catalog['brands']:
+            brand_info['product_count'] = sum(
+                1 for p in all_products if p['brand'] == brand_info['name']
+            )
+        
+        return catalog
+    
     def run_scraper(self, max_products_per_category: int = 50) -> Dict:
         """Run the complete scraping process."""
         logging.info("Starting BikeStylish.ro scraping...")
@@ -276,55 +381,61 @@ class BikeStylishScraper:
             
             category_products = []
             for url in product_urls:
+                requests_before = self.requests_made
                 product = self.scrape_product_details(url)
                 if product:
-                    product['category'] = category['id']
+                    product = product.replace(category=category['id'])
                     category_products.append(product)
                     all_products.append(product)
                 
                 # Rate limiting
-                time.sleep(0.5)
+                if self.requests_made != requests_before:
+                    time.sleep(0.5)
             
             # Update category count
             category['count'] = len(category_products)
             logging.info(f"Scraped {len(category_products)} products from {category['name']}")
         
-        # Build final catalog
-        catalog = {
-            'last_updated': datetime.now().isoformat(),
-            'total_products': len(all_products),
-            'version': '1.0.0',
-            'source': 'bikestylish.ro',
-            'categories': categories,
-            'brands': [{'name': brand, 'product_count': 0} for brand in sorted(self.brands)],
-            'products': all_products,
-            'metadata': {
-                'scraper_version': '1.0.0',
-                'last_scrape_duration': 'Unknown',
-                'products_scraped': len(all_products)
-            }
-        }
-        
-        # Update brand counts
-        for brand_info in catalog['brands']:
-            brand_info['product_count'] = sum(
-                1 for p in all_products if p['brand'] == brand_info['name']
-            )
+        catalog = self.build_catalog(categories, all_products)
         
         logging.info(f"Scraping completed. Total products: {len(all_products)}")
         return catalog
 
 def main():
     """Main scraper execution."""
-    scraper = BikeStylishScraper()
+    # python scraper.py [--async] [--sitemap] [--no-cache] [--max-age SECONDS] [--fresh] [--parser NAME]
+    cache = None
+    if "--no-cache" not in sys.argv:
+        max_age = float(sys.argv[sys.argv.index("--max-age") + 1]) if "--max-age" in sys.argv[:-1] else DEFAULT_MAX_AGE
+        cache = HttpCache(max_age=max_age)
+    
+    # An interrupted crawl resumes from its journal unless --fresh is given
+    journal = CrawlJournal()
+    if "--fresh" in sys.argv:
+        journal.discard()
+    journal.open()
+    parser = sys.argv[sys.argv.index("--parser") + 1] if "--parser" in sys.argv[:-1] else None
+    scraper = BikeStylishScraper(cache=cache, journal=journal, parser=parser)
     
     try:
-        catalog = scraper.run_scraper(max_products_per_category=20)
+        if "--sitemap" in sys.argv:
+            # Products seeded from the sitemap; only new or changed URLs are fetched
+            catalog = run_sitemap_crawl(scraper, use_async="--async" in sys.argv)
+        elif "--async" in sys.argv:
+            catalog = run_async_scraper(scraper, max_products_per_category=20)
+        else:
+            catalog = scraper.run_scraper(max_products_per_category=20)
+        
+        if cache:
+            logging.info(f"HTTP cache: {cache.summary()}")
+        if journal.replayed:
+            logging.info(f"Resumed {journal.replayed} pages from the crawl journal")
         
         # Save catalog to JSON
         output_file = '../data/products.json'
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(catalog, f, ensure_ascii=False, indent=2)
+            json.dump(catalog, f, ensure_ascii=False, indent=2, default=json_default)
+        journal.discard()
         
         logging.info(f"Catalog saved to {output_file}")
         print(f"✅ Successfully scraped {catalog['total_products']} products")
@@ -333,6 +444,9 @@ def main():
     except Exception as e:
         logging.error(f"Scraper failed: {e}")
         print(f"❌ Scraping failed: {e}")
+        print(f"💾 Progress kept in {journal.path}; run again to resume")
+    finally:
+        journal.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Sitemap-driven incremental crawl for the BikeStylish scraper
+
+Instead of walking every category's ``?page=N`` listings to discover
+products, the crawl reads the shop's sitemap: it lists every product URL
+with its last modification date (``lastmod``). The lastmod of each URL and
+the product parsed from it are kept in a state file between runs, and only
+URLs that are new or whose lastmod moved are fetched again, so a nightly
+crawl costs the sitemap plus the pages that actually changed.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from real_data_parser import is_product_url, parse_sitemap_entries
+
+SITEMAP_PATH = '/sitemap.xml'
+SITEMAP_STATE_FILE = '../data/.sitemap_state.json'
+
+# Bumped whenever the stored product records change, so an older state is not reused
+STATE_VERSION = 1
+
+# Category of a product URL, by the first keyword it contains (accessory
+# and part URLs often mention bikes too, so those are checked first)
+URL_CATEGORY_RULES = [
+    ('piese', 'piese-schimb'),
+    ('accesorii', 'accesorii'),
+    ('biciclet', 'biciclete')
+]
+
+class SitemapState:
+    """lastmod and parsed product of every product URL seen in the sitemap."""
+
+    def __init__(self, path: str = SITEMAP_STATE_FILE):
+        self.path = path
+        self.urls: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == STATE_VERSION:
+                self.urls = state['urls']
+        except (OSError, ValueError):
+            pass
+
+    def unchanged(self, url: str, lastmod: Optional[str]) -> Optional[Dict]:
+        """Stored product of a URL whose lastmod has not moved, or None.
+
+        URLs without a lastmod are always fetched again.
+        """
+        entry = self.urls.get(url)
+        if entry and lastmod is not None and entry['lastmod'] == lastmod:
+            return entry['product']
+        return None
+
+    def update(self, url: str, lastmod: Optional[str], product: Dict) -> None:
+        self.urls[url] = {'lastmod': lastmod, 'product': product}
+
+    def save(self, listed: List[str]) -> int:
+        """Write the state, keeping only the URLs still listed; returns how many were dropped."""
+        listed = set(listed)
+        removed = [url for url in self.urls if url not in listed]
+        for url in removed:
+            del self.urls[url]
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'urls': self.urls}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        return len(removed)
+
+def url_category(url: str) -> Optional[str]:
+    lowered = url.lower()
+    for keyword, category_id in URL_CATEGORY_RULES:
+        if keyword in lowered:
+            return category_id
+    return None
+
+def read_sitemap(scraper, sitemap_url: str) -> Tuple[List[Tuple[str, Optional[str]]], int]:
+    """Product (url, lastmod) pairs of a sitemap, following sitemap indexes.
+
+    Sitemaps are fetched through the scraper (and so its HTTP cache).
+    Returns the pairs in sitemap order and the number of sitemaps read.
+    """
+    entries = {}
+    pending, seen = [sitemap_url], set()
+    while pending:
+        url = pending.pop(0)
+        if url in seen:
+            continue
+        seen.add(url)
+        fetched = scraper.fetch(url)
+        if not fetched:
+            continue
+        pages, sitemaps = parse_sitemap_entries(fetched[0].decode('utf-8', errors='replace'))
+        for page_url, lastmod in pages:
+            if is_product_url(page_url):
+                entries.setdefault(page_url, lastmod)
+        pending.extend(child for child, _ in sitemaps)
+    return list(entries.items()), len(seen)
+
+def run_sitemap_crawl(scraper, sitemap_url: Optional[str] = None, state_file: str = SITEMAP_STATE_FILE,
+                      use_async: bool = False, limit: Optional[int] = None,
+                      stats: Optional[Dict[str, Any]] = None) -> Dict:
+    """Crawl the products listed in the sitemap, fetching only new or changed URLs.
+
+    ``use_async`` fetches the changed pages with the asyncio engine; ``limit``
+    caps how many sitemap URLs are crawled. Pass a dict as ``stats`` to
+    receive the counts (sitemaps read, URLs listed, unchanged, fetched,
+    failed, removed from the state).
+    """
+    started = time.perf_counter()
+    sitemap_url = sitemap_url or scraper.base_url + SITEMAP_PATH
+    logging.info(f"Starting BikeStylish.ro sitemap crawl from {sitemap_url}...")
+
+    listed, sitemaps_read = read_sitemap(scraper, sitemap_url)
+    entries = listed[:limit] if limit is not None else listed
+    state = SitemapState(state_file)
+
+    records: List[Optional[Dict]] = []
+    to_fetch = []
+    for url, lastmod in entries:
+        record = state.unchanged(url, lastmod)
+        records.append(record)
+        if record is None:
+            to_fetch.append(len(records) - 1)
+    logging.info(f"{len(entries)} product URLs in the sitemap, {len(to_fetch)} new or changed")
+
+    urls = [entries[position][0] for position in to_fetch]
+    if use_async:
+        from async_crawler import AsyncCrawler
+        fetched = asyncio.run(AsyncCrawler(scraper).crawl_products(urls))
+    else:
+        fetched = []
+        for url in urls:
+            requests_before = scraper.requests_made
+            fetched.append(scraper.scrape_product_details(url))
+            # Rate limiting
+            if scraper.requests_made != requests_before:
+                time.sleep(0.5)
+
+    for position, product in zip(to_fetch, fetched):
+        if product:
+            url, lastmod = entries[position]
+            product = product.replace(category=url_category(url))
+            records[position] = product.to_dict()
+            state.update(url, lastmod, records[position])
+
+    categories = scraper.default_categories()
+    all_products = [scraper.product_from_record(record) for record in records if record]
+    for category in categories:
+        category['count'] = sum(1 for product in all_products if product['category'] == category['id'])
+    # Pruned against the whole listing: URLs past ``limit`` keep their state
+    removed = state.save([url for url, _ in listed])
+
+    counts = {
+        'sitemaps': sitemaps_read,
+        'listed': len(entries),
+        'unchanged': len(entries) - len(to_fetch),
+        'fetched': sum(1 for product in fetched if product),
+        'failed': sum(1 for product in fetched if not product),
+        'removed': removed,
+        'seconds': time.perf_counter() - started
+    }
+    if stats is not None:
+        stats.update(counts)
+    logging.info(f"Sitemap crawl completed. Total products: {len(all_products)} "
+                 f"({counts['unchanged']} unchanged, {counts['fetched']} fetched, "
+                 f"{counts['failed']} failed, {counts['removed']} removed)")
+    return scraper.build_catalog(categories, all_products)
+
+def benchmark_sitemap_crawl(categories: int = 3, products_per_category: int = 20,
+                            changed: int = 3, latency: float = 0.05) -> List[Dict]:
+    """Compare listing-walk and sitemap crawls of a local stand-in site, cold
+    and after a few product pages changed."""
+    import tempfile
+    from scraper import BikeStylishScraper
+    from standin_site import StandinSite
+
+    results = []
+    with tempfile.TemporaryDirectory() as state_dir, \
+            StandinSite(categories, products_per_category, latency=latency) as site:
+        state_file = os.path.join(state_dir, 'sitemap_state.json')
+        for run in ('cold', 'changed'):
+            if run == 'changed':
+                for name in site.category_names:
+                    for slug in site.product_slugs(name)[:changed]:
+                        site.touch(slug)
+            for mode in ('listing', 'sitemap'):
+                site.requests.clear()
+                scraper = BikeStylishScraper()
+                scraper.base_url = site.base_url
+                start = time.perf_counter()
+                if mode == 'listing':
+                    catalog = scraper.run_scraper(max_products_per_category=products_per_category)
+                else:
+                    catalog = run_sitemap_crawl(scraper, state_file=state_file)
+                paths = [path for _, path in site.requests]
+                results.append({
+                    'run': run, 'mode': mode, 'seconds': time.perf_counter() - start,
+                    'requests': len(paths),
+                    'discovery': sum(1 for path in paths if not path.startswith('/produs/')),
+                    'products': catalog['total_products']
+                })
+
+    for result in results:
+        print(f"⏱️ {result['run']:>7} {result['mode']:>7}: {result['seconds']:6.2f}s, "
+              f"{result['requests']} requests ({result['discovery']} discovery), {result['products']} products")
+    return results
+
+if __name__ == "__main__":
+    benchmark_sitemap_crawl()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+SQLite export of the BikeStylish catalog
+
+Builds ``catalog.sqlite`` from the enhanced product catalog, the enhanced
+categories and the brand list: normalized tables (products, categories,
+brands, product_categories), B-tree indexes for the usual lookups and FTS5
+tables for full-text search with Romanian diacritics folded (``ș``/``ş``,
+``ț``/``ţ``, ``ă``, ``â``, ``î`` match their plain letters).
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from catalog import extract_brand, extract_price, json_default, load_catalog
+from category_matching import build_category_index, find_product_categories
+
+# unicode61 with remove_diacritics=2 folds every combining mark, including
+# the comma below of ș/ț and the cedilla of the older ş/ţ forms
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+
+SCHEMA = f"""
+CREATE TABLE brands (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    origin TEXT,
+    description TEXT,
+    product_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE categories (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT,
+    parent TEXT,
+    url TEXT,
+    priority REAL,
+    product_count INTEGER NOT NULL DEFAULT 0,
+    price_min REAL,
+    price_max REAL,
+    price_avg REAL
+);
+
+CREATE TABLE products (
+    id INTEGER PRIMARY KEY,
+    product_id TEXT,
+    sku TEXT,
+    ean TEXT,
+    name TEXT NOT NULL,
+    brand_id INTEGER REFERENCES brands(id),
+    category TEXT,
+    price REAL,
+    original_price REAL,
+    discount_percent REAL,
+    currency TEXT,
+    availability TEXT,
+    stock_quantity INTEGER,
+    rating REAL,
+    reviews_count INTEGER,
+    warranty TEXT,
+    url TEXT,
+    description TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE product_categories (
+    product_id INTEGER NOT NULL REFERENCES products(id),
+    category_id TEXT NOT NULL REFERENCES categories(id),
+    PRIMARY KEY (product_id, category_id)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE products_fts USING fts5(
+    name, description, keywords, tokenize = '{FTS_TOKENIZER}'
+);
+
+CREATE VIRTUAL TABLE categories_fts USING fts5(
+    category_id UNINDEXED, name, description, keywords, tokenize = '{FTS_TOKENIZER}'
+);
+"""
+
+# Created after the bulk insert, which is much faster than maintaining them row by row
+INDEXES = """
+CREATE INDEX idx_products_sku ON products(sku);
+CREATE INDEX idx_products_ean ON products(ean);
+CREATE INDEX idx_products_category ON products(category);
+CREATE INDEX idx_products_brand ON products(brand_id);
+CREATE INDEX idx_products_price ON products(price);
+CREATE INDEX idx_product_categories_category ON product_categories(category_id, product_id);
+"""
+
+FTS_QUERY_WORD = re.compile(r'\w+')
+
+def _number(value: Any, cast=float) -> Optional[Any]:
+    try:
+        return cast(value) if value not in (None, '') else None
+    except (ValueError, TypeError):
+        return None
+
+def search_keywords(product: Any) -> str:
+    """All keyword strings from the product's ``search_optimization`` section."""
+    section = product.get('search_optimization') or {}
+    keywords = []
+    for value in section.values():
+        if isinstance(value, list):
+            keywords.extend(str(item) for item in value if isinstance(item, (str, int, float)))
+        elif isinstance(value, str):
+            keywords.append(value)
+    return " ".join(keywords)
+
+def category_search_text(category: Dict) -> Tuple[str, str]:
+    """Description and keyword text indexed for a category."""
+    seo = category.get('seo_features') or {}
+    real_data = category.get('real_data') or {}
+    description = seo.get('meta_description', '')
+    keywords = [category.get('type') or '', seo.get('meta_title', '')]
+    keywords.extend(real_data.get('main_categories') or [])
+    return description, " ".join(str(keyword) for keyword in keywords if keyword)
+
+def _load_json(path: str) -> Dict:
+    if not path or not os.path.exists(path):
+        print(f"⚠️ {path} not found, skipping")
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_catalog_sqlite(products_file: str = '../data/products_ai_enhanced.json',
+                         categories_file: str = '../data/categories_ai_enhanced.json',
+                         brands_file: str = '../data/brands.json',
+                         output_file: str = '../data/catalog.sqlite') -> Dict:
+    """Write the catalog database and return a summary of row counts.
+
+    The database is built in a temporary file and moved into place at the
+    end, so readers never see a half-written catalog.
+    """
+    started = time.perf_counter()
+    catalog = load_catalog(products_file)
+    products = catalog.get('products', [])
+    categories = _load_json(categories_file).get('categories', [])
+    brand_info = {brand['name']: brand for brand in _load_json(brands_file).get('brands', [])}
+    category_lookup = {category['id']: category for category in categories}
+    category_index = build_category_index(category_lookup) if category_lookup else None
+
+    tmp_file = output_file + '.tmp'
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    conn = sqlite3.connect(tmp_file)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+
+        # Brands: every brand seen in products, enriched from brands.json
+        brand_ids = {}
+        for product in products:
+            brand = extract_brand(product)
+            if brand and brand not in brand_ids:
+                info = brand_info.get(brand, {})
+                cursor = conn.execute(
+                    "INSERT INTO brands (name, origin, description) VALUES (?, ?, ?)",
+                    (brand, info.get('origin'), info.get('description')))
+                brand_ids[brand] = cursor.lastrowid
+
+        for category in categories:
+            conn.execute(
+                "INSERT INTO categories (id, name, type, parent, url, priority) VALUES (?, ?, ?, ?, ?, ?)",
+                (category['id'], category.get('name', category['id']), category.get('type'),
+                 category.get('parent'), category.get('url'), _number(category.get('priority'))))
+            description, keywords = category_search_text(category)
+            conn.execute(
+                "INSERT INTO categories_fts (category_id, name, description, keywords) VALUES (?, ?, ?, ?)",
+                (category['id'], category.get('name', ''), description, keywords))
+
+        for row_id, product in enumerate(products, start=1):
+            brand = extract_brand(product)
+            price = extract_price(product)
+            conn.execute(
+                "INSERT INTO products (id, product_id, sku, ean, name, brand_id, category, price, "
+                "original_price, discount_percent, currency, availability, stock_quantity, rating, "
+                "reviews_count, warranty, url, description, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (row_id, product.get('id'), product.get('sku'), product.get('ean') or None,
+                 product.get('name', ''), brand_ids.get(brand), product.get('category'),
+                 price if price > 0 else None, _number(product.get('original_price')),
+                 _number(product.get('discount_percent')), product.get('currency'),
+                 product.get('availability'), _number(product.get('stock_quantity'), int),
+                 _number(product.get('rating')), _number(product.get('reviews_count'), int),
+                 product.get('warranty'), product.get('url') or None, product.get('description'),
+                 json.dumps(product, ensure_ascii=False, default=json_default)))
+            conn.execute(
+                "INSERT INTO products_fts (rowid, name, description, keywords) VALUES (?, ?, ?, ?)",
+                (row_id, product.get('name', ''), product.get('description', ''), search_keywords(product)))
+
+            if category_lookup:
+                for category_id in find_product_categories(product, category_lookup, category_index):
+                    if category_id in category_lookup:
+                        conn.execute(
+                            "INSERT OR IGNORE INTO product_categories (product_id, category_id) VALUES (?, ?)",
+                            (row_id, category_id))
+
+        # Derived counts and price ranges
+        conn.execute("""
+            UPDATE brands SET product_count =
+                (SELECT COUNT(*) FROM products WHERE products.brand_id = brands.id)
+        """)
+        conn.execute("""
+            UPDATE categories SET (product_count, price_min, price_max, price_avg) = (
+                SELECT COUNT(*), MIN(p.price), MAX(p.price), ROUND(AVG(p.price), 2)
+                FROM product_categories pc JOIN products p ON p.id = pc.product_id
+                WHERE pc.category_id = categories.id
+            )
+        """)
+
+        links = conn.execute("SELECT COUNT(*) FROM product_categories").fetchone()[0]
+        conn.executescript(INDEXES)
+        conn.execute("INSERT INTO products_fts (products_fts) VALUES ('optimize')")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_file, output_file)
+
+    summary = {
+        "products": len(products),
+        "categories": len(categories),
+        "brands": len(brand_ids),
+        "product_categories": links,
+        "bytes": os.path.getsize(output_file),
+        "seconds": round(time.perf_counter() - started, 2)
+    }
+    return summary
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    words = FTS_QUERY_WORD.findall(text)
+    return " ".join(f'"{word}"*' for word in words)
+
+def search_products(conn: sqlite3.Connection, text: str, limit: int = 20) -> List[Tuple]:
+    """Full-text search over products, best matches first (bm25)."""
+    query = fts_query(text)
+    if not query:
+        return []
+    return conn.execute("""
+        SELECT p.id, p.sku, p.name, p.price
+        FROM products_fts JOIN products p ON p.id = products_fts.rowid
+        WHERE products_fts MATCH ?
+        ORDER BY bm25(products_fts)
+        LIMIT ?
+    """, (query, limit)).fetchall()
+
+def main():
+    output_file = sys.argv[1] if len(sys.argv) > 1 else '../data/catalog.sqlite'
+
+    print("🗄️ Building SQLite catalog...")
+    summary = build_catalog_sqlite(output_file=output_file)
+    print(f"✅ {output_file}: {summary['products']} products, {summary['categories']} categories, "
+          f"{summary['brands']} brands, {summary['product_categories']} category links")
+    print(f"   {summary['bytes'] / (1024 * 1024):.2f} MB in {summary['seconds']}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for bikestylish.ro, for benchmarking the scraper
+
+Serves a small synthetic shop on 127.0.0.1: a home page whose navigation
+links the categories, paginated category listings and product pages, with
+the markup the scraper's selectors expect. Each response can be delayed to
+simulate network latency, and every request is logged with its time so
+crawl speed and politeness (requests per second) can be measured without
+touching the real site. Pages carry ETag and Last-Modified validators and
+answer conditional requests with 304, and ``touch`` changes a product page,
+so incremental crawls can be measured too.
+"""
+
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+CATEGORY_NAMES = ["Biciclete", "Accesorii", "Biciclete copii", "Accesorii e-bike"]
+
+def _slug(text: str) -> str:
+    return text.lower().replace(' ', '-')
+
+class StandinSite:
+    """Synthetic shop served from a background thread.
+
+    Use as a context manager; ``base_url`` is set once the server listens.
+    """
+
+    def __init__(self, categories: int = 3, products_per_category: int = 20,
+                 per_page: int = 20, latency: float = 0.1, filler: int = 0):
+        self.category_names = CATEGORY_NAMES[:categories]
+        self.products_per_category = products_per_category
+        self.per_page = per_page
+        self.latency = latency
+        # Menu entries and related products around each product page, to give
+        # the pages the bulk of a real shop's markup
+        self.filler = filler
+        self.base_url: Optional[str] = None
+        self.requests: List[Tuple[float, str]] = []
+        self.bytes_sent = 0
+        self.started = time.time()
+        # Product slug -> (revision, modification time) of pages changed by touch()
+        self.revisions: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # Pages
+
+    def product_slugs(self, category: str) -> List[str]:
+        return [f"{_slug(category)}-model-{number:03d}" for number in range(1, self.products_per_category + 1)]
+
+    def home_page(self) -> str:
+        links = "".join(f'<a href="/categorii/{_slug(name)}">{name}</a>' for name in self.category_names)
+        return f"<html><body><nav>{links}</nav></body></html>"
+
+    def category_page(self, category: str, page: int) -> Optional[str]:
+        name = next((n for n in self.category_names if _slug(n) == category), None)
+        if name is None:
+            return None
+        slugs = self.product_slugs(name)[(page - 1) * self.per_page:page * self.per_page]
+        items = "".join(f'<div class="product-item"><a href="/produs/{slug}">{slug}</a></div>' for slug in slugs)
+        return f"<html><body><h1>{name}</h1><div class=\"products\">{items}</div></body></html>"
+
+    def page_chrome(self) -> Tuple[str, str]:
+        """Header and footer markup around product pages (empty without filler)."""
+        if not self.filler:
+            return "", ""
+        menu = "".join(
+            f'<li class="menu-entry"><a href="/pagina/{number}" title="Pagina {number}">'
+            f'<span class="icon icon-{number % 12}"></span>Pagina {number}</a></li>'
+            for number in range(self.filler))
+        related = "".join(
+            f'<div class="related-item"><a href="/pagina/{number}"><img src="/media/related-{number}.jpg" alt="">'
+            f'<span class="related-name">Produs similar {number}</span></a>'
+            f'<span class="related-price">{100 + number},00 lei</span></div>'
+            for number in range(self.filler))
+        header = (f'<script>window.dataLayer = window.dataLayer || []; var menu = {list(range(self.filler))};</script>'
+                  f'<style>.menu-entry {{ display: inline-block; }}</style>'
+                  f'<header><ul class="header-menu">{menu}</ul></header>')
+        footer = f'<section class="related-products">{related}</section><footer>{menu}</footer>'
+        return header, footer
+
+    def product_page(self, slug: str) -> Optional[str]:
+        for name in self.category_names:
+            if slug in self.product_slugs(name):
+                number = int(slug.rsplit('-', 1)[1])
+                title = f"{name} Model {number:03d} Cross"
+                price = 100 + number * 7 + self.revisions.get(slug, (0, 0))[0]
+                header, footer = self.page_chrome()
+                product = (
+                    "<div class=\"breadcrumbs\"><a href=\"/\">Acasa</a></div>"
+                    "<h1 class=\"product-title\">{0}</h1>"
+                    "<div class=\"price\">{1},00 lei</div>"
+                    "<div class=\"product-description\"><p>Descriere pentru {0}.</p>"
+                    "<ul><li>Material aluminiu</li><li>Greutate {2} g</li></ul></div>"
+                    "<div class=\"product-images\"><img src=\"/media/{3}-1.jpg\"><img src=\"/media/{3}-2.jpg\"></div>"
+                ).format(title, price, number * 10, slug)
+                return f"<html><head><title>{title}</title></head><body>{header}{product}{footer}</body></html>"
+        return None
+
+    def sitemap(self) -> str:
+        """Sitemap of every product page, with CDATA locations like the shop's."""
+        entries = "".join(
+            f"<url><loc><![CDATA[{self.base_url}/produs/{slug}]]></loc>"
+            f"<lastmod>{datetime.fromtimestamp(self.last_modified('/produs/' + slug), timezone.utc).isoformat()}</lastmod></url>"
+            for name in self.category_names for slug in self.product_slugs(name))
+        return f'<?xml version="1.0" encoding="UTF-8"?><urlset>{entries}</urlset>'
+
+    def render(self, path: str, query: Dict[str, List[str]]) -> Optional[str]:
+        """Page for a request path, or None for 404."""
+        if path in ('', '/'):
+            return self.home_page()
+        if path == '/sitemap.xml':
+            return self.sitemap()
+        if path.startswith('/categorii/'):
+            page = int(query.get('page', ['1'])[0])
+            return self.category_page(path[len('/categorii/'):], page)
+        if path.startswith('/produs/'):
+            return self.product_page(path[len('/produs/'):])
+        return None
+
+    def touch(self, slug: str):
+        """Change a product page (its price), as a catalog update would."""
+        revision = self.revisions.get(slug, (0, 0))[0] + 1
+        self.revisions[slug] = (revision, time.time())
+
+    def last_modified(self, path: str) -> float:
+        if path.startswith('/produs/'):
+            return self.revisions.get(path[len('/produs/'):], (0, self.started))[1]
+        if path == '/sitemap.xml':
+            return max([self.started] + [modified for _, modified in self.revisions.values()])
+        return self.started
+
+    # Server
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with site._lock:
+                    site.requests.append((time.monotonic(), self.path))
+                if site.latency:
+                    time.sleep(site.latency)
+                url = urlparse(self.path)
+                body = site.render(url.path, parse_qs(url.query))
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                etag = '"%s"' % hashlib.sha1(data).hexdigest()[:16]
+                modified = int(site.last_modified(url.path))
+                if self.not_modified(etag, modified):
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                content_type = 'application/xml' if url.path.endswith('.xml') else 'text/html'
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', formatdate(modified, usegmt=True))
+                self.end_headers()
+                self.wfile.write(data)
+                with site._lock:
+                    site.bytes_sent += len(data)
+
+            def not_modified(self, etag: str, modified: int) -> bool:
+                # If-None-Match takes precedence over If-Modified-Since
+                if_none_match = self.headers.get('If-None-Match')
+                if if_none_match is not None:
+                    return etag in [tag.strip() for tag in if_none_match.split(',')]
+                if_modified_since = self.headers.get('If-Modified-Since')
+                if if_modified_since:
+                    try:
+                        return parsedate_to_datetime(if_modified_since).timestamp() >= modified
+                    except (TypeError, ValueError):
+                        return False
+                return False
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'StandinSite':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def peak_rate(self, window: float = 1.0) -> int:
+        """Most requests received within any ``window`` seconds."""
+        times = sorted(t for t, _ in self.requests)
+        peak = start = 0
+        for end in range(len(times)):
+            while times[end] - times[start] >= window:
+                start += 1
+            peak = max(peak, end - start + 1)
+        return peak
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Shared text tokenizer for the BikeStylish scripts
+
+Turns product names, descriptions and queries into lowercase word tokens:
+HTML markup from the supplier descriptions is dropped, Romanian diacritics
+are folded (both the comma-below ``ș``/``ț`` and the older cedilla
+``ş``/``ţ`` forms), and Romanian and English stopwords are removed. Also
+provides the top-k selection used to pick the most frequent terms.
+"""
+
+import heapq
+import re
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Pattern, Tuple
+
+# One scan finds markup (tags and character entities in the supplier's HTML
+# descriptions, returned as '') and words of Latin letters in the lowercased
+# text; the minimum length is part of the pattern
+TOKEN_PATTERN = r'<[^>]*>|&#?\w+;|([a-zß-öø-ÿĀ-žșț]{%d,})'
+
+_token_patterns: Dict[int, Pattern] = {}
+
+# Folded form of every token seen, reset when it grows past this many entries
+FOLD_CACHE_SIZE = 100000
+_folded_tokens: Dict[str, str] = {}
+
+DIACRITICS_TABLE = str.maketrans('ăâîșşțţĂÂÎȘŞȚŢ', 'aaissttAAISSTT')
+
+# Stopwords, stored without diacritics (tokens are folded before the check)
+ROMANIAN_STOPWORDS = frozenset("""
+    acea aceasta aceea acel acest acesta aceste acestea acestei acestia acolo
+    acum ai aici al ale alt alta alte altul am ar are as asa asta astfel atat
+    atunci au avea avem aveti ca cand care cat cate catre ce cea cei cel cele
+    celor ceva chiar cine cu cum da daca dar de deci deja desi despre din dintr
+    dintre doar dupa ea ei el ele era este eu fara fi fie fiind foarte fost ii
+    il in inainte intr intre isi iti la le lor lui mai mult multe multi ne nici
+    nu o ori pana pe pentru peste poate pot prin sa sau se si sub sunt
+    tot toata toate toti tu un una unde unei unele unor unui va vor
+""".split())
+
+ENGLISH_STOPWORDS = frozenset("""
+    a about after all also an and any are as at be been but by can could did do
+    does for from had has have he her his how if in into is it its just may
+    more most no not of on only or other our out over she so some such than
+    that the their them then there these they this those through to too under
+    up very was we were what when where which while who will with would you
+    your
+""".split())
+
+STOPWORDS: FrozenSet[str] = ROMANIAN_STOPWORDS | ENGLISH_STOPWORDS
+
+def fold_diacritics(text: str) -> str:
+    """Replace Romanian letters with diacritics by their plain forms."""
+    return text.translate(DIACRITICS_TABLE)
+
+def tokenize(text: str, min_length: int = 3, stopwords: FrozenSet[str] = STOPWORDS,
+             fold: bool = True) -> List[str]:
+    """Lowercase word tokens of ``text``, in order, without markup and stopwords.
+
+    Tokens shorter than ``min_length`` are dropped. With ``fold`` the tokens
+    have their diacritics folded, so "frână" and "frana" are the same term.
+    """
+    if not text:
+        return []
+    pattern = _token_patterns.get(min_length)
+    if pattern is None:
+        pattern = _token_patterns[min_length] = re.compile(TOKEN_PATTERN % max(min_length, 1))
+    tokens = pattern.findall(text.lower())
+    if fold and not text.isascii():
+        # Folding token by token through a memo is much cheaper than
+        # translating the whole text, as the vocabulary is small
+        folded = _folded_tokens
+        if len(folded) > FOLD_CACHE_SIZE:
+            folded.clear()
+        tokens = [folded.get(token) or folded.setdefault(token, token.translate(DIACRITICS_TABLE))
+                  for token in tokens if token]
+    return [token for token in tokens if token and token not in stopwords]
+
+def top_k(counts: Mapping[str, int], k: int, min_count: int = 1) -> List[Tuple[str, int]]:
+    """The ``k`` most frequent (term, count) pairs, most frequent first.
+
+    Uses a bounded heap instead of sorting every term; terms with equal
+    counts keep the mapping's order (first seen first for a Counter).
+    """
+    candidates: Iterable[Tuple[str, int]] = counts.items()
+    if min_count > 1:
+        candidates = (item for item in candidates if item[1] >= min_count)
+    return heapq.nlargest(k, candidates, key=lambda item: item[1])
@@ -5,30 +5,95 @@ Generate category-specific FAQs and real price ranges from product catalog
 
 import json
 import re
+import sys
+import time
 import pandas as pd
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Tuple
 
+from catalog import Product, extract_brand, extract_price
+from category_matching import (CategoryTermIndex, build_category_index, find_product_categories,
+                               find_product_categories_linear)
+from feed_cache import load_feed
+from text_tokens import STOPWORDS, tokenize, top_k
+
+# Feed column -> Product field, for the text fields taken from the XLS
+PRODUCT_TEXT_COLUMNS = {
+    'name': 'nume_produs',
+    'description': 'descriere',
+    'brand': 'producator',
+    'category': 'nume_categorie'
+}
+
+PRODUCT_PRICE_COLUMN = 'pret_sugerat'
+
+def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Stripped text of a feed column; missing columns and cells become ''."""
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[column].astype(object).where(df[column].notna(), '').astype(str).str.strip()
+
+def products_from_frame(df: pd.DataFrame) -> List[Product]:
+    """Build Product records from the feed with whole-column operations.
+    
+    Text is stripped and prices are coerced column by column; the records
+    are then created in a single pass over the cleaned columns.
+    """
+    columns = {field: _text_column(df, column).tolist() for field, column in PRODUCT_TEXT_COLUMNS.items()}
+    if PRODUCT_PRICE_COLUMN in df.columns:
+        prices = pd.to_numeric(df[PRODUCT_PRICE_COLUMN], errors='coerce').fillna(0.0).astype(float).tolist()
+    else:
+        prices = [0.0] * len(df)
+    
+    return [
+        Product(name=name, description=description, price=price, brand=brand, category=category)
+        for name, description, price, brand, category in zip(
+            columns['name'], columns['description'], prices, columns['brand'], columns['category'])
+    ]
+
+def products_from_frame_iterrows(df: pd.DataFrame) -> List[Product]:
+    """Row-by-row reference for products_from_frame, kept to validate and benchmark it.
+    
+    This is the original loader body: missing text cells come out as 'nan',
+    where products_from_frame gives ''.
+    """
+    products = []
+    for _, row in df.iterrows():
+        product = {
+            'name': str(row.get('nume_produs', '')).strip(),
+            'description': str(row.get('descriere', '')).strip(),
+            'price': float(row.get('pret_sugerat', 0)) if pd.notna(row.get('pret_sugerat')) else 0.0,
+            'brand': str(row.get('producator', '')).strip(),
+            'category': str(row.get('nume_categorie', '')).strip()
+        }
+        products.append(Product(**product))
+    return products
+
+def compare_with_reference(vectorized: List[Product], reference: List[Product]) -> Tuple[int, int]:
+    """Count differing fields: (missing cells now '' instead of 'nan', any other difference)."""
+    nan_fields = other_fields = 0
+    for new, old in zip(vectorized, reference):
+        new, old = new.to_dict(), old.to_dict()
+        for field in new.keys() | old.keys():
+            if new.get(field) == old.get(field):
+                continue
+            if new.get(field) == '' and old.get(field) == 'nan':
+                nan_fields += 1
+            else:
+                other_fields += 1
+    return nan_fields, other_fields
+
 def load_product_data():
     """Load product data from Excel file"""
     
     print("📦 Loading product catalog...")
     
     try:
-        # Load the Excel file
-        df = pd.read_excel('../sxt26.xls')
-        
-        # Convert to list of dictionaries
-        products = []
-        for _, row in df.iterrows():
-            product = {
-                'name': str(row.get('nume_produs', '')).strip(),
-                'description': str(row.get('descriere', '')).strip(),
-                'price': float(row.get('pret_sugerat', 0)) if pd.notna(row.get('pret_sugerat')) else 0.0,
-                'brand': str(row.get('producator', '')).strip(),
-                'category': str(row.get('nume_categorie', '')).strip()
-            }
-            products.append(product)
+        # Load the Excel file (parsed once, then read from the columnar cache)
+        df = load_feed('../sxt26.xls')
+        products = products_from_frame(df)
         
         print(f"📦 Loaded {len(products)} products from Excel file")
         return products
@@ -37,230 +102,240 @@ def load_product_data():
         print(f"❌ Error loading products: {e}")
         return []
 
-def analyze_products_by_category(products: List[Dict]) -> Dict:
-    """Analyze products and group by categories with real data"""
+def benchmark_product_loading(sizes: Tuple[int, ...] = (5000, 50000, 500000)) -> List[Dict]:
+    """Compare iterrows with the column-wise loader on feeds of growing size.
     
-    print("🔍 Analyzing products by category...")
-    
-    category_data = defaultdict(lambda: {
-        'products': [],
-        'price_range': {'min': float('inf'), 'max': 0, 'avg': 0},
-        'brands': set(),
-        'common_terms': [],
-        'product_count': 0
-    })
+    The real feed is repeated until it has the requested number of rows,
+    so the text and price distributions match production.
+    """
+    feed = load_feed('../sxt26.xls')
+    results = []
     
-    # Load category mappings
-    try:
-        with open('../data/categories_ai_enhanced.json', 'r', encoding='utf-8') as f:
-            categories_data = json.load(f)
+    for size in sizes:
+        repeats = -(-size // len(feed))
+        df = pd.concat([feed] * repeats, ignore_index=True).iloc[:size]
         
-        categories = categories_data.get('categories', [])
-        category_lookup = {cat['id']: cat for cat in categories}
+        start = time.perf_counter()
+        vectorized = products_from_frame(df)
+        vectorized_time = time.perf_counter() - start
         
-    except Exception as e:
-        print(f"❌ Error loading categories: {e}")
-        return {}
+        start = time.perf_counter()
+        reference = products_from_frame_iterrows(df)
+        iterrows_time = time.perf_counter() - start
+        
+        # The only intended difference: missing cells are '' instead of 'nan'
+        nan_fields, other_fields = compare_with_reference(vectorized, reference)
+        results.append({
+            'rows': size,
+            'iterrows_s': iterrows_time,
+            'vectorized_s': vectorized_time,
+            'nan_fields': nan_fields,
+            'identical': other_fields == 0
+        })
+        print(f"⏱️ {size:>7,} rows: iterrows {iterrows_time:.3f}s ({iterrows_time / size * 1e6:.1f} µs/row), "
+              f"vectorized {vectorized_time:.3f}s ({vectorized_time / size * 1e6:.1f} µs/row), "
+              f"{iterrows_time / vectorized_time:.1f}x {'✅' if other_fields == 0 else '❌'} "
+              f"({nan_fields} missing cells '' instead of 'nan'"
+              f"{f', {other_fields} other differences' if other_fields else ''})")
+    
+    return results
+
+class CategoryStats:
+    """Running statistics of the products matched to one category.
+    
+    Keeps counts, price min/max/sum, the brands seen (in first-seen order)
+    and a term counter instead of the products themselves, so memory grows
+    with the number of categories and distinct terms, not with the catalog.
+    Partial statistics from product chunks combine with ``merge``.
+    """
+    
+    __slots__ = ('product_count', 'price_min', 'price_max', 'price_sum', 'priced_count',
+                 'brands', 'term_counts')
+    
+    def __init__(self):
+        self.product_count = 0
+        self.price_min = float('inf')
+        self.price_max = 0
+        self.price_sum = 0
+        self.priced_count = 0
+        self.brands = {}
+        self.term_counts = Counter()
+    
+    def add(self, price: float, brand: str, terms: List[str]):
+        self.product_count += 1
+        if price > 0:
+            self.price_min = min(self.price_min, price)
+            self.price_max = max(self.price_max, price)
+            self.price_sum += price
+            self.priced_count += 1
+        if brand:
+            self.brands.setdefault(brand, None)
+        self.term_counts.update(terms)
+    
+    def merge(self, other: 'CategoryStats'):
+        """Add the statistics of a later chunk of products."""
+        self.product_count += other.product_count
+        self.price_min = min(self.price_min, other.price_min)
+        self.price_max = max(self.price_max, other.price_max)
+        self.price_sum += other.price_sum
+        self.priced_count += other.priced_count
+        for brand in other.brands:
+            self.brands.setdefault(brand, None)
+        self.term_counts.update(other.term_counts)
+    
+    def summary(self) -> Dict:
+        """The category's real data: price range, brands, common terms, product count."""
+        return {
+            'price_range': {
+                'min': self.price_min if self.priced_count else 0,
+                'max': self.price_max,
+                'avg': self.price_sum / self.priced_count if self.priced_count else 0
+            },
+            'brands': list(self.brands),
+            'common_terms': top_terms(self.term_counts),
+            'product_count': self.product_count
+        }
+
+def analyze_product_chunk(products: List[Dict], category_lookup: Dict) -> Dict[str, CategoryStats]:
+    """Category statistics for one chunk of products, keyed in first-match order."""
+    category_index = build_category_index(category_lookup)
+    stats = {}
     
-    # Process each product
     for product in products:
         # Try to match product to category based on various fields
-        matched_categories = find_product_categories(product, category_lookup)
+        matched_categories = find_product_categories(product, category_lookup, category_index)
+        if not matched_categories:
+            continue
         
         price = extract_price(product)
         brand = extract_brand(product)
+        terms = product_terms(product)
         
         for cat_id in matched_categories:
             if cat_id in category_lookup:  # Check if cat_id exists in lookup
-                cat_data = category_data[cat_id]
-                cat_data['products'].append(product)
-                cat_data['product_count'] += 1
-                
-                # Update price range
-                if price > 0:
-                    cat_data['price_range']['min'] = min(cat_data['price_range']['min'], price)
-                    cat_data['price_range']['max'] = max(cat_data['price_range']['max'], price)
-                
-                # Add brand
-                if brand:
-                    cat_data['brands'].add(brand)
-    
-    # Calculate averages and clean up data
-    for cat_id, data in category_data.items():
-        if data['product_count'] > 0:
-            prices = [extract_price(p) for p in data['products'] if extract_price(p) > 0]
-            if prices:
-                data['price_range']['avg'] = sum(prices) / len(prices)
-            
-            if data['price_range']['min'] == float('inf'):
-                data['price_range']['min'] = 0
-            
-            # Convert brands set to list
-            data['brands'] = list(data['brands'])
-            
-            # Extract common terms
-            data['common_terms'] = extract_common_terms(data['products'])
+                cat_stats = stats.get(cat_id)
+                if cat_stats is None:
+                    cat_stats = stats[cat_id] = CategoryStats()
+                cat_stats.add(price, brand, terms)
     
-    print(f"✅ Analyzed products for {len(category_data)} categories")
-    return dict(category_data)
+    return stats
 
-def find_product_categories(product: Dict, category_lookup: Dict) -> List[str]:
-    """Find which categories a product belongs to - FIXED VERSION"""
+def analyze_products_by_category(products: List[Dict], workers: int = 1) -> Dict:
+    """Analyze products and group by categories with real data
     
-    product_name = product.get('name', '').lower()
-    product_desc = product.get('description', '').lower()
-    product_cat = product.get('category', '').lower()
+    With ``workers`` > 1 the products are split into chunks analyzed in a
+    process pool and the partial statistics are merged in chunk order, which
+    gives the same counts, ranges, brands and terms as a single pass (the
+    average can differ in the last digit, as the price sums are added in a
+    different grouping).
+    """
     
-    matched_categories = []
+    print("🔍 Analyzing products by category...")
     
-    # Try direct category matching
-    for cat_id, cat_info in category_lookup.items():
-        cat_name = cat_info['name'].lower()
-        cat_terms = cat_id.replace('-', ' ').split()
+    # Load category mappings
+    try:
+        with open('../data/categories_ai_enhanced.json', 'r', encoding='utf-8') as f:
+            categories_data = json.load(f)
         
-        # Check if any category terms appear in product data
-        found_match = False
-        for term in cat_terms:
-            if len(term) > 2:  # Ignore very short terms
-                if (term in product_name or 
-                    term in product_desc or 
-                    term in product_cat):
-                    matched_categories.append(cat_id)
-                    found_match = True
-                    break
+        categories = categories_data.get('categories', [])
+        category_lookup = {cat['id']: cat for cat in categories}
         
-        if found_match:
-            continue
-            
-        # Also check if category name appears in product
-        for term in cat_name.split():
-            if len(term) > 2 and term in product_name:
-                matched_categories.append(cat_id)
-                break
-    
-    # Remove duplicates while preserving order
-    matched_categories = list(dict.fromkeys(matched_categories))
-    
-    # If no direct match, try to infer from product type
-    if not matched_categories:
-        matched_categories = infer_category_from_product(product, category_lookup)
-    
-    return matched_categories
-
-def infer_category_from_product(product: Dict, category_lookup: Dict) -> List[str]:
-    """Infer category from product characteristics - ENHANCED VERSION"""
-    
-    product_name = product.get('name', '').lower()
-    product_desc = product.get('description', '').lower()
-    combined_text = f"{product_name} {product_desc}"
-    
-    matched_categories = []
-    
-    # Enhanced inference rules
-    inference_rules = {
-        'lumini': ['lumina', 'led', 'far', 'stop', 'light', 'lamp', 'lanterna', 'flash'],
-        'reflectorizante': ['reflector', 'reflect', 'visibility', 'reflectorizant', 'stegulet', 'reflectors'],
-        'antifurt': ['antifurt', 'lock', 'security', 'lacăt', 'blocare'],
-        'pompe': ['pompă', 'pump', 'inflate', 'umflare', 'presiune'],
-        'casti': ['casca', 'helmet', 'cască', 'cap', 'protecție'],
-        'manusi': ['mănuși', 'gloves', 'mâini', 'grip'],
-        'tricouri': ['tricou', 'jersey', 'shirt', 'îmbrăcăminte'],
-        'pantaloni': ['pantaloni', 'shorts', 'bibshort', 'colant'],
-        'anvelope': ['anvelopă', 'tire', 'cauciuc', 'roată'],
-        'camere': ['cameră', 'tube', 'inner', 'valvă'],
-        'pedale': ['pedală', 'pedal', 'click', 'platformă'],
-        'șei': ['șa', 'saddle', 'seat', 'scaun'],
-        'ghidoane': ['ghidon', 'handlebar', 'bar', 'directionare'],
-        'frane': ['frână', 'brake', 'disc', 'plăcuță', 'saboti'],
-        'schimbatoare': ['schimbător', 'derailleur', 'viteze', 'transmisie'],
-        'lanturi': ['lanț', 'chain', 'transmisie', 'angrenaj'],
-        'roti': ['roată', 'wheel', 'butuc', 'jantă'],
-        'scule': ['cheie', 'tool', 'reparare', 'demontare', 'service'],
-        'cosuri': ['coș', 'basket', 'transport', 'încărcătură'],
-        'aparatori': ['apărător', 'mudguard', 'noroi', 'protecție'],
-        'suporturi': ['suport', 'support', 'holder', 'mount']
-    }
-    
-    # Find matching categories based on inference
-    for pattern, keywords in inference_rules.items():
-        for keyword in keywords:
-            if keyword in combined_text:
-                # Find categories that match this pattern
-                for cat_id in category_lookup:
-                    if pattern in cat_id or any(pattern in term for term in cat_id.split('-')):
-                        matched_categories.append(cat_id)
-                break
-    
-    # Special handling for specific product types
-    if 'copii' in combined_text or 'child' in combined_text:
-        for cat_id in category_lookup:
-            if 'copii' in cat_id:
-                matched_categories.append(cat_id)
-    
-    if 'e-bike' in combined_text or 'electric' in combined_text:
-        for cat_id in category_lookup:
-            if 'e-bike' in cat_id:
-                matched_categories.append(cat_id)
-    
-    # Remove duplicates
-    return list(dict.fromkeys(matched_categories))
-
-def extract_price(product: Dict) -> float:
-    """Extract price from product data"""
-    
-    # Try different price fields
-    price_fields = ['price', 'pret_sugerat', 'pret_produs', 'pret']
-    
-    for field in price_fields:
-        if field in product:
-            try:
-                price = float(product[field])
-                if price > 0:
-                    return price
-            except (ValueError, TypeError):
-                continue
-    
-    return 0.0
-
-def extract_brand(product: Dict) -> str:
-    """Extract brand from product data"""
+    except Exception as e:
+        print(f"❌ Error loading categories: {e}")
+        return {}
     
-    brand_fields = ['brand', 'marca', 'producator', 'manufacturer']
+    # Process the products, in parallel chunks when asked to
+    if workers > 1 and len(products) > workers:
+        chunk_size = -(-len(products) // (workers * 4))
+        chunks = [products[i:i + chunk_size] for i in range(0, len(products), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(analyze_product_chunk, chunks, repeat(category_lookup)))
+    else:
+        partials = [analyze_product_chunk(products, category_lookup)]
     
-    for field in brand_fields:
-        if field in product and product[field]:
-            return str(product[field]).strip()
+    category_stats = {}
+    for partial in partials:
+        for cat_id, stats in partial.items():
+            if cat_id in category_stats:
+                category_stats[cat_id].merge(stats)
+            else:
+                category_stats[cat_id] = stats
     
-    return ""
+    category_data = {cat_id: stats.summary() for cat_id, stats in category_stats.items()}
+    print(f"✅ Analyzed products for {len(category_data)} categories")
+    return category_data
+
+# Words too generic to describe a category, on top of the RO/EN stopwords
+COMMON_TERM_STOPWORDS = STOPWORDS | frozenset(['bicicleta', 'bike', 'ciclism', 'cycling'])
+
+def product_terms(product: Dict) -> List[str]:
+    """Candidate terms (3+ letters, diacritics folded) of a product's name and description."""
+    name = product.get('name', '')
+    desc = product.get('description', '')
+    return tokenize(f"{name} {desc}", stopwords=COMMON_TERM_STOPWORDS)
+
+def top_terms(term_counts: Counter, limit: int = 10) -> List[str]:
+    """The most frequent terms (ties in first-seen order), seen at least twice."""
+    return [term for term, _ in top_k(term_counts, limit, min_count=2)]
 
 def extract_common_terms(products: List[Dict]) -> List[str]:
     """Extract common terms from products in category"""
     
-    term_counts = defaultdict(int)
+    term_counts = Counter()
+    for product in products:
+        term_counts.update(product_terms(product))
     
+    # Return most common terms
+    return top_terms(term_counts)
+
+def extract_common_terms_sorted(products: List[Dict]) -> List[str]:
+    """Previous per-call regex and full-sort implementation, kept to benchmark extract_common_terms."""
+    term_counts = defaultdict(int)
     for product in products:
-        name = product.get('name', '')
-        desc = product.get('description', '')
-        
-        # Extract meaningful terms
-        words = re.findall(r'\b[a-zA-ZăâîșțĂÂÎȘȚ]{3,}\b', f"{name} {desc}")
-        
+        words = re.findall(r'\b[a-zA-ZăâîșțĂÂÎȘȚ]{3,}\b', f"{product.get('name', '')} {product.get('description', '')}")
         for word in words:
             word_lower = word.lower()
             if word_lower not in ['pentru', 'bicicleta', 'bike', 'ciclism', 'cycling']:
                 term_counts[word_lower] += 1
-    
-    # Return most common terms
     sorted_terms = sorted(term_counts.items(), key=lambda x: x[1], reverse=True)
     return [term for term, count in sorted_terms[:10] if count >= 2]
 
+def benchmark_common_terms(categories_file: str = '../data/categories_ai_enhanced.json',
+                           rounds: int = 3) -> Dict:
+    """Time common-term extraction for every category with the old and new code."""
+    with open(categories_file, 'r', encoding='utf-8') as f:
+        category_lookup = {cat['id']: cat for cat in json.load(f).get('categories', [])}
+    products = load_product_data()
+    
+    category_index = build_category_index(category_lookup)
+    groups = defaultdict(list)
+    for product in products:
+        for cat_id in find_product_categories(product, category_lookup, category_index):
+            groups[cat_id].append(product)
+    
+    timings = {}
+    results = {}
+    for label, extract in (('sorted', extract_common_terms_sorted), ('heap', extract_common_terms)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            results[label] = {cat_id: extract(group) for cat_id, group in groups.items()}
+        timings[label] = (time.perf_counter() - start) / rounds
+    
+    changed = sum(1 for cat_id in groups if results['sorted'][cat_id] != results['heap'][cat_id])
+    print(f"📊 {len(groups)} categories, {sum(map(len, groups.values()))} product-category pairs")
+    print(f"⏱️ Regex + full sort: {timings['sorted']:.3f}s")
+    print(f"⏱️ Tokenizer + heap:  {timings['heap']:.3f}s ({timings['sorted'] / timings['heap']:.1f}x)")
+    print(f"📝 Term lists changed by stopwords, markup and folding: {changed}/{len(groups)}")
+    
+    return {'categories': len(groups), 'sorted_s': timings['sorted'], 'heap_s': timings['heap'], 'changed': changed}
+
 def generate_category_specific_faqs(cat_id: str, cat_info: Dict, product_data: Dict) -> List[Dict]:
     """Generate category-specific FAQ questions"""
     
     cat_name = cat_info['name']
     cat_type = cat_info['type']
     
-    products = product_data.get('products', [])
+    product_count = product_data.get('product_count', 0)
     price_range = product_data.get('price_range', {})
     brands = product_data.get('brands', [])
     common_terms = product_data.get('common_terms', [])
@@ -274,7 +349,7 @@ def generate_category_specific_faqs(cat_id: str, cat_info: Dict, product_data: D
     
     # Question 2: Price and value question
     if price_range.get('min', 0) > 0:
-        price_question = generate_price_faq(cat_name, price_range, len(products))
+        price_question = generate_price_faq(cat_name, price_range, product_count)
         faqs.append(price_question)
     
     # Question 3: Brand and compatibility question
@@ -436,7 +511,42 @@ def generate_usage_faq(cat_name: str, cat_type: str) -> Dict:
     
     return usage_faqs.get(cat_type, default_faq)
 
-def update_categories_with_real_data():
+def benchmark_category_matching(categories_file: str = '../data/categories_ai_enhanced.json') -> Dict:
+    """Compare the category-by-category matcher with the term index on the feed."""
+    with open(categories_file, 'r', encoding='utf-8') as f:
+        category_lookup = {cat['id']: cat for cat in json.load(f).get('categories', [])}
+    products = load_product_data()
+    
+    start = time.perf_counter()
+    index = CategoryTermIndex(category_lookup)
+    build_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    indexed = [find_product_categories(product, category_lookup, index) for product in products]
+    indexed_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    linear = [find_product_categories_linear(product, category_lookup) for product in products]
+    linear_time = time.perf_counter() - start
+    
+    identical = indexed == linear
+    print(f"📊 {len(products)} products × {len(category_lookup)} categories "
+          f"({len(index.id_terms)} id terms, {len(index.name_terms)} name terms)")
+    print(f"⏱️ Index build: {build_time * 1000:.1f} ms")
+    print(f"⏱️ Indexed match: {indexed_time:.3f}s ({indexed_time / len(products) * 1e6:.0f} µs/product)")
+    print(f"⏱️ Linear match: {linear_time:.3f}s ({linear_time / len(products) * 1e6:.0f} µs/product)")
+    print(f"🚀 Speedup: {linear_time / (build_time + indexed_time):.1f}x")
+    print(f"{'✅' if identical else '❌'} Results identical for all {len(products)} products")
+    
+    return {
+        'products': len(products),
+        'index_build_s': build_time,
+        'indexed_match_s': indexed_time,
+        'linear_match_s': linear_time,
+        'identical': identical
+    }
+
+def update_categories_with_real_data(workers: int = 1):
     """Update all categories with real product data and specific FAQs"""
     
     print("🚀 Starting category update with real product data...")
@@ -448,7 +558,7 @@ def update_categories_with_real_data():
         return
     
     # Analyze products by category
-    category_product_data = analyze_products_by_category(products)
+    category_product_data = analyze_products_by_category(products, workers)
     
     # Load enhanced categories
     try:
@@ -643,4 +753,13 @@ Generated by Real Data Integration Engine
     print(f"📦 {total_products_mapped:,} products mapped to categories")
 
 if __name__ == "__main__":
-    update_categories_with_real_data()
+    if "--benchmark" in sys.argv:
+        benchmark_product_loading()
+    elif "--benchmark-matching" in sys.argv:
+        benchmark_category_matching()
+    elif "--benchmark-terms" in sys.argv:
+        benchmark_common_terms()
+    else:
+        # python update_categories_real_data.py [--workers N]
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv[:-1] else 1
+        update_categories_with_real_data(workers)
@@ -1,14 +1,83 @@
 import json
 import os
-import math
+import glob
 
-def split_categories_json_file(input_file, max_size_mb=1):
+from compress_artifacts import available_encodings, compress_files, describe_artifacts, remove_with_artifacts, \
+    total_compressed_bytes
+
+# Marcaj înlocuit cu lista de categorii serializată
+ITEMS_MARKER = "\u0000categories\u0000"
+
+def serialize_item(item, indent):
+    """Serializează o categorie exact cum apare în lista din fișierul part."""
+    text = json.dumps(item, ensure_ascii=False, indent=2)
+    return indent + text.replace("\n", "\n" + indent)
+
+def render_envelope(envelope, items_text, item_indent):
+    """
+    Înlocuiește marcajul din plic cu lista de categorii deja serializată.
+    
+    Rezultatul este identic cu json.dump(..., indent=2) pe obiectul complet
+    (lista de categorii este întotdeauna nevidă).
+    """
+    envelope_text = json.dumps(envelope, ensure_ascii=False, indent=2)
+    items_list = "[\n" + items_text + "\n" + item_indent[:-2] + "]"
+    return envelope_text.replace(json.dumps(ITEMS_MARKER), items_list, 1)
+
+def envelope_overhead_bytes(envelope, item_indent):
+    """Dimensiunea plicului unui fișier part, fără categorii."""
+    return len(render_envelope(envelope, "", item_indent).encode('utf-8'))
+
+def build_chunk_envelope(full_data, categories_key, part_number, total_parts, start_idx, end_idx, total_items):
+    """Structura JSON a unui fișier part, cu marcajul în locul listei de categorii."""
+    chunk_json = {
+        "last_updated": full_data.get("last_updated", ""),
+        "total_categories": end_idx - start_idx,
+        "source": full_data.get("source", ""),
+        "part_info": {
+            "part_number": part_number,
+            "total_parts": total_parts,
+            "categories_range": f"{start_idx + 1}-{end_idx}",
+            "original_total": total_items
+        }
+    }
+    
+    # Adaugă categoriile în structura corespunzătoare
+    if categories_key == 'categories':
+        chunk_json['categories'] = ITEMS_MARKER
+    elif categories_key == 'main_categories':
+        chunk_json['hierarchy'] = {
+            'main_categories': ITEMS_MARKER
+        }
+        # Subcategoriile sunt comune, deci apar doar în primul fișier
+        if part_number == 1 and 'subcategories' in full_data.get('hierarchy', {}):
+            chunk_json['hierarchy']['subcategories'] = full_data['hierarchy']['subcategories']
+    
+    # Secțiunile comune (brands, statistics, metadata) apar doar în primul fișier
+    if part_number == 1:
+        for key in ['brands', 'statistics', 'metadata']:
+            if key in full_data:
+                chunk_json[key] = full_data[key]
+    
+    return chunk_json
+
+def split_categories_json_file(input_file, max_size_mb=1, compress=True):
     """
     Împarte un fișier JSON cu categorii mare în mai multe fișiere mai mici.
     
+    Fiecare categorie este serializată o dată și măsurată în bytes, apoi
+    fișierele sunt umplute în ordine până la buget, așa că se obține numărul
+    minim de fișiere (deci de request-uri) fără ca vreunul să depășească
+    `max_size_mb`. Secțiunile comune apar doar în primul fișier.
+    
+    Cu `compress`, fiecare fișier primește variante `.json.gz` (și `.json.br`
+    dacă brotli este instalat), create în paralel; dimensiunile lor sunt
+    trecute în split_info.txt.
+    
     Args:
         input_file (str): Calea către fișierul JSON de intrare
         max_size_mb (float): Dimensiunea maximă pentru fiecare fișier în MB
+        compress (bool): Creează variantele comprimate ale fișierelor
     """
     print(f"Încărcare fișier: {input_file}")
     
@@ -44,82 +113,96 @@ def split_categories_json_file(input_file, max_size_mb=1):
     total_items = len(categories_data)
     print(f"Total categorii: {total_items}")
     
-    # Calculează dimensiunea aproximativă per element
     file_size_bytes = os.path.getsize(input_file)
     file_size_mb = file_size_bytes / (1024 * 1024)
-    avg_item_size_bytes = file_size_bytes / total_items
+    max_size_bytes = int(max_size_mb * 1024 * 1024)
     
     print(f"Dimensiunea fișierului original: {file_size_mb:.2f} MB")
-    print(f"Dimensiunea medie per categorie: {avg_item_size_bytes:.2f} bytes")
-    
-    # Calculează câte elemente pe fișier
-    max_size_bytes = max_size_mb * 1024 * 1024
-    items_per_file = max(1, int(max_size_bytes / avg_item_size_bytes))
-    
-    # Pentru siguranță, folosește o fracțiune mai mică pentru a evita depășirea
-    items_per_file = max(1, int(items_per_file * 0.4))  # Folosește 40% din estimare
-    
-    print(f"Categorii per fișier: {items_per_file}")
-    
-    # Calculează numărul de fișiere necesare
-    num_files = math.ceil(total_items / items_per_file)
-    print(f"Numărul estimat de fișiere: {num_files}")
+    print(f"Buget per fișier: {max_size_bytes} bytes")
+    
+    # Categoriile sunt în "categories" (adâncime 1) sau în
+    # "hierarchy.main_categories" (adâncime 2)
+    item_indent = "    " if categories_key == 'categories' else "      "
+    
+    # Serializează fiecare categorie o singură dată și măsoară-i dimensiunea reală
+    item_texts = [serialize_item(item, item_indent) for item in categories_data]
+    item_sizes = [len(text.encode('utf-8')) for text in item_texts]
+    
+    # Secțiunile comune sunt scrise doar în primul fișier (folosit ca bază la reunire)
+    def make_envelope(part_number, total_parts, start_idx, end_idx):
+        return build_chunk_envelope(full_data, categories_key, part_number, total_parts,
+                                    start_idx, end_idx, total_items)
+    
+    overhead_first = envelope_overhead_bytes(make_envelope(1, 99999, 999998, 999999), item_indent)
+    overhead_other = envelope_overhead_bytes(make_envelope(99999, 99999, 999998, 999999), item_indent)
+    
+    # Umple fiecare fișier până la buget, păstrând ordinea categoriilor
+    ranges = []
+    start_idx = 0
+    current_bytes = 0
+    for idx, size in enumerate(item_sizes):
+        overhead = overhead_first if not ranges else overhead_other
+        separator = 2 if idx > start_idx else 0  # ",\n"
+        if idx > start_idx and overhead + current_bytes + separator + size > max_size_bytes:
+            ranges.append((start_idx, idx))
+            start_idx = idx
+            current_bytes = 0
+            separator = 0
+            overhead = overhead_other
+        if idx == start_idx and overhead + size > max_size_bytes:
+            print(f"Atenție: categoria {idx + 1} singură depășește bugetul ({size} bytes)")
+        current_bytes += separator + size
+    if total_items:
+        ranges.append((start_idx, total_items))
+    
+    num_files = len(ranges)
+    print(f"Numărul de fișiere: {num_files}")
     
     # Creează directorul pentru fișierele împărțite
     base_name = os.path.splitext(os.path.basename(input_file))[0]
     output_dir = os.path.join(os.path.dirname(input_file), f"{base_name}_split")
     os.makedirs(output_dir, exist_ok=True)
     
-    # Împarte datele și salvează fișierele
-    for i in range(num_files):
-        start_idx = i * items_per_file
-        end_idx = min((i + 1) * items_per_file, total_items)
-        
-        chunk_data = categories_data[start_idx:end_idx]
-        
-        # Creează structura JSON pentru chunk-ul curent
-        chunk_json = {
-            "last_updated": full_data.get("last_updated", ""),
-            "total_categories": len(chunk_data),
-            "source": full_data.get("source", ""),
-            "part_info": {
-                "part_number": i + 1,
-                "total_parts": num_files,
-                "categories_range": f"{start_idx + 1}-{end_idx}",
-                "original_total": total_items
-            }
-        }
-        
-        # Adaugă categoriile în structura corespunzătoare
-        if categories_key == 'categories':
-            chunk_json['categories'] = chunk_data
-        elif categories_key == 'main_categories':
-            chunk_json['hierarchy'] = {
-                'main_categories': chunk_data
-            }
-            # Adaugă și alte secțiuni din hierarchy dacă există
-            if 'subcategories' in full_data.get('hierarchy', {}):
-                chunk_json['hierarchy']['subcategories'] = full_data['hierarchy']['subcategories']
-        
-        # Adaugă și alte secțiuni importante din fișierul original (dar mai mici)
-        for key in ['brands', 'statistics', 'metadata']:
-            if key in full_data:
-                chunk_json[key] = full_data[key]
+    # Salvează fișierele
+    written = []
+    for i, (start_idx, end_idx) in enumerate(ranges):
+        envelope = make_envelope(i + 1, num_files, start_idx, end_idx)
+        content = render_envelope(envelope, ",\n".join(item_texts[start_idx:end_idx]), item_indent)
         
         # Nume fișier cu zero padding pentru sortare corectă
         output_file = os.path.join(output_dir, f"{base_name}_part_{i+1:02d}.json")
         
         # Salvează chunk-ul
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(chunk_json, f, ensure_ascii=False, indent=2)
+            f.write(content)
         
         # Verifică dimensiunea fișierului creat
         chunk_size_bytes = os.path.getsize(output_file)
-        chunk_size_mb = chunk_size_bytes / (1024 * 1024)
+        written.append((os.path.basename(output_file), start_idx, end_idx, chunk_size_bytes))
         
-        print(f"Fișier {i+1}/{num_files}: {os.path.basename(output_file)} - {len(chunk_data)} categorii - {chunk_size_mb:.2f} MB")
+        print(f"Fișier {i+1}/{num_files}: {os.path.basename(output_file)} - {end_idx - start_idx} categorii - "
+              f"{chunk_size_bytes / (1024 * 1024):.2f} MB ({chunk_size_bytes / max_size_bytes * 100:.1f}% din buget)")
+    
+    # Elimină fișierele part rămase de la o împărțire anterioară cu mai multe părți
+    written_names = {name for name, _, _, _ in written}
+    for stale_file in glob.glob(os.path.join(output_dir, f"{base_name}_part_*.json")):
+        if os.path.basename(stale_file) not in written_names:
+            remove_with_artifacts(stale_file)
+            print(f"Șters fișier vechi: {os.path.basename(stale_file)}")
+    
+    compressed = {}
+    if compress:
+        print(f"Comprimare fișiere ({', '.join(available_encodings())})...")
+        compressed = compress_files(os.path.join(output_dir, name) for name, _, _, _ in written)
+        compressed = {os.path.basename(path): artifacts for path, artifacts in compressed.items()}
+    
+    total_written = sum(size for _, _, _, size in written)
+    fill_ratio = total_written / (num_files * max_size_bytes) if num_files else 0.0
     
     print(f"\nÎmpărțirea completă! Fișierele au fost salvate în: {output_dir}")
+    print(f"Grad de umplere: {fill_ratio * 100:.1f}% ({total_written} bytes în {num_files} fișiere)")
+    for encoding, size in total_compressed_bytes(compressed.values()).items():
+        print(f"Total {encoding}: {size} bytes ({size / total_written * 100:.1f}%)")
     
     # Crează un fișier de informații
     info_file = os.path.join(output_dir, "split_info.txt")
@@ -128,15 +211,17 @@ def split_categories_json_file(input_file, max_size_mb=1):
         f.write(f"Data împărțirii: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"Fișier original: {file_size_mb:.2f} MB, {total_items} categorii\n")
         f.write(f"Numărul de fișiere create: {num_files}\n")
-        f.write(f"Categorii per fișier: {items_per_file}\n")
-        f.write(f"Dimensiunea țintă per fișier: {max_size_mb} MB\n")
-        f.write(f"Secțiunea folosită: {categories_key}\n\n")
+        f.write(f"Dimensiunea țintă per fișier: {max_size_mb} MB ({max_size_bytes} bytes)\n")
+        f.write(f"Grad de umplere: {fill_ratio * 100:.1f}%\n")
+        f.write(f"Secțiunea folosită: {categories_key}\n")
+        for encoding, size in total_compressed_bytes(compressed.values()).items():
+            f.write(f"Total {encoding}: {size} bytes\n")
+        f.write("\n")
         f.write("Lista fișierelor create:\n")
         
-        for i in range(num_files):
-            start_idx = i * items_per_file
-            end_idx = min((i + 1) * items_per_file, total_items)
-            f.write(f"- {base_name}_part_{i+1:02d}.json: categorii {start_idx+1}-{end_idx}\n")
+        for name, start_idx, end_idx, size in written:
+            compressed_text = f"; {describe_artifacts(compressed[name])}" if name in compressed else ""
+            f.write(f"- {name}: categorii {start_idx+1}-{end_idx} ({size} bytes{compressed_text})\n")
 
 if __name__ == "__main__":
     input_file = r"c:\Users\Maia\Downloads\python\endpoint\bikestylish-catalog\data\categories_ai_enhanced.json"
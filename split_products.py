@@ -1,119 +1,816 @@
 import json
 import os
-import math
+import glob
+import hashlib
+import re
+import sys
+import types
+import unicodedata
+import zlib
+from datetime import datetime
 
-def split_json_file(input_file, max_size_mb=1):
+from compress_artifacts import ENCODING_SUFFIXES, available_encodings, compress_file, compress_files, \
+    describe_artifacts, remove_with_artifacts, total_compressed_bytes
+
+# Dimensiunea blocurilor citite din fișierul de intrare
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Indentarea produselor în fișierele part (în interiorul "products": [...])
+ITEM_INDENT = "    "
+
+# Fișierul cu datele comune și descrierea părților, în directorul _split
+MANIFEST_FILE = "manifest.json"
+
+# Indexul cheie -> fișiere, publicat lângă părți în modurile cu sharding
+SHARD_INDEX_FILE = "shard_index.json"
+
+# Modurile de sharding: după categorie, după brand sau după hash-ul SKU-ului
+SHARD_MODES = ('category', 'brand', 'sku_hash')
+
+# Numărul de grupuri pentru sharding după hash-ul SKU-ului
+SKU_HASH_BUCKETS = 16
+
+# Partea din buget lăsată liberă la împărțire, ca un part să poată crește
+# la actualizări incrementale (prețuri, stocuri) fără să depășească bugetul
+PACK_HEADROOM = 0.02
+
+# Lista SKU-urilor din fiecare part, folosită de update_split (nepublicată)
+SPLIT_STATE_FILE = ".split_state.json"
+
+# Cheia folosită pentru produsele fără categorie sau brand
+EMPTY_SHARD_KEY = "necunoscut"
+
+class JSONStreamReader:
     """
-    Împarte un fișier JSON mare în mai multe fișiere mai mici.
+    Citește incremental un obiect JSON de nivel superior dintr-un fișier.
     
-    Args:
-        input_file (str): Calea către fișierul JSON de intrare
-        max_size_mb (float): Dimensiunea maximă pentru fiecare fișier în MB
+    Doar blocul curent și valoarea care se decodează sunt ținute în memorie,
+    așa că un fișier de zeci de MB poate fi parcurs produs cu produs.
     """
-    print(f"Încărcare fișier: {input_file}")
     
-    # Încarcă datele JSON
+    def __init__(self, f, chunk_size=READ_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+    
+    def _fill(self):
+        """Adaugă următorul bloc în buffer; întoarce False la sfârșitul fișierului."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return
+    
+    def peek(self):
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError("Sfârșit neașteptat al fișierului JSON")
+        return self.buffer[self.pos]
+    
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Se aștepta '{char}' la poziția {self.pos}, găsit '{self.buffer[self.pos]}'")
+        self.pos += 1
+    
+    def decode_value(self):
+        """Decodează următoarea valoare JSON completă."""
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # Un număr sau un literal aflat la capătul buffer-ului poate fi trunchiat
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+    
+    def iter_object(self, stream_key=None):
+        """
+        Parcurge perechile cheie/valoare ale obiectului de nivel superior.
+        
+        Pentru cheia `stream_key` (o listă) se întoarce un generator peste
+        elemente în locul listei; acesta trebuie consumat înainte de a
+        continua iterația.
+        """
+        self.expect("{")
+        while True:
+            if self.peek() == "}":
+                self.pos += 1
+                return
+            key = self.decode_value()
+            self.expect(":")
+            if key == stream_key and self.peek() == "[":
+                yield key, self.iter_array()
+            else:
+                yield key, self.decode_value()
+            if self.peek() == ",":
+                self.pos += 1
+    
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.decode_value()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Se aștepta ',' sau ']' la poziția {self.pos - 1}")
+
+def iter_catalog_products(input_file, header, key_order=None):
+    """
+    Întoarce produsele din catalog unul câte unul.
+    
+    Cheile de nivel superior (last_updated, categories, brands...) sunt
+    completate în `header` pe măsură ce sunt citite; cele aflate înaintea
+    listei de produse sunt disponibile încă de la primul produs. Dacă este
+    dată, `key_order` primește toate cheile, inclusiv 'products', în ordine.
+    """
     with open(input_file, 'r', encoding='utf-8') as f:
-        full_data = json.load(f)
+        reader = JSONStreamReader(f)
+        for key, value in reader.iter_object(stream_key='products'):
+            if key_order is not None:
+                key_order.append(key)
+            if key == 'products':
+                if not isinstance(value, types.GeneratorType):
+                    raise ValueError("Secțiunea 'products' trebuie să fie o listă")
+                yield from value
+            else:
+                header[key] = value
+
+def serialize_product(product):
+    """Serializează un produs exact cum apare în lista 'products' a unui part."""
+    text = json.dumps(product, ensure_ascii=False, indent=2)
+    return ITEM_INDENT + text.replace("\n", "\n" + ITEM_INDENT)
+
+def render_part(part_header, items_text):
+    """
+    Construiește conținutul unui fișier part din antet și produsele serializate
+    (deja unite cu ",\\n").
+    
+    Rezultatul este identic cu json.dump(..., indent=2) pe obiectul complet,
+    cu 'products' ca ultimă cheie și o listă nevidă.
+    """
+    header_text = json.dumps(part_header, ensure_ascii=False, indent=2)
+    return header_text[:-2] + ',\n  "products": [\n' + items_text + "\n  ]\n}"
+
+
+def shard_key(product, shard_by, buckets=SKU_HASH_BUCKETS):
+    """
+    Cheia de shard a unui produs.
+    
+    Pentru 'sku_hash' se folosește CRC32 peste SKU-ul în UTF-8, modulo
+    `buckets`, așa că un client poate calcula singur grupul unui SKU.
+    """
+    if shard_by == 'sku_hash':
+        sku = str(product.get('sku', '')).encode('utf-8')
+        return f"{zlib.crc32(sku) % buckets:02d}"
+    value = str(product.get(shard_by) or '').strip()
+    return value or EMPTY_SHARD_KEY
+
+def shard_slug(key):
+    """Numele de fișier pentru o cheie de shard: fără diacritice, doar [a-z0-9-]."""
+    text = unicodedata.normalize('NFKD', key)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or EMPTY_SHARD_KEY
+
+def part_items_text(content):
+    """
+    Produsele serializate dintr-un part existent, exact cum le-a primit
+    render_part, fără să le decodeze.
+    """
+    text = content.decode('utf-8')
+    start = text.index(',\n  "products": [\n') + len(',\n  "products": [\n')
+    return text[start:-len("\n  ]\n}")]
+
+def build_part_header(part_number, total_parts, start_idx, end_idx, shard=None):
+    """
+    Antetul unui part, fără lista de produse.
     
-    # Extrage lista de produse din structura JSON
-    if not isinstance(full_data, dict) or 'products' not in full_data:
-        print("Eroare: Fișierul JSON trebuie să conțină un obiect cu cheia 'products'")
-        return
+    Datele comune (categories, brands, metadata...) nu mai sunt repetate în
+    fiecare part; ele se află o singură dată în manifest. În modurile cu
+    sharding, `shard` ({"by": ..., "key": ...}) spune ce produse conține partea.
+    """
+    header = {
+        "manifest": MANIFEST_FILE,
+        "total_products": end_idx - start_idx,
+        "part_info": {
+            "part_number": part_number,
+            "total_parts": total_parts,
+            "products_range": f"{start_idx + 1}-{end_idx}"
+        }
+    }
+    if shard is not None:
+        header["shard"] = shard
+    return header
+
+def part_overhead_bytes(shard=None):
+    """
+    Dimensiunea maximă a unui part fără produse.
     
-    products_data = full_data['products']
-    if not isinstance(products_data, list):
-        print("Eroare: Secțiunea 'products' trebuie să fie o listă")
-        return
+    Folosește valori cu număr maxim de cifre pentru câmpurile care se cunosc
+    abia la final (numărul total de părți, intervalele de produse).
+    """
+    widest = build_part_header(99999, 99999, 999998, 999999, shard)
+    widest["total_products"] = 999999
+    return len(render_part(widest, "").encode('utf-8'))
+
+class PartPacker:
+    """
+    Umple părțile în ordine, până la bugetul de bytes minus PACK_HEADROOM.
     
-    total_items = len(products_data)
-    print(f"Total produse: {total_items}")
+    Produsele serializate sunt scrise întâi în fișiere temporare, pentru că
+    numărul total de părți din antet se cunoaște abia la final. Intervalele
+    de produse sunt consecutive peste toate părțile, și în modurile cu
+    sharding, așa că merge_products.py poate reuni orice layout.
+    """
     
-    # Calculează dimensiunea aproximativă per element
-    file_size_bytes = os.path.getsize(input_file)
-    file_size_mb = file_size_bytes / (1024 * 1024)
-    avg_item_size_bytes = file_size_bytes / total_items
+    def __init__(self, output_dir, base_name, max_size_bytes):
+        self.output_dir = output_dir
+        self.base_name = base_name
+        self.max_size_bytes = max_size_bytes
+        self.pack_bytes = int(max_size_bytes * (1 - PACK_HEADROOM))
+        self.parts = []
+        self.total_items = 0
     
-    print(f"Dimensiunea fișierului original: {file_size_mb:.2f} MB")
-    print(f"Dimensiunea medie per produs: {avg_item_size_bytes:.2f} bytes")
+    def add_products(self, products, shard=None):
+        """Adaugă produsele în părți noi; ultima parte a grupului este închisă."""
+        overhead = part_overhead_bytes(shard)
+        current_texts = []
+        current_bytes = 0
+        current_skus = []
+        part_start = self.total_items
+        
+        def flush_part():
+            nonlocal current_texts, current_bytes, current_skus, part_start
+            part_number = len(self.parts) + 1
+            tmp_file = os.path.join(self.output_dir, f".{self.base_name}_part_{part_number:02d}.items.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(",\n".join(current_texts))
+            self.parts.append({
+                "tmp_file": tmp_file,
+                "start_idx": part_start,
+                "end_idx": self.total_items,
+                "sku_first": current_skus[0],
+                "sku_last": current_skus[-1],
+                "skus": current_skus,
+                "shard": shard,
+            })
+            part_start = self.total_items
+            current_texts = []
+            current_bytes = 0
+            current_skus = []
+        
+        for product in products:
+            text = serialize_product(product)
+            item_bytes = len(text.encode('utf-8'))
+            separator = 2 if current_texts else 0  # ",\n"
+            
+            if current_texts and overhead + current_bytes + separator + item_bytes > self.pack_bytes:
+                flush_part()
+                separator = 0
+            
+            if not current_texts and overhead + item_bytes > self.max_size_bytes:
+                print(f"Atenție: produsul {self.total_items + 1} singur depășește bugetul ({item_bytes} bytes)")
+            
+            current_texts.append(text)
+            current_skus.append(product.get('sku', ''))
+            current_bytes += separator + item_bytes
+            self.total_items += 1
+        
+        if current_texts:
+            flush_part()
+
+def stage_shards(products, output_dir, shard_by):
+    """
+    Împarte produsele pe chei de shard în fișiere temporare NDJSON.
+    
+    Întoarce dicționarul cheie -> fișier temporar; produsele fiecărei chei
+    își păstrează ordinea din catalog.
+    """
+    stage_files = {}
+    handles = {}
+    try:
+        for product in products:
+            key = shard_key(product, shard_by)
+            handle = handles.get(key)
+            if handle is None:
+                stage_files[key] = os.path.join(output_dir, f".shard_{len(stage_files):04d}.ndjson.tmp")
+                handle = handles[key] = open(stage_files[key], 'w', encoding='utf-8')
+            handle.write(json.dumps(product, ensure_ascii=False) + "\n")
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return stage_files
+
+def iter_staged_products(stage_file):
+    """Citește produsele dintr-un fișier temporar NDJSON și îl șterge la final."""
+    with open(stage_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+    os.remove(stage_file)
+
+def build_manifest(input_file, header, key_order, parts, total_items, max_size_bytes, shard_by=None):
+    """
+    Manifestul împărțirii: datele comune o singură dată și descrierea fiecărui part.
+    
+    `catalog_keys` păstrează ordinea cheilor din fișierul original, ca
+    fișierul reunit să aibă aceeași structură.
+    """
+    manifest = {
+        "manifest_version": 1,
+        "source_file": os.path.basename(input_file),
+        "generated_at": datetime.now().isoformat(),
+        "total_products": total_items,
+        "total_parts": len(parts),
+        "total_bytes": sum(part["bytes"] for part in parts),
+        "max_part_bytes": max_size_bytes,
+        "catalog_keys": key_order,
+        "shared": {key: value for key, value in header.items() if key != "total_products"},
+        "parts": []
+    }
+    if shard_by:
+        manifest["sharding"] = {"by": shard_by, "index": SHARD_INDEX_FILE}
+    if any(part.get("compressed") for part in parts):
+        manifest["total_compressed_bytes"] = total_compressed_bytes(part.get("compressed", {}) for part in parts)
+    
+    for i, part in enumerate(parts):
+        entry = {
+            "file": part["file"],
+            "part_number": i + 1,
+            "products_range": f"{part['start_idx'] + 1}-{part['end_idx']}",
+            "product_count": part["end_idx"] - part["start_idx"],
+            "sku_range": {"first": part["sku_first"], "last": part["sku_last"]},
+            "bytes": part["bytes"],
+            "sha256": part["sha256"]
+        }
+        if part["shard"] is not None:
+            entry["shard"] = part["shard"]["key"]
+        if part.get("compressed"):
+            entry["compressed"] = {
+                encoding: {"bytes": info["bytes"], "ratio": info["ratio"]}
+                for encoding, info in part["compressed"].items()
+            }
+        manifest["parts"].append(entry)
+    
+    return manifest
+
+def build_shard_index(shard_by, parts, total_items):
+    """
+    Indexul cheie -> fișiere, singurul fișier de care are nevoie un client
+    care caută o categorie, un brand sau un SKU anume.
+    """
+    index = {
+        "shard_by": shard_by,
+        "total_products": total_items
+    }
+    if shard_by == 'sku_hash':
+        index["hash"] = {"function": "crc32(utf-8 sku) % buckets", "buckets": SKU_HASH_BUCKETS}
+    index["shards"] = {}
+    
+    for part in parts:
+        shard = index["shards"].setdefault(part["shard"]["key"], {"files": [], "product_count": 0, "bytes": 0})
+        shard["files"].append(part["file"])
+        shard["product_count"] += part["end_idx"] - part["start_idx"]
+        shard["bytes"] += part["bytes"]
+    
+    return index
+
+def split_json_file(input_file, max_size_mb=1, shard_by=None, compress=True):
+    """
+    Împarte un fișier JSON mare în mai multe fișiere mai mici.
+    
+    Produsele sunt citite incremental și fiecare este serializat o singură
+    dată; un part primește produse cât timp dimensiunea lui reală în bytes
+    rămâne sub buget, așa că niciun fișier nu depășește `max_size_mb`
+    (cu excepția unui produs care singur este mai mare decât bugetul).
+    Memoria folosită nu depinde de mărimea catalogului.
+    
+    Părțile conțin doar produsele și o referință la `manifest.json`, care
+    păstrează o singură dată datele comune (categories, brands...) și, pentru
+    fiecare part, intervalul de SKU-uri, numărul de produse, dimensiunea și
+    hash-ul SHA-256.
     
-    # Calculează câte elemente pe fișier
-    max_size_bytes = max_size_mb * 1024 * 1024
-    items_per_file = int(max_size_bytes / avg_item_size_bytes)
+    Implicit părțile sunt intervale consecutive din ordinea catalogului, în
+    directorul `<nume>_split`. Cu `shard_by` ('category', 'brand' sau
+    'sku_hash') produsele sunt grupate după cheie în directorul
+    `<nume>_by_<mod>`: fiecare part conține o singură cheie, iar
+    `shard_index.json` spune ce fișiere are fiecare cheie.
     
-    # Asigură-te că nu depășești limita
-    if items_per_file <= 0:
-        items_per_file = 1
+    Cu `compress`, fiecare part, manifestul și indexul primesc variante
+    `.json.gz` (și `.json.br` dacă brotli este instalat), create în paralel
+    pe un pool de procese; dimensiunea și raportul fiecărei variante a unui
+    part sunt trecute în manifest.
     
-    print(f"Produse per fișier: {items_per_file}")
+    Args:
+        input_file (str): Calea către fișierul JSON de intrare
+        max_size_mb (float): Dimensiunea maximă pentru fiecare fișier în MB
+        shard_by (str): Modul de sharding sau None pentru intervale consecutive
+        compress (bool): Creează variantele comprimate ale fișierelor publicate
+    
+    Returns:
+        str: Directorul cu fișierele create (None la eroare)
+    """
+    if shard_by is not None and shard_by not in SHARD_MODES:
+        print(f"Eroare: mod de sharding necunoscut '{shard_by}' (disponibile: {', '.join(SHARD_MODES)})")
+        return None
     
-    # Calculează numărul de fișiere necesare
-    num_files = math.ceil(total_items / items_per_file)
-    print(f"Numărul estimat de fișiere: {num_files}")
+    print(f"Încărcare fișier (streaming): {input_file}")
+    
+    file_size_bytes = os.path.getsize(input_file)
+    file_size_mb = file_size_bytes / (1024 * 1024)
+    max_size_bytes = int(max_size_mb * 1024 * 1024)
+    
+    print(f"Dimensiunea fișierului original: {file_size_mb:.2f} MB")
+    print(f"Buget per fișier: {max_size_bytes} bytes")
+    if shard_by:
+        print(f"Sharding după: {shard_by}")
     
     # Creează directorul pentru fișierele împărțite
     base_name = os.path.splitext(os.path.basename(input_file))[0]
-    output_dir = os.path.join(os.path.dirname(input_file), f"{base_name}_split")
+    suffix = f"by_{shard_by}" if shard_by else "split"
+    output_dir = os.path.join(os.path.dirname(input_file), f"{base_name}_{suffix}")
     os.makedirs(output_dir, exist_ok=True)
     
-    # Împarte datele și salvează fișierele
-    for i in range(num_files):
-        start_idx = i * items_per_file
-        end_idx = min((i + 1) * items_per_file, total_items)
-        
-        chunk_data = products_data[start_idx:end_idx]
+    header = {}
+    key_order = []
+    packer = PartPacker(output_dir, base_name, max_size_bytes)
+    products = iter_catalog_products(input_file, header, key_order)
+    
+    if shard_by:
+        # Grupează întâi produsele pe chei, apoi umple părțile fiecărei chei
+        stage_files = stage_shards(products, output_dir, shard_by)
+        for key in sorted(stage_files):
+            packer.add_products(iter_staged_products(stage_files[key]), shard={"by": shard_by, "key": key})
+    else:
+        packer.add_products(products)
+    
+    parts = packer.parts
+    total_items = packer.total_items
+    
+    if not total_items:
+        print("Eroare: Fișierul JSON trebuie să conțină o listă 'products' cu produse")
+        return None
+    
+    num_files = len(parts)
+    print(f"Total produse: {total_items}")
+    print(f"Numărul de fișiere: {num_files}")
+    
+    # Scrie fișierele finale, câte unul în memorie
+    shard_file_numbers = {}
+    used_slugs = set()
+    for i, part in enumerate(parts):
+        with open(part["tmp_file"], 'r', encoding='utf-8') as f:
+            items_text = f.read()
+        os.remove(part["tmp_file"])
         
-        # Creează structura JSON pentru chunk-ul curent
-        chunk_json = {
-            "last_updated": full_data.get("last_updated", ""),
-            "total_products": len(chunk_data),
-            "version": full_data.get("version", ""),
-            "source": full_data.get("source", ""),
-            "part_info": {
-                "part_number": i + 1,
-                "total_parts": num_files,
-                "products_range": f"{start_idx + 1}-{end_idx}"
-            },
-            "categories": full_data.get("categories", []),
-            "brands": full_data.get("brands", []),
-            "products": chunk_data
-        }
+        part_header = build_part_header(i + 1, num_files, part["start_idx"], part["end_idx"], part["shard"])
+        content = render_part(part_header, items_text).encode('utf-8')
         
         # Nume fișier cu zero padding pentru sortare corectă
-        output_file = os.path.join(output_dir, f"{base_name}_part_{i+1:02d}.json")
+        if part["shard"] is None:
+            file_name = f"{base_name}_part_{i+1:02d}.json"
+        else:
+            key = part["shard"]["key"]
+            if key not in shard_file_numbers:
+                # Chei diferite cu același slug ("Ureche" și "ureche") primesc un sufix
+                slug = shard_slug(key)
+                candidate, number = slug, 1
+                while candidate in used_slugs:
+                    number += 1
+                    candidate = f"{slug}-{number}"
+                used_slugs.add(candidate)
+                shard_file_numbers[key] = [candidate, 0]
+            shard_file_numbers[key][1] += 1
+            slug, number = shard_file_numbers[key]
+            file_name = f"{base_name}_{slug}_{number:02d}.json"
         
-        # Salvează chunk-ul
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(chunk_json, f, ensure_ascii=False, indent=2)
+        output_file = os.path.join(output_dir, file_name)
+        with open(output_file, 'wb') as f:
+            f.write(content)
         
-        # Verifică dimensiunea fișierului creat
-        chunk_size_bytes = os.path.getsize(output_file)
-        chunk_size_mb = chunk_size_bytes / (1024 * 1024)
+        part["file"] = file_name
+        part["bytes"] = len(content)
+        part["sha256"] = hashlib.sha256(content).hexdigest()
+        count = part["end_idx"] - part["start_idx"]
         
-        print(f"Fișier {i+1}/{num_files}: {os.path.basename(output_file)} - {len(chunk_data)} produse - {chunk_size_mb:.2f} MB")
+        print(f"Fișier {i+1}/{num_files}: {part['file']} - {count} produse - {len(content) / (1024 * 1024):.2f} MB")
+    
+    # Elimină fișierele part rămase de la o împărțire anterioară cu mai multe părți
+    for stale_file in glob.glob(os.path.join(output_dir, f"{base_name}_*.json")):
+        if os.path.basename(stale_file) not in {part["file"] for part in parts}:
+            remove_with_artifacts(stale_file)
+            print(f"Șters fișier vechi: {os.path.basename(stale_file)}")
+    
+    if compress:
+        print(f"Comprimare părți ({', '.join(available_encodings())})...")
+        part_paths = [os.path.join(output_dir, part["file"]) for part in parts]
+        for part, artifacts in zip(parts, compress_files(part_paths).values()):
+            part["compressed"] = artifacts
+    
+    # Manifestul cu datele comune și descrierea părților
+    manifest = build_manifest(input_file, header, key_order, parts, total_items, max_size_bytes, shard_by)
+    manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"Manifest: {MANIFEST_FILE} - {os.path.getsize(manifest_file)} bytes")
+    if compress:
+        print(f"  - comprimat: {describe_artifacts(compress_file(manifest_file))}")
     
+    if shard_by:
+        shard_index = build_shard_index(shard_by, parts, total_items)
+        shard_index_file = os.path.join(output_dir, SHARD_INDEX_FILE)
+        with open(shard_index_file, 'w', encoding='utf-8') as f:
+            json.dump(shard_index, f, ensure_ascii=False, indent=2)
+        print(f"Index shard-uri: {SHARD_INDEX_FILE} - {len(shard_index['shards'])} chei - {os.path.getsize(shard_index_file)} bytes")
+        if compress:
+            print(f"  - comprimat: {describe_artifacts(compress_file(shard_index_file))}")
+    
+    largest = max(part["bytes"] for part in parts)
     print(f"\nÎmpărțirea completă! Fișierele au fost salvate în: {output_dir}")
+    print(f"Cel mai mare fișier: {largest} bytes ({largest / max_size_bytes * 100:.1f}% din buget)")
+    if compress:
+        for encoding, size in manifest["total_compressed_bytes"].items():
+            print(f"Total {encoding}: {size} bytes din {manifest['total_bytes']} ({size / manifest['total_bytes'] * 100:.1f}%)")
+    
+    if not shard_by:
+        save_split_state(output_dir, parts, max_size_bytes)
+    
+    write_split_info(output_dir, input_file, parts, total_items, max_size_mb, shard_by)
+    
+    return output_dir
+
+def write_split_info(output_dir, input_file, parts, total_items, max_size_mb, shard_by=None):
+    """Scrie split_info.txt cu descrierea părților."""
+    file_size_mb = os.path.getsize(input_file) / (1024 * 1024)
+    max_size_bytes = int(max_size_mb * 1024 * 1024)
+    largest = max(part["bytes"] for part in parts)
     
     # Crează un fișier de informații
     info_file = os.path.join(output_dir, "split_info.txt")
     with open(info_file, 'w', encoding='utf-8') as f:
         f.write(f"Informații despre împărțirea fișierului {os.path.basename(input_file)}\n")
-        f.write(f"Data împărțirii: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Data împărțirii: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"Fișier original: {file_size_mb:.2f} MB, {total_items} produse\n")
-        f.write(f"Numărul de fișiere create: {num_files}\n")
-        f.write(f"Produse per fișier: {items_per_file}\n")
-        f.write(f"Dimensiunea țintă per fișier: {max_size_mb} MB\n\n")
+        f.write(f"Layout: {f'sharding după {shard_by}' if shard_by else 'intervale consecutive'}\n")
+        f.write(f"Numărul de fișiere create: {len(parts)}\n")
+        f.write(f"Dimensiunea țintă per fișier: {max_size_mb} MB ({max_size_bytes} bytes)\n")
+        f.write(f"Cel mai mare fișier: {largest} bytes\n")
+        f.write(f"Manifest: {MANIFEST_FILE}\n\n")
         f.write("Lista fișierelor create:\n")
         
-        for i in range(num_files):
-            start_idx = i * items_per_file
-            end_idx = min((i + 1) * items_per_file, total_items)
-            f.write(f"- {base_name}_part_{i+1:02d}.json: produse {start_idx+1}-{end_idx}\n")
+        for part in parts:
+            shard_text = f" [{part['shard']['key']}]" if part["shard"] else ""
+            compressed_text = f"; {describe_artifacts(part['compressed'])}" if part.get("compressed") else ""
+            f.write(f"- {part['file']}{shard_text}: produse {part['start_idx']+1}-{part['end_idx']} ({part['bytes']} bytes{compressed_text})\n")
+
+def save_split_state(output_dir, parts, max_size_bytes):
+    """Salvează lista SKU-urilor din fiecare part, pentru update_split."""
+    state = {
+        "max_part_bytes": max_size_bytes,
+        "parts": [{"file": part["file"], "skus": part["skus"]} for part in parts]
+    }
+    with open(os.path.join(output_dir, SPLIT_STATE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+
+def load_split_state(output_dir):
+    """Încarcă starea ultimei împărțiri; None dacă lipsește."""
+    state_file = os.path.join(output_dir, SPLIT_STATE_FILE)
+    if not os.path.exists(state_file):
+        return None
+    with open(state_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def update_split(input_file, changed_skus, max_size_mb=1, compress=True):
+    """
+    Actualizează incremental părțile create de split_json_file.
+    
+    Fiecare produs rămâne în partea în care era; produsele noi intră în
+    partea produsului dinaintea lor. Se rescriu doar:
+    - părțile cu produse modificate (`changed_skus`), adăugate sau șterse;
+    - antetul părților al căror interval de produse s-a deplasat (produsele
+      lor sunt copiate din fișierul existent, fără să fie reserializate).
+    Celelalte părți rămân identice byte cu byte, iar manifestul păstrează
+    hash-urile și dimensiunile lor.
+    
+    Dacă layout-ul nu poate fi păstrat (lipsește starea anterioară, ordinea
+    produselor s-a schimbat, un part ar depăși bugetul sau ar rămâne gol),
+    se face o împărțire completă.
+    
+    Args:
+        input_file (str): Calea către fișierul JSON de intrare
+        changed_skus (set): SKU-urile produselor modificate sau adăugate
+        max_size_mb (float): Dimensiunea maximă pentru fiecare fișier în MB
+        compress (bool): Creează variantele comprimate ale fișierelor rescrise
+    
+    Returns:
+        dict: Numărul de părți rescrise, cu antet actualizat și neatinse
+    """
+    max_size_bytes = int(max_size_mb * 1024 * 1024)
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    output_dir = os.path.join(os.path.dirname(input_file), f"{base_name}_split")
+    
+    def full_split(reason):
+        print(f"Împărțire completă: {reason}")
+        split_json_file(input_file, max_size_mb, compress=compress)
+        return {"full_split": True, "reason": reason}
+    
+    manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+    state = load_split_state(output_dir)
+    if not os.path.exists(manifest_file) or state is None:
+        return full_split("nu există o împărțire anterioară")
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("sharding") or state["max_part_bytes"] != max_size_bytes \
+            or len(state["parts"]) != len(manifest["parts"]):
+        return full_split("layout-ul anterior nu corespunde")
+    
+    num_files = len(state["parts"])
+    sku_part = {sku: i for i, part in enumerate(state["parts"]) for sku in part["skus"]}
+    dirty = {sku_part[sku] for sku in changed_skus if sku in sku_part}
+    
+    # Prima trecere: partea fiecărui produs, fără serializare
+    header = {}
+    key_order = []
+    assignments = []
+    part_skus = [[] for _ in range(num_files)]
+    current = 0
+    for product in iter_catalog_products(input_file, header, key_order):
+        sku = product.get('sku', '')
+        if sku in sku_part:
+            if sku_part[sku] < current:
+                return full_split(f"ordinea produselor s-a schimbat (SKU {sku})")
+            current = sku_part[sku]
+        else:
+            dirty.add(current)
+        assignments.append(current)
+        part_skus[current].append(sku)
+    
+    for i, part in enumerate(state["parts"]):
+        # Produse șterse din acest part (cele adăugate l-au marcat deja)
+        if part_skus[i] != part["skus"]:
+            dirty.add(i)
+        if not part_skus[i]:
+            return full_split(f"partea {i + 1} ar rămâne fără produse")
+    
+    # A doua trecere: serializează doar produsele din părțile modificate
+    texts = {i: [] for i in dirty}
+    for product, part_index in zip(iter_catalog_products(input_file, {}), assignments):
+        if part_index in texts:
+            texts[part_index].append(serialize_product(product))
+    
+    parts = []
+    contents = {}
+    start_idx = 0
+    for i, old_entry in enumerate(manifest["parts"]):
+        end_idx = start_idx + len(part_skus[i])
+        part_header = build_part_header(i + 1, num_files, start_idx, end_idx)
+        path = os.path.join(output_dir, old_entry["file"])
+        
+        if i in dirty:
+            contents[i] = render_part(part_header, ",\n".join(texts[i])).encode('utf-8')
+            if len(contents[i]) > max_size_bytes:
+                return full_split(f"partea {i + 1} ar depăși bugetul ({len(contents[i])} bytes)")
+        elif old_entry["products_range"] != f"{start_idx + 1}-{end_idx}":
+            with open(path, 'rb') as f:
+                contents[i] = render_part(part_header, part_items_text(f.read())).encode('utf-8')
+        
+        parts.append({
+            "file": old_entry["file"],
+            "start_idx": start_idx,
+            "end_idx": end_idx,
+            "sku_first": part_skus[i][0],
+            "sku_last": part_skus[i][-1],
+            "skus": part_skus[i],
+            "shard": None,
+            "bytes": old_entry["bytes"],
+            "sha256": old_entry["sha256"],
+            "compressed": old_entry.get("compressed", {})
+        })
+        start_idx = end_idx
+    
+    # Scrie doar fișierele schimbate
+    for i, content in contents.items():
+        path = os.path.join(output_dir, parts[i]["file"])
+        with open(path, 'wb') as f:
+            f.write(content)
+        parts[i]["bytes"] = len(content)
+        parts[i]["sha256"] = hashlib.sha256(content).hexdigest()
+        parts[i]["compressed"] = {}
+        if not compress:
+            # Variantele comprimate existente nu mai corespund conținutului
+            for suffix in ENCODING_SUFFIXES.values():
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+    
+    changed_paths = [os.path.join(output_dir, parts[i]["file"]) for i in sorted(contents)]
+    if compress and changed_paths:
+        for i, artifacts in zip(sorted(contents), compress_files(changed_paths).values()):
+            parts[i]["compressed"] = artifacts
+    
+    total_items = start_idx
+    manifest = build_manifest(input_file, header, key_order, parts, total_items, max_size_bytes)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    if compress:
+        compress_file(manifest_file)
+    
+    save_split_state(output_dir, parts, max_size_bytes)
+    write_split_info(output_dir, input_file, parts, total_items, max_size_mb)
+    
+    summary = {
+        "full_split": False,
+        "rewritten": len(dirty),
+        "header_only": len(contents) - len(dirty),
+        "unchanged": num_files - len(contents)
+    }
+    print(f"Actualizare incrementală: {summary['rewritten']} părți rescrise, "
+          f"{summary['header_only']} doar cu antet nou, {summary['unchanged']} neatinse")
+    return summary
+
+def category_query_bytes(output_dir):
+    """
+    Câți bytes descarcă un client care vrea toate produsele unei categorii.
+    
+    Dacă layout-ul este împărțit după categorie, clientul citește
+    shard_index.json și doar fișierele categoriei. Altfel nu are de unde ști
+    unde sunt produsele și trebuie să descarce toate părțile; pentru
+    comparație se calculează și minimul teoretic (doar părțile care conțin
+    categoria). Întoarce {categorie: (bytes descărcați, minim teoretic)}.
+    """
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    category_bytes = {}
+    for part in manifest["parts"]:
+        part_file = os.path.join(output_dir, part["file"])
+        part_categories = {str(product.get('category') or '') for product in iter_catalog_products(part_file, {})}
+        for category in part_categories:
+            category_bytes[category] = category_bytes.get(category, 0) + part["bytes"]
+    
+    sharding = manifest.get("sharding") or {}
+    if sharding.get("by") == 'category':
+        index_bytes = os.path.getsize(os.path.join(output_dir, sharding["index"]))
+        return {category: (index_bytes + size, size) for category, size in category_bytes.items()}
+    
+    return {category: (manifest["total_bytes"], size) for category, size in category_bytes.items()}
+
+def shard_layout_report(input_file, max_size_mb=1.0):
+    """
+    Creează toate layout-urile (intervale consecutive și fiecare mod de
+    sharding) și afișează cât descarcă o interogare tipică pe categorie.
+    """
+    layouts = (None,) + SHARD_MODES
+    results = {}
+    for shard_by in layouts:
+        output_dir = split_json_file(input_file, max_size_mb, shard_by=shard_by)
+        if output_dir is None:
+            return None
+        results[shard_by or 'sequential'] = category_query_bytes(output_dir)
+    
+    print("\nBytes descărcați pentru toate produsele unei categorii:")
+    print(f"{'layout':<12} {'mediană':>12} {'maxim':>12} {'minim teoretic (mediană)':>26}")
+    for layout, per_category in results.items():
+        downloaded = sorted(size for size, _ in per_category.values())
+        minimum = sorted(size for _, size in per_category.values())
+        print(f"{layout:<12} {downloaded[len(downloaded) // 2]:>12} {downloaded[-1]:>12} {minimum[len(minimum) // 2]:>26}")
+    
+    print("\nPe categorie (bytes descărcați):")
+    categories = sorted(results['sequential'])
+    print(f"{'categorie':<24}" + "".join(f"{layout:>14}" for layout in results))
+    for category in categories:
+        print(f"{category[:24]:<24}" + "".join(f"{results[layout][category][0]:>14}" for layout in results))
+    
+    return results
 
 if __name__ == "__main__":
     input_file = r"c:\Users\Maia\Downloads\python\endpoint\bikestylish-catalog\data\products_ai_enhanced.json"
     
     if not os.path.exists(input_file):
         print(f"Eroare: Fișierul {input_file} nu există!")
+    elif "--report" in sys.argv:
+        shard_layout_report(input_file, max_size_mb=1.0)
     else:
-        split_json_file(input_file, max_size_mb=1.0)
+        # python split_products.py --shard-by category|brand|sku_hash
+        shard_by = sys.argv[sys.argv.index("--shard-by") + 1] if "--shard-by" in sys.argv[:-1] else None
+        split_json_file(input_file, max_size_mb=1.0, shard_by=shard_by)
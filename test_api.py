@@ -13,6 +13,8 @@ import sys
 class APITester:
     def __init__(self, base_url: str = "https://endimion2k.github.io/bikestylish-catalog"):
         self.base_url = base_url.rstrip('/')
+        self.products_total_parts = 27
+        self.categories_total_parts = 26
         self.results = {
             'products': {},
             'categories': {},
@@ -70,17 +72,43 @@ class APITester:
             print(f"❌ Error")
             return False, f"Request error: {e}", {}
     
+    def load_products_manifest(self) -> Dict:
+        """Încarcă manifest.json al părților de produse; întoarce {} dacă lipsește"""
+        url = f"{self.base_url}/data/products_ai_enhanced_split/manifest.json"
+        try:
+            print("Testing products manifest...", end=" ")
+            response = requests.get(url, timeout=10)
+            if response.status_code == 200:
+                manifest = response.json()
+                print(f"✅ OK ({manifest.get('total_parts', 0)} parts, {manifest.get('total_products', 0)} products)")
+                return manifest
+            print(f"❌ HTTP {response.status_code}")
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"❌ Error: {e}")
+        return {}
+    
     def test_products(self) -> None:
         """Testează toate endpoint-urile pentru produse"""
-        print("\n🧪 Testing Products Endpoints (1-27):")
+        manifest = self.load_products_manifest()
+        if manifest.get('parts'):
+            parts = [(part['part_number'], part['file'], part['product_count']) for part in manifest['parts']]
+        else:
+            # Fără manifest: structura veche, cu 27 de părți
+            parts = [(part, f"products_ai_enhanced_part_{part:02d}.json", None) for part in range(1, 28)]
+        self.products_total_parts = len(parts)
+        
+        print(f"\n🧪 Testing Products Endpoints (1-{len(parts)}):")
         print("-" * 50)
         
-        for part in range(1, 28):
-            part_str = f"{part:02d}"
-            url = f"{self.base_url}/data/products_ai_enhanced_split/products_ai_enhanced_part_{part_str}.json"
+        for part, file_name, expected_count in parts:
+            url = f"{self.base_url}/data/products_ai_enhanced_split/{file_name}"
             
             success, message, data = self.test_endpoint(url, 'products', part)
             
+            if success and expected_count is not None and len(data['products']) != expected_count:
+                success = False
+                message = f"Expected {expected_count} products from manifest, got {len(data['products'])}"
+            
             self.results['products'][part] = {
                 'url': url,
                 'success': success,
@@ -100,15 +128,22 @@ class APITester:
     
     def test_categories(self) -> None:
         """Testează toate endpoint-urile pentru categorii"""
-        print("\n🧪 Testing Categories Endpoints (1-26):")
+        # Numărul de părți depinde de umplerea la buget; îl aflăm din part_info
+        total_parts = self.categories_total_parts
+        print(f"\n🧪 Testing Categories Endpoints (1-{total_parts}):")
         print("-" * 50)
         
-        for part in range(1, 27):
+        part = 1
+        while part <= total_parts:
             part_str = f"{part:02d}"
             url = f"{self.base_url}/data/categories_ai_enhanced_split/categories_ai_enhanced_part_{part_str}.json"
             
             success, message, data = self.test_endpoint(url, 'categories', part)
             
+            if success and part == 1:
+                total_parts = data['part_info'].get('total_parts', total_parts)
+                self.categories_total_parts = total_parts
+            
             self.results['categories'][part] = {
                 'url': url,
                 'success': success,
@@ -123,6 +158,7 @@ class APITester:
                 self.results['summary']['failed'] += 1
                 self.results['summary']['errors'].append(f"Categories part {part}: {message}")
             
+            part += 1
             time.sleep(0.1)
     
     def test_main_page(self) -> None:
@@ -167,13 +203,13 @@ class APITester:
         total_products = sum(result['items_count'] for result in self.results['products'].values())
         products_parts_ok = sum(1 for result in self.results['products'].values() if result['success'])
         
-        print(f"\n📦 Products: {total_products} total items in {products_parts_ok}/27 working parts")
+        print(f"\n📦 Products: {total_products} total items in {products_parts_ok}/{self.products_total_parts} working parts")
         
         # Statistici categorii
         total_categories = sum(result['items_count'] for result in self.results['categories'].values())
         categories_parts_ok = sum(1 for result in self.results['categories'].values() if result['success'])
         
-        print(f"📂 Categories: {total_categories} total items in {categories_parts_ok}/26 working parts")
+        print(f"📂 Categories: {total_categories} total items in {categories_parts_ok}/{self.categories_total_parts} working parts")
         
         # Calculează success rate
         success_rate = (summary['passed'] / summary['total_tests']) * 100 if summary['total_tests'] > 0 else 0